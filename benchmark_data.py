@@ -0,0 +1,193 @@
+"""Industry benchmark dataset: memory-mapped columns indexed by (vertical, region, role).
+
+A dataset is a directory holding:
+
+* ``dictionary.json``: vertical (with its context and impact text), region and
+  role names, in code order;
+* one ``<column>.npy`` per measure in ``COLUMNS``, one row per observation,
+  sorted by group ``(vertical * n_regions + region) * n_roles + role``;
+* ``offsets.npy``: the first row of every group, plus the row count.
+
+Groups are contiguous, so the rows of a (vertical, region, role), a
+(vertical, region) or a whole vertical are one slice found in O(1) from
+``offsets``. Columns are opened with ``np.load(mmap_mode="r")`` on first use
+and only the pages of the queried slice are read. Opening the app costs only
+the JSON dictionary, however many rows the dataset holds.
+
+    python benchmark_data.py build observations.csv --descriptions verticals.json --output benchmark_data
+    python benchmark_data.py query Retail --region Global
+
+The dataset shipped in ``benchmark_data/`` holds the original three verticals.
+Set ``ROI_BENCHMARK_PATH`` to use another one.
+"""
+import argparse
+import json
+import os
+import threading
+
+import numpy as np
+
+DATA_PATH = os.environ.get("ROI_BENCHMARK_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_data"))
+
+# Measures per observation: unproductive share of the week (%) and hours per week.
+COLUMNS = ("leakage_pct", "hours_per_week")
+PERCENTILES = (10, 50, 90)
+
+
+class BenchmarkDataset:
+    """Lazily opened benchmark dataset; safe to share between sessions."""
+
+    def __init__(self, path=DATA_PATH):
+        self.path = path
+        self._dictionary = None
+        self._codes = None
+        self._arrays = {}
+        self._lock = threading.Lock()
+
+    @property
+    def dictionary(self):
+        if self._dictionary is None:
+            with open(os.path.join(self.path, "dictionary.json")) as f:
+                dictionary = json.load(f)
+            self._codes = {
+                "vertical": {v["name"]: i for i, v in enumerate(dictionary["verticals"])},
+                "region": {name: i for i, name in enumerate(dictionary["regions"])},
+                "role": {name: i for i, name in enumerate(dictionary["roles"])},
+            }
+            self._dictionary = dictionary
+        return self._dictionary
+
+    def _array(self, name):
+        if name not in self._arrays:
+            with self._lock:
+                if name not in self._arrays:
+                    self._arrays[name] = np.load(os.path.join(self.path, f"{name}.npy"), mmap_mode="r")
+        return self._arrays[name]
+
+    def verticals(self):
+        return [v["name"] for v in self.dictionary["verticals"]]
+
+    def regions(self):
+        return list(self.dictionary["regions"])
+
+    def roles(self):
+        return list(self.dictionary["roles"])
+
+    def vertical_info(self, vertical):
+        """The vertical's dictionary entry: name, context and impact text."""
+        return self.dictionary["verticals"][self._code("vertical", vertical)]
+
+    def _code(self, level, name):
+        self.dictionary
+        try:
+            return self._codes[level][name]
+        except KeyError:
+            raise ValueError(f"Unknown {level} {name!r}") from None
+
+    def _slices(self, vertical, region=None, role=None):
+        n_regions, n_roles = len(self.dictionary["regions"]), len(self.dictionary["roles"])
+        v = self._code("vertical", vertical)
+        if region is not None:
+            first = (v * n_regions + self._code("region", region)) * n_roles
+            groups = [(first + self._code("role", role), 1)] if role is not None else [(first, n_roles)]
+        elif role is not None:
+            # A role across every region: one group per region
+            groups = [((v * n_regions + r) * n_roles + self._code("role", role), 1) for r in range(n_regions)]
+        else:
+            groups = [(v * n_regions * n_roles, n_regions * n_roles)]
+        offsets = self._array("offsets")
+        return [slice(int(offsets[g]), int(offsets[g + count])) for g, count in groups]
+
+    def values(self, column, vertical, region=None, role=None):
+        """Observations of ``column`` for a vertical, optionally narrowed to a region and/or role."""
+        data = self._array(column)
+        slices = self._slices(vertical, region, role)
+        return data[slices[0]] if len(slices) == 1 else np.concatenate([data[s] for s in slices])
+
+    def count(self, vertical, region=None, role=None):
+        return sum(s.stop - s.start for s in self._slices(vertical, region, role))
+
+    def percentiles(self, vertical, region=None, role=None, q=PERCENTILES, column="leakage_pct"):
+        """``{q: value}`` over the matching observations, or ``None`` if there are none."""
+        values = self.values(column, vertical, region, role)
+        if len(values) == 0:
+            return None
+        return dict(zip(q, np.percentile(values, q).tolist()))
+
+    def summary(self, vertical, region=None, role=None, q=PERCENTILES):
+        """Observation count and percentile bands of every column, or ``None`` if there are no observations."""
+        count = self.count(vertical, region, role)
+        if count == 0:
+            return None
+        return {"observations": count,
+                **{column: self.percentiles(vertical, region, role, q, column) for column in COLUMNS}}
+
+
+def build(observations, path, descriptions=None):
+    """Write a dataset from a DataFrame with vertical, region, role and ``COLUMNS`` columns.
+
+    ``descriptions`` maps vertical names to ``{"context": ..., "impact": ...}``;
+    its order, then first appearance, sets the vertical order.
+    """
+    import pandas as pd
+
+    descriptions = descriptions or {}
+    names, codes = {}, {}
+    for level, listed in (("vertical", list(descriptions)), ("region", []), ("role", [])):
+        level_codes, uniques = pd.factorize(observations[level])
+        names[level] = list(dict.fromkeys([*listed, *uniques]))
+        position = {name: i for i, name in enumerate(names[level])}
+        codes[level] = np.array([position[name] for name in uniques], dtype=np.int64)[level_codes]
+    n_groups = len(names["vertical"]) * len(names["region"]) * len(names["role"])
+    group = (codes["vertical"] * len(names["region"]) + codes["region"]) * len(names["role"]) + codes["role"]
+    order = np.argsort(group, kind="stable")
+    offsets = np.zeros(n_groups + 1, dtype=np.int64)
+    np.cumsum(np.bincount(group, minlength=n_groups), out=offsets[1:])
+
+    os.makedirs(path, exist_ok=True)
+    for column in COLUMNS:
+        np.save(os.path.join(path, f"{column}.npy"), observations[column].to_numpy(dtype=np.float64)[order])
+    np.save(os.path.join(path, "offsets.npy"), offsets)
+    dictionary = {
+        "verticals": [{"name": name, "context": descriptions.get(name, {}).get("context", ""),
+                       "impact": descriptions.get(name, {}).get("impact", "")} for name in names["vertical"]],
+        "regions": names["region"],
+        "roles": names["role"],
+        "rows": len(observations),
+    }
+    with open(os.path.join(path, "dictionary.json"), "w") as f:
+        json.dump(dictionary, f, indent=2)
+
+
+# Shared by every session of the Streamlit app.
+DATASET = BenchmarkDataset()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Industry benchmark dataset tools.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build_parser = commands.add_parser("build", help="write a dataset from a CSV of observations")
+    build_parser.add_argument("csv", help="columns: vertical, region, role, " + ", ".join(COLUMNS))
+    build_parser.add_argument("--descriptions", help="JSON of vertical -> {context, impact}")
+    build_parser.add_argument("--output", default=DATA_PATH)
+    query_parser = commands.add_parser("query", help="percentile bands for a vertical")
+    query_parser.add_argument("vertical")
+    query_parser.add_argument("--region")
+    query_parser.add_argument("--role")
+    query_parser.add_argument("--path", default=DATA_PATH)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        import pandas as pd
+
+        descriptions = None
+        if args.descriptions:
+            with open(args.descriptions) as f:
+                descriptions = json.load(f)
+        build(pd.read_csv(args.csv), args.output, descriptions)
+        return
+    print(json.dumps(BenchmarkDataset(args.path).summary(args.vertical, args.region, args.role), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""Benchmarks for the ROI model hot paths and their scaling curves.
+
+    python benchmarks.py run --output baseline.json
+    python benchmarks.py run --output current.json
+    python benchmarks.py compare baseline.json current.json --threshold 0.2
+
+``run`` times each case with ``timeit`` (best and median of several repeats,
+each auto-ranged to at least 0.2 s) and saves machine-readable results.
+``compare`` reports the median ratio for every baseline case and exits
+non-zero if any case slowed down by more than ``threshold`` or is missing
+from the current results (e.g. it was renamed or now fails to run).
+Runs offline; only NumPy and the model modules are needed.
+"""
+import argparse
+import datetime
+import json
+import platform
+import statistics
+import sys
+import timeit
+
+import numpy as np
+
+import calculator_model
+import deal_optimizer
+import goal_seek
+import period_engine
+import roi_engine
+import sensitivity
+
+SCENARIO_COUNTS = (1, 10, 100, 1_000, 10_000, 100_000, 1_000_000)
+HORIZONS = (2, 5, 10, 20, 40)
+GRID_SIZES = (5, 25, 100, 250, 500)
+
+# A representative deal, as raw tab inputs.
+DEAL = {**roi_engine.DEFAULT_INPUTS, "num_employees": 40, "annual_salary": 100_000,
+        "annual_subscription": 50_000, "initial_setup": 20_000}
+
+
+def _model(scenarios=None, analysis_years=5):
+    derived = roi_engine.derive_inputs(**{**DEAL, "analysis_years": analysis_years})
+    model = roi_engine.engine_inputs(derived)
+    if scenarios is not None:
+        rng = np.random.default_rng(0)
+        model["waste_pct"] = rng.uniform(0.05, 0.3, scenarios)
+        model["wacc"] = rng.uniform(5, 15, scenarios)
+    return model
+
+
+def cases(quick=False):
+    """Benchmark name -> zero-argument callable."""
+    model = _model()
+    calculator = {**calculator_model.DEFAULT_INPUTS, "fringe_rate": 0.25, "unproductive_pct": 0.2, "improvement_pct": 0.5}
+    benches = {
+        "single/npv_breakeven": lambda: roi_engine.evaluate(**model),
+        "single/risk_adjusted_npv": lambda: roi_engine.risk_adjusted_npv(**model),
+        "single/sensitivity_5x5": lambda: sensitivity.npv_grid(
+            DEAL, "efficiency", np.linspace(0.8, 1.2, 5), "wacc", np.linspace(6, 14, 5)),
+        "single/target_waste_solve": lambda: goal_seek.solve("waste_pct", "breakeven", 3.7, **DEAL),
+        "single/goal_seek_irr_salary": lambda: goal_seek.solve("annual_salary", "irr", 25.0, **DEAL),
+        "single/calculator_hours": lambda: calculator_model.hours_allocation(**calculator),
+        "single/optimizer_4_levers": lambda: deal_optimizer.optimize(
+            {"annual_subscription": (0, 500_000), "initial_setup": (0, 200_000), "key_users": (1, 20),
+             "impl_intensity": list(roi_engine.INTENSITY_HOURS)}, max_breakeven=3, **DEAL),
+    }
+    for years in HORIZONS:
+        horizon_model = _model(analysis_years=years)
+        benches[f"horizon/{years}y"] = lambda m=horizon_model: roi_engine.evaluate(**m)
+    for count in SCENARIO_COUNTS:
+        if quick and count > 10_000:
+            continue
+        scenario_model = _model(scenarios=count)
+        benches[f"scenarios/{count}"] = lambda m=scenario_model: roi_engine.evaluate(**m)
+    y1_recurring = roi_engine.derive_inputs(**DEAL)["y1_recurring"]
+    for count in (1, 100_000):
+        if quick and count > 10_000:
+            continue
+        monthly_model = _model(scenarios=None if count == 1 else count, analysis_years=10)
+        benches[f"monthly/120x{count}"] = lambda m=monthly_model: period_engine.batch_metrics(
+            y1_recurring=y1_recurring, ramp="S-Curve", ramp_months=6.0, **m)
+    for size in GRID_SIZES:
+        if quick and size > 100:
+            continue
+        benches[f"grid/{size}x{size}"] = lambda n=size: sensitivity.npv_grid(
+            DEAL, "annual_salary", np.linspace(80_000, 120_000, n), "wacc", np.linspace(6, 14, n))
+    return benches
+
+
+def run(names=None, quick=False, repeat=5):
+    results = {}
+    for name, func in cases(quick).items():
+        if names and not any(n in name for n in names):
+            continue
+        timer = timeit.Timer(func)
+        loops, _ = timer.autorange()
+        loops = max(loops, 1)
+        times = [t / loops for t in timer.repeat(repeat=repeat, number=loops)]
+        results[name] = {"median_s": statistics.median(times), "best_s": min(times), "loops": loops}
+        print(f"{name:32s} {results[name]['median_s'] * 1e6:12.1f} us", file=sys.stderr)
+    return {
+        "meta": {
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+
+def compare(baseline, current, threshold=0.2):
+    """Rows of (name, baseline median, current median, ratio, failed).
+
+    A baseline case missing from ``current`` fails with a current median and
+    ratio of ``None``.
+    """
+    rows = []
+    for name, base in baseline["results"].items():
+        if name not in current["results"]:
+            rows.append((name, base["median_s"], None, None, True))
+            continue
+        ratio = current["results"][name]["median_s"] / base["median_s"]
+        rows.append((name, base["median_s"], current["results"][name]["median_s"], ratio, ratio > 1 + threshold))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ROI model benchmarks.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="time every case and save the results")
+    run_parser.add_argument("--output", default="bench_results.json")
+    run_parser.add_argument("--filter", nargs="*", help="only cases whose name contains one of these")
+    run_parser.add_argument("--quick", action="store_true", help="skip the largest scenario counts and grids")
+    run_parser.add_argument("--repeat", type=int, default=5)
+    compare_parser = commands.add_parser("compare", help="flag regressions against a baseline")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown, e.g. 0.2 = 20%%")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        with open(args.output, "w") as f:
+            json.dump(run(args.filter, args.quick, args.repeat), f, indent=2)
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    rows = compare(baseline, current, args.threshold)
+    for name, base, now, ratio, failed in rows:
+        if now is None:
+            print(f"{name:32s} {base * 1e6:12.1f} us {'':>12s}    {'':>7s}  MISSING")
+            continue
+        flag = "REGRESSION" if failed else ""
+        print(f"{name:32s} {base * 1e6:12.1f} us {now * 1e6:12.1f} us {ratio:7.2f}x {flag}")
+    missing = sum(row[2] is None for row in rows)
+    regressions = sum(row[4] for row in rows) - missing
+    print(f"{regressions} regression(s) beyond {args.threshold:.0%} and {missing} missing case(s) across {len(rows)} case(s)")
+    return 1 if regressions or missing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,12 @@
+import numpy as np
 import streamlit as st
-import pandas as pd
-import plotly.graph_objects as go
+
+import calculator_model
+import instrumentation
 
 # --- App Configuration ---
 st.set_page_config(page_title="Productivity ROI Calculator", layout="wide")
+rerun = instrumentation.begin_rerun("calculator", st.session_state)
 
 st.title("🚀 Productivity Improvement & ROI Calculator")
 
@@ -14,6 +17,7 @@ currency_choice = st.sidebar.selectbox("Select Currency", list(currency_map.keys
 symbol = currency_map[currency_choice]
 
 st.sidebar.header("👥 Scale & Scope")
+scope = st.sidebar.radio("Departments", ["Single Department", "Multi-Department Roll-Up"], help="Roll-Up evaluates a table of departments; the sidebar values below seed new rows.")
 num_employees = st.sidebar.number_input("Number of Employees", min_value=1, value=10, step=1, format="%d")
 
 st.sidebar.header("💰 Individual Cost")
@@ -38,14 +42,11 @@ input_method = st.sidebar.radio(
 if input_method == "As a Percentage (%)":
     unproductive_pct = st.sidebar.slider("Current Unproductive Time (%)", 0, 100, 20) / 100
     # Calculate equivalent hours for the summary
-    weekly_waste_hours = (unproductive_pct * total_annual_hours_per_person) / (work_days / 5)
+    weekly_waste_hours = calculator_model.weekly_hours_from_pct(unproductive_pct, work_days, daily_hours)
 else:
     weekly_waste_hours = st.sidebar.number_input("Unproductive Hours per Week (per person)", value=8.0, step=0.5)
     # Convert weekly hours back to a percentage of annual time
-    # Assuming 52 weeks but adjusted for the 'work_days' ratio
-    weeks_per_year = work_days / 5
-    annual_waste_hours = weekly_waste_hours * weeks_per_year
-    unproductive_pct = annual_waste_hours / total_annual_hours_per_person
+    unproductive_pct = calculator_model.pct_from_weekly_hours(weekly_waste_hours, work_days, daily_hours)
 
 improvement_pct = st.sidebar.slider("Target Waste Reduction (%)", 0, 100, 50) / 100
 
@@ -53,21 +54,128 @@ improvement_pct = st.sidebar.slider("Target Waste Reduction (%)", 0, 100, 50) /
 def format_currency(value):
     return f"{symbol}{value:,.2f}"
 
-# --- Calculations ---
-burdened_cost_per_person = annual_salary * (1 + fringe_rate)
-hourly_rate = burdened_cost_per_person / total_annual_hours_per_person
+# --- Helper Function for the Hours Chart ---
+def allocation_chart(hours_productive, hours_saved, hours_remaining_waste):
+    import plotly.graph_objects as go  # loaded on first report only, to keep cold start fast
+
+    categories = ["Core Productive Time", "Reclaimed Time (Savings)", "Remaining Waste"]
+    values = [hours_productive, hours_saved, hours_remaining_waste]
+    colors = ['#2ca02c', '#1f77b4', '#d62728']
 
-total_dept_hours = total_annual_hours_per_person * num_employees
-total_dept_cost = burdened_cost_per_person * num_employees
+    fig = go.Figure(go.Bar(
+        x=values, y=categories, orientation='h', marker_color=colors,
+        text=[f"{v:,.0f} hrs" for v in values], textposition='auto',
+    ))
 
-# Break down the hours for the chart
-hours_wasted_total = total_dept_hours * unproductive_pct
-hours_saved = hours_wasted_total * improvement_pct
-hours_remaining_waste = hours_wasted_total - hours_saved
-hours_productive = total_dept_hours - hours_wasted_total
+    fig.update_layout(
+        xaxis_title="Total Annual Hours", yaxis=dict(autorange="reversed"),
+        margin=dict(l=20, r=20, t=30, b=20), height=350, template="plotly_white"
+    )
+    return fig
+
+# --- Multi-Department Roll-Up ---
+if scope == "Multi-Department Roll-Up":
+    import pandas as pd
+
+    st.subheader("🏢 Department Roll-Up")
+    sidebar_row = {
+        "num_employees": num_employees, "annual_salary": annual_salary, "fringe_rate": fringe_rate * 100,
+        "work_days": work_days, "daily_hours": daily_hours, "unproductive_pct": unproductive_pct * 100,
+        "improvement_pct": improvement_pct * 100,
+    }
+    uploaded = st.file_uploader("Upload Departments (CSV)", type="csv", help="Columns: department, include, " + ", ".join(calculator_model.DEFAULT_INPUTS) + ". Rates in percent; missing columns take the sidebar values.")
+
+    # The table source is built once per upload so cell edits survive reruns
+    source_key = f"departments_{uploaded.file_id if uploaded is not None else 'manual'}"
+    if source_key not in st.session_state:
+        source = pd.read_csv(uploaded) if uploaded is not None else pd.DataFrame([{"department": "Department 1"}])
+        for name, value in {"department": "", "include": True, **sidebar_row}.items():
+            if name not in source:
+                source[name] = value
+        # Cells that are not numbers (e.g. "1,200" or "n/a") are blanked and fall back to the sidebar values
+        coerced = []
+        for name in calculator_model.DEFAULT_INPUTS:
+            numbers = pd.to_numeric(source[name], errors="coerce")
+            bad = numbers.isna() & source[name].notna()
+            coerced += [f"{department or f'row {row + 1}'} ({name})" for row, department in zip(np.flatnonzero(bad), source["department"][bad].fillna(""))]
+            source[name] = numbers
+        st.session_state[f"{source_key}_coerced"] = coerced
+        st.session_state[source_key] = source[["department", "include", *calculator_model.DEFAULT_INPUTS]]
+    if st.session_state[f"{source_key}_coerced"]:
+        st.warning("Not a number, so the sidebar value is used: " + ", ".join(st.session_state[f"{source_key}_coerced"]))
+
+    with rerun.span("department_table"):
+        departments = st.data_editor(
+            st.session_state[source_key], key=f"{source_key}_editor", num_rows="dynamic", hide_index=True, use_container_width=True,
+            column_config={
+                "department": st.column_config.TextColumn("Department"),
+                "include": st.column_config.CheckboxColumn("Include", default=True),
+                "num_employees": st.column_config.NumberColumn("Employees", min_value=1, default=num_employees),
+                "annual_salary": st.column_config.NumberColumn(f"Avg. Salary ({symbol})", min_value=0, default=annual_salary),
+                "fringe_rate": st.column_config.NumberColumn("Burden Rate (%)", min_value=0, max_value=50, default=sidebar_row["fringe_rate"]),
+                "work_days": st.column_config.NumberColumn("Work Days", min_value=1, default=work_days),
+                "daily_hours": st.column_config.NumberColumn("Hours / Day", min_value=0.5, default=daily_hours),
+                "unproductive_pct": st.column_config.NumberColumn("Unproductive (%)", min_value=0, max_value=100, default=sidebar_row["unproductive_pct"]),
+                "improvement_pct": st.column_config.NumberColumn("Waste Reduction (%)", min_value=0, max_value=100, default=sidebar_row["improvement_pct"]),
+            },
+        )
+
+    # One vectorized pass over the departments that are new or were edited since the last rerun
+    with rerun.span("department_allocation"):
+        inputs = departments[list(calculator_model.DEFAULT_INPUTS)].apply(pd.to_numeric, errors="coerce").fillna(pd.Series(sidebar_row))
+        if "department_allocator" not in st.session_state:
+            st.session_state.department_allocator = calculator_model.DepartmentAllocator()
+        allocator = st.session_state.department_allocator
+        dept_results = allocator.update(inputs.to_numpy(), departments["department"].fillna("").tolist())
+        include = departments["include"].fillna(True).to_numpy(dtype=bool)
+        totals = {name: float(values[include].sum()) for name, values in dept_results.items()}
+    st.caption(f"{allocator.rows_evaluated:,} of {len(inputs):,} departments recalculated · {include.sum():,} included in the totals.")
+
+    st.divider()
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Total Dept. Burdened Cost", format_currency(totals["total_dept_cost"]))
+    with col2:
+        st.metric("Total Annual Savings", format_currency(totals["total_savings"]), delta="ROI Impact")
+    with col3:
+        st.metric("Capacity Reclaimed", f"{totals['total_fte_recovered']:,.2f} FTE")
+
+    with rerun.span("hours_chart"):
+        st.subheader("📊 Annual Hours Allocation (Selected Departments)")
+        st.plotly_chart(allocation_chart(totals["hours_productive"], totals["hours_saved"], totals["hours_remaining_waste"]), use_container_width=True)
+
+    with rerun.span("department_ranking"):
+        st.subheader("🏆 Department Ranking by Annual Savings")
+        ranking = pd.DataFrame({
+            "Department": departments["department"].fillna("").to_numpy(),
+            "Employees": inputs["num_employees"].to_numpy(),
+            "Annual Savings": dept_results["total_savings"],
+            "Savings / Employee": dept_results["total_savings"] / inputs["num_employees"].to_numpy(),
+            "Hours Reclaimed": dept_results["hours_saved"],
+            "FTE Reclaimed": dept_results["total_fte_recovered"],
+        })[include].sort_values("Annual Savings", ascending=False)
+        ranking.insert(0, "Rank", range(1, len(ranking) + 1))
+        money = st.column_config.NumberColumn(format=f"{symbol}%.0f")
+        st.dataframe(ranking, hide_index=True, use_container_width=True, column_config={
+            "Annual Savings": money, "Savings / Employee": money,
+            "Hours Reclaimed": st.column_config.NumberColumn(format="%.0f"),
+            "FTE Reclaimed": st.column_config.NumberColumn(format="%.2f"),
+        })
+
+    instrumentation.finish_rerun(rerun, st.session_state)
+    st.stop()
 
-total_savings = hours_saved * hourly_rate
-total_fte_recovered = hours_saved / total_annual_hours_per_person
+# --- Calculations ---
+with rerun.span("calculations"):
+    results = calculator_model.hours_allocation(
+        num_employees, annual_salary, fringe_rate, work_days, daily_hours, unproductive_pct, improvement_pct
+    )
+total_dept_cost = results["total_dept_cost"]
+hours_saved = results["hours_saved"]
+hours_remaining_waste = results["hours_remaining_waste"]
+hours_productive = results["hours_productive"]
+total_savings = results["total_savings"]
+total_fte_recovered = results["total_fte_recovered"]
 
 # --- Display Results ---
 if st.button("Generate Productivity Report"):
@@ -82,23 +190,9 @@ if st.button("Generate Productivity Report"):
         st.metric("Capacity Reclaimed", f"{total_fte_recovered:,.2f} FTE")
 
     # --- Chart Visualization ---
-    st.subheader("📊 Annual Hours Allocation (Departmental)")
-    
-    categories = ["Core Productive Time", "Reclaimed Time (Savings)", "Remaining Waste"]
-    values = [hours_productive, hours_saved, hours_remaining_waste]
-    colors = ['#2ca02c', '#1f77b4', '#d62728']
-
-    fig = go.Figure(go.Bar(
-        x=values, y=categories, orientation='h', marker_color=colors,
-        text=[f"{v:,.0f} hrs" for v in values], textposition='auto',
-    ))
-
-    fig.update_layout(
-        xaxis_title="Total Annual Hours", yaxis=dict(autorange="reversed"),
-        margin=dict(l=20, r=20, t=30, b=20), height=350, template="plotly_white"
-    )
-
-    st.plotly_chart(fig, use_container_width=True)
+    with rerun.span("hours_chart"):
+        st.subheader("📊 Annual Hours Allocation (Departmental)")
+        st.plotly_chart(allocation_chart(hours_productive, hours_saved, hours_remaining_waste), use_container_width=True)
 
     # --- Executive Summary ---
     st.subheader("📝 Executive Summary")
@@ -113,4 +207,6 @@ if st.button("Generate Productivity Report"):
     st.text_area("Copy-paste into your proposal:", value=summary, height=120)
 
 else:
-    st.write("👈 Adjust the assumptions in the sidebar and click the button.")
\ No newline at end of file
+    st.write("👈 Adjust the assumptions in the sidebar and click the button.")
+
+instrumentation.finish_rerun(rerun, st.session_state)
\ No newline at end of file
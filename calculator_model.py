@@ -0,0 +1,114 @@
+"""Hours-allocation math behind calculator.py, free of Streamlit.
+
+Rates (``fringe_rate``, ``unproductive_pct``, ``improvement_pct``) are
+fractions, as the sidebar produces them. Plain arithmetic only, so every
+input may equally be a NumPy array of departments.
+"""
+import numpy as np
+
+# Sidebar defaults, with rates in percent as the sliders show them.
+DEFAULT_INPUTS = {
+    "num_employees": 10,
+    "annual_salary": 120000,
+    "fringe_rate": 25,
+    "work_days": 220,
+    "daily_hours": 7.5,
+    "unproductive_pct": 20,
+    "improvement_pct": 50,
+}
+
+# Inputs entered in percent in the sidebar and the department table.
+RATE_INPUTS = ("fringe_rate", "unproductive_pct", "improvement_pct")
+
+
+def weekly_hours_from_pct(unproductive_pct, work_days, daily_hours):
+    """Unproductive hours per week per person for a waste fraction."""
+    return (unproductive_pct * work_days * daily_hours) / (work_days / 5)
+
+
+def pct_from_weekly_hours(weekly_waste_hours, work_days, daily_hours):
+    """Waste fraction of annual time for unproductive hours per week per person."""
+    # Assuming 52 weeks but adjusted for the 'work_days' ratio
+    weeks_per_year = work_days / 5
+    return weekly_waste_hours * weeks_per_year / (work_days * daily_hours)
+
+
+def hours_allocation(num_employees, annual_salary, fringe_rate, work_days, daily_hours,
+                     unproductive_pct, improvement_pct):
+    """Departmental cost, hours breakdown, savings and FTE reclaimed."""
+    total_annual_hours_per_person = work_days * daily_hours
+    burdened_cost_per_person = annual_salary * (1 + fringe_rate)
+    hourly_rate = burdened_cost_per_person / total_annual_hours_per_person
+
+    total_dept_hours = total_annual_hours_per_person * num_employees
+    total_dept_cost = burdened_cost_per_person * num_employees
+
+    # Break down the hours for the chart
+    hours_wasted_total = total_dept_hours * unproductive_pct
+    hours_saved = hours_wasted_total * improvement_pct
+    hours_remaining_waste = hours_wasted_total - hours_saved
+    hours_productive = total_dept_hours - hours_wasted_total
+
+    return {
+        "total_dept_cost": total_dept_cost,
+        "total_dept_hours": total_dept_hours,
+        "hours_productive": hours_productive,
+        "hours_saved": hours_saved,
+        "hours_remaining_waste": hours_remaining_waste,
+        "total_savings": hours_saved * hourly_rate,
+        "total_fte_recovered": hours_saved / total_annual_hours_per_person,
+    }
+
+
+def _row_keys(names):
+    # (name, occurrence) per row; without names every row is None, so rows match by position
+    seen = {}
+    keys = []
+    for name in names:
+        seen[name] = seen.get(name, -1) + 1
+        keys.append((name, seen[name]))
+    return keys
+
+
+class DepartmentAllocator:
+    """``hours_allocation`` over a table of departments, re-evaluating only changed rows.
+
+    ``update`` takes one row per department and one column per name in
+    ``DEFAULT_INPUTS`` (rates in percent), plus the department names. Rows
+    are matched to the previous call by name (the n-th department of a name
+    to the n-th before), or by position if no names are given, so inserting,
+    deleting or reordering departments keeps their results. Only new or
+    edited departments are recomputed.
+    """
+
+    def __init__(self):
+        self._inputs = np.empty((0, len(DEFAULT_INPUTS)))
+        self._keys = []
+        self._results = {}
+        self.rows_evaluated = 0
+
+    def update(self, inputs, names=None):
+        inputs = np.asarray(inputs, dtype=float).reshape(-1, len(DEFAULT_INPUTS))
+        keys = _row_keys(names if names is not None else [None] * len(inputs))
+        previous = {key: row for row, key in enumerate(self._keys)}
+        source = np.array([previous.get(key, -1) for key in keys], dtype=int)
+        matched = source >= 0
+        changed = ~matched
+        changed[matched] = (inputs[matched] != self._inputs[source[matched]]).any(axis=1)
+        rows = np.flatnonzero(changed)
+
+        columns = dict(zip(DEFAULT_INPUTS, inputs[rows].T))
+        for name in RATE_INPUTS:
+            columns[name] = columns[name] / 100
+        fresh = hours_allocation(**columns)
+
+        results = {}
+        for name, values in fresh.items():
+            column = np.empty(len(inputs))
+            if name in self._results:
+                column[~changed] = self._results[name][source[~changed]]
+            column[rows] = values
+            results[name] = column
+        self._inputs, self._keys, self._results = inputs.copy(), keys, results
+        self.rows_evaluated = len(rows)
+        return results
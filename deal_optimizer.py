@@ -0,0 +1,228 @@
+"""Multi-lever deal optimizer: price and scope a deal under NPV and breakeven constraints.
+
+Searches any of the levers in ``LEVERS`` at once, within the given bounds,
+for the candidate that maximizes an objective (``OBJECTIVES``) while keeping
+the customer's breakeven within ``max_breakeven`` years and the risk-adjusted
+NPV at or above ``min_risk_adj_npv``. Inputs use the raw tab names of
+``roi_engine.DEFAULT_INPUTS``; levers not being searched keep their input value.
+
+Every candidate on a grid over the levers is scored by ``roi_engine.deal_metrics``
+in vectorized chunks. Continuous levers are then re-gridded around the best
+feasible candidate for a few refinement rounds. The result includes the
+feasible frontier: the candidates no other feasible candidate beats on both
+the objective and the customer's risk-adjusted NPV.
+
+    python deal_optimizer.py pipeline.csv optimized.csv --max-breakeven 3 --workers 8
+"""
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+import numpy as np
+
+import roi_engine
+
+# Searchable levers: continuous ones take (low, high) bounds, impl_intensity a list of levels.
+LEVERS = ("annual_subscription", "initial_setup", "key_users", "impl_intensity")
+INTEGER_LEVERS = ("key_users",)
+CHOICE_LEVERS = {"impl_intensity": tuple(roi_engine.INTENSITY_HOURS)}
+
+# What the deal desk maximizes: a lever, or the vendor's total contract value.
+OBJECTIVES = {
+    "annual_subscription": "Annual Subscription ($)",
+    "initial_setup": "Implementation Services ($)",
+    "deal_value": "Total Contract Value ($)",
+}
+
+METRICS = ("risk_adj_npv", "expected_npv", "total_tco", "breakeven_years")
+
+
+class OptimizationResult(NamedTuple):
+    best: dict            # lever values, objective and metrics of the best feasible candidate, or None
+    frontier: dict        # the same fields as arrays, ordered by descending objective
+    evaluated: int
+    feasible: int
+
+
+def candidate_grid(bounds, steps):
+    """Cartesian grid over ``bounds`` as a dict of flat arrays, ``steps`` values per continuous lever."""
+    axes = {}
+    for lever, bound in bounds.items():
+        if lever in CHOICE_LEVERS:
+            axes[lever] = np.asarray(bound, dtype=object)
+        else:
+            values = np.linspace(bound[0], bound[1], steps)
+            axes[lever] = np.unique(np.round(values)) if lever in INTEGER_LEVERS else values
+    mesh = np.meshgrid(*axes.values(), indexing="ij")
+    return {lever: values.reshape(-1) for lever, values in zip(axes, mesh)}
+
+
+def deal_value(inputs):
+    """Vendor's total contract value: subscription over the horizon plus services."""
+    return (np.asarray(inputs["annual_subscription"], dtype=float) * inputs["analysis_years"]
+            - inputs["current_subscription"] + inputs["initial_setup"])
+
+
+def evaluate_candidates(inputs, candidates, objective="annual_subscription", chunk_size=50_000):
+    """Objective and ``METRICS`` for every candidate, scored ``chunk_size`` at a time."""
+    count = len(next(iter(candidates.values())))
+    results = {name: np.empty(count) for name in ("objective", *METRICS)}
+    for lo in range(0, count, chunk_size):
+        chunk = {**inputs, **{lever: values[lo:lo + chunk_size] for lever, values in candidates.items()}}
+        metrics = roi_engine.deal_metrics(**chunk)
+        size = min(chunk_size, count - lo)
+        for name in METRICS:
+            results[name][lo:lo + size] = np.broadcast_to(metrics[name], size)
+        score = deal_value(chunk) if objective == "deal_value" else chunk[objective]
+        results["objective"][lo:lo + size] = np.broadcast_to(score, size)
+    return results
+
+
+def feasible_mask(results, max_breakeven=None, min_risk_adj_npv=0.0):
+    """Candidates meeting both constraints; breakeven beyond the horizon fails ``max_breakeven``."""
+    mask = np.ones(len(results["objective"]), dtype=bool)
+    if min_risk_adj_npv is not None:
+        mask &= results["risk_adj_npv"] >= min_risk_adj_npv
+    if max_breakeven is not None:
+        mask &= (results["breakeven_years"] > 0) & (results["breakeven_years"] <= max_breakeven)
+    return mask
+
+
+def pareto_frontier(objective, npv):
+    """Indices of the points no other point beats on both ``objective`` and ``npv``, best objective first."""
+    order = np.lexsort((-npv, -objective))
+    best_npv = np.maximum.accumulate(npv[order])
+    keep = np.ones(len(order), dtype=bool)
+    keep[1:] = npv[order][1:] > best_npv[:-1]
+    return order[keep]
+
+
+def _refine(bounds, best, steps):
+    # Shrink each continuous lever to one grid step either side of the best candidate
+    refined = {}
+    for lever, bound in bounds.items():
+        if lever in CHOICE_LEVERS:
+            refined[lever] = [best[lever]]
+            continue
+        step = (bound[1] - bound[0]) / max(steps - 1, 1)
+        refined[lever] = (max(bound[0], best[lever] - step), min(bound[1], best[lever] + step))
+    return refined
+
+
+def _unique_candidates(candidates, levers):
+    # Indices of the first occurrence of each distinct combination of lever values
+    rows = np.column_stack([
+        np.vectorize(CHOICE_LEVERS[lever].index, otypes=[float])(candidates[lever]) if lever in CHOICE_LEVERS
+        else np.round(np.asarray(candidates[lever], dtype=float), 6) for lever in levers])
+    order = np.lexsort(rows.T[::-1])  # stable, so each run of equal rows starts at its first occurrence
+    starts = np.ones(len(order), dtype=bool)
+    starts[1:] = np.any(rows[order][1:] != rows[order][:-1], axis=1)
+    return np.sort(order[starts])
+
+
+def optimize(bounds, objective="annual_subscription", max_breakeven=None, min_risk_adj_npv=0.0,
+             steps=21, refinements=2, chunk_size=50_000, **inputs):
+    """Best feasible candidate and feasible frontier for one deal.
+
+    ``bounds`` maps each searched lever to ``(low, high)``, or to a list of
+    levels for ``impl_intensity``. ``steps`` sets the grid resolution per
+    continuous lever, so a 4-lever search scores ``steps**3 * 3`` candidates
+    per round.
+    """
+    unknown = sorted(set(bounds) - set(LEVERS))
+    if unknown:
+        raise ValueError(f"Unknown levers: {', '.join(unknown)}; expected some of {LEVERS}")
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unknown objective {objective!r}; expected one of {tuple(OBJECTIVES)}")
+    inputs = {**roi_engine.DEFAULT_INPUTS, **inputs}
+
+    evaluated, round_bounds = [], bounds
+    for _ in range(refinements + 1):
+        candidates = candidate_grid(round_bounds, steps)
+        results = evaluate_candidates(inputs, candidates, objective, chunk_size)
+        mask = feasible_mask(results, max_breakeven, min_risk_adj_npv)
+        evaluated.append((candidates, results, mask))
+        if not mask.any():
+            break
+        top = np.flatnonzero(mask)[np.argmax(results["objective"][mask])]
+        round_bounds = _refine(round_bounds, {lever: values[top] for lever, values in candidates.items()}, steps)
+
+    # Pool every round's feasible candidates for the frontier; refined grids overlap, so count each candidate once
+    pooled = {name: np.concatenate([c[name][m] for c, _, m in evaluated]) for name in bounds}
+    pooled.update({name: np.concatenate([r[name][m] for _, r, m in evaluated]) for name in ("objective", *METRICS)})
+    unique = _unique_candidates(pooled, bounds)
+    pooled = {name: values[unique] for name, values in pooled.items()}
+    frontier = {name: values[pareto_frontier(pooled["objective"], pooled["risk_adj_npv"])] for name, values in pooled.items()}
+    best = {name: values[0].item() if isinstance(values[0], np.generic) else values[0]
+            for name, values in frontier.items()} if len(frontier["objective"]) else None
+    return OptimizationResult(best=best, frontier=frontier, evaluated=sum(len(r["objective"]) for _, r, _ in evaluated),
+                              feasible=len(pooled["objective"]))
+
+
+def _optimize_deal(job):
+    # Worker-process entry point; module-level so it pickles
+    inputs, options = job
+    result = optimize(**options, **inputs)
+    best = result.best or {}
+    return {
+        **{f"optimal_{lever}": best.get(lever) for lever in options["bounds"]},
+        **{name: best.get(name) for name in ("objective", *METRICS)},
+        "feasible_candidates": result.feasible,
+    }
+
+
+def optimize_pipeline(frame, bounds, workers=None, **options):
+    """``optimize`` every deal (row) of a pipeline DataFrame; returns the frame with the optimum appended.
+
+    Deals with no feasible candidate get empty optimum columns. Per-deal
+    ``<lever>_low`` / ``<lever>_high`` columns override the continuous ``bounds``;
+    blank cells keep the global bound.
+    """
+    import pandas as pd
+
+    columns = [name for name in roi_engine.DEFAULT_INPUTS if name in frame.columns]
+    jobs = []
+    for row in frame.to_dict("records"):
+        deal_bounds = {lever: tuple(default if pd.isna(value) else value for value, default in
+                                    ((row.get(f"{lever}_low"), bound[0]), (row.get(f"{lever}_high"), bound[1])))
+                       if lever not in CHOICE_LEVERS else bound for lever, bound in bounds.items()}
+        inputs = {name: row[name] for name in columns if row[name] == row[name]}  # skip NaN
+        jobs.append((inputs, dict(options, bounds=deal_bounds)))
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        rows = list(pool.map(_optimize_deal, jobs, chunksize=max(1, len(jobs) // ((workers or os.cpu_count() or 1) * 4))))
+    return pd.concat([frame.reset_index(drop=True), pd.DataFrame(rows)], axis=1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Optimize the pricing and scope of every deal in a pipeline.")
+    parser.add_argument("input", help="CSV or Parquet file with one row per deal")
+    parser.add_argument("output", help="CSV file to write")
+    parser.add_argument("--objective", choices=list(OBJECTIVES), default="annual_subscription")
+    parser.add_argument("--max-breakeven", type=float, default=None, help="Latest acceptable breakeven (years)")
+    parser.add_argument("--min-risk-adj-npv", type=float, default=0.0, help="Lowest acceptable risk-adjusted NPV ($)")
+    for lever in LEVERS:
+        if lever not in CHOICE_LEVERS:
+            parser.add_argument(f"--{lever.replace('_', '-')}", type=float, nargs=2, metavar=("LOW", "HIGH"),
+                                help=f"Search {lever} between LOW and HIGH")
+    parser.add_argument("--impl-intensity", nargs="+", choices=CHOICE_LEVERS["impl_intensity"],
+                        help="Search these implementation intensities")
+    parser.add_argument("--steps", type=int, default=21, help="Grid values per continuous lever and round")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    args = parser.parse_args(argv)
+
+    import pandas as pd
+
+    bounds = {lever: getattr(args, lever) for lever in LEVERS if getattr(args, lever)}
+    if not bounds:
+        parser.error("give bounds for at least one lever, e.g. --annual-subscription 0 500000")
+    frame = pd.read_parquet(args.input) if args.input.endswith(".parquet") else pd.read_csv(args.input)
+    optimized = optimize_pipeline(frame, bounds, workers=args.workers, objective=args.objective,
+                                  max_breakeven=args.max_breakeven, min_risk_adj_npv=args.min_risk_adj_npv, steps=args.steps)
+    optimized.to_csv(args.output, index=False)
+    print(f"Optimized {len(optimized):,} deals -> {args.output} "
+          f"({optimized['objective'].notna().sum():,} with a feasible candidate)")
+
+
+if __name__ == "__main__":
+    main()
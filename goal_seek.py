@@ -0,0 +1,175 @@
+"""Goal-seek solver: invert the strategic ROI model for a single lever.
+
+Given raw tab inputs (see ``roi_engine.DEFAULT_INPUTS``), find the value of
+one lever that hits a breakeven year, an NPV or an IRR. Every input may be an
+array, so a whole pipeline is solved in one call.
+
+Cash flows are affine in the levers in ``AFFINE_LEVERS`` and every target can
+be written as a linear functional of the cash flows, so those levers are solved
+exactly from two model evaluations. Any other input is solved by vectorized
+bisection inside a bracket.
+
+``solve_frame`` solves a pipeline table; the CLI does the same CSV to CSV:
+
+    python goal_seek.py pipeline.csv solved.csv --lever annual_subscription --target breakeven --value 3
+"""
+import argparse
+
+import numpy as np
+
+import roi_engine
+
+AFFINE_LEVERS = ("waste_pct", "num_employees", "annual_subscription", "initial_setup", "impl_duration")
+TARGETS = ("breakeven", "npv", "irr")
+
+# Default search ranges for levers solved by bisection.
+BRACKETS = {
+    "escalation_rate": (0.0, 100.0),
+    "annual_salary": (0.0, 10_000_000.0),
+    "improvement_target": (0.0, 100.0),
+    "key_users": (0.0, 1_000.0),
+    "wacc": (0.0, 100.0),
+}
+
+
+def _evaluate(inputs, horizon=None):
+    if horizon is not None:
+        inputs = {**inputs, "analysis_years": np.maximum(inputs["analysis_years"], horizon)}
+    return roi_engine.evaluate_inputs(**inputs)
+
+
+def breakeven_position(flows, target_years):
+    """Cumulative cash flow at fractional year ``target_years``.
+
+    Within year 1 this follows the ``y1_investment_total / savings`` rule of
+    ``roi_engine.breakeven_years``; afterwards the cumulative cash flow is
+    interpolated through the year, so the position is zero exactly where the
+    reported breakeven equals ``target_years``.
+    """
+    target = np.asarray(target_years, dtype=float)
+    year = np.maximum(np.ceil(target), 1).astype(int)
+    shape = np.broadcast_shapes(flows.net.shape[:-1], year.shape)
+
+    def pick(a, i):
+        a = np.broadcast_to(a, shape + a.shape[-1:])
+        return np.take_along_axis(a, np.broadcast_to(i, shape)[..., np.newaxis], axis=-1)[..., 0]
+
+    prev_cum = np.where(year > 1, pick(flows.cumulative, np.maximum(year - 2, 0)), 0.0)
+    net_now = pick(flows.net, year - 1)
+    in_year_one = flows.savings[..., 0] * target + flows.investments[..., 0]
+    return np.where(target <= 1, in_year_one, prev_cum + (target - (year - 1)) * net_now)
+
+
+def residual(target, value, inputs):
+    """Signed distance of the model from ``target`` = ``value`` for raw ``inputs``."""
+    if target == "breakeven":
+        flows, _ = _evaluate(inputs, horizon=np.ceil(np.max(value)))
+        return breakeven_position(flows, value)
+    flows, derived = _evaluate(inputs)
+    if target == "npv":
+        return flows.npv - value
+    if target == "irr":
+        return roi_engine.npv(flows.net, value, derived["analysis_years"])
+    raise ValueError(f"Unknown target {target!r}; expected one of {TARGETS}")
+
+
+def solve(lever, target, value, bracket=None, iterations=80, **inputs):
+    """Value of ``lever`` at which ``target`` (breakeven years, NPV $ or IRR %) equals ``value``.
+
+    Returns NaN where no solution exists (affine levers with no effect on the
+    target, or bisection brackets that do not straddle a root). Solutions are
+    not clipped to the ranges the tabs allow, e.g. a duration past 52 weeks.
+    """
+    inputs = {**roi_engine.DEFAULT_INPUTS, **inputs}
+    if lever not in inputs:
+        raise ValueError(f"Unknown lever {lever!r}")
+
+    if lever in AFFINE_LEVERS and bracket is None:
+        r0 = residual(target, value, {**inputs, lever: 0.0})
+        r1 = residual(target, value, {**inputs, lever: 1.0})
+        slope = r1 - r0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(slope != 0, -r0 / slope, np.nan)
+
+    low, high = bracket if bracket is not None else BRACKETS[lever]
+    shape = np.broadcast(*[np.asarray(v) for v in inputs.values() if not isinstance(v, str)], np.asarray(value)).shape
+    low, high = np.full(shape, low, dtype=float), np.full(shape, high, dtype=float)
+    r_low = residual(target, value, {**inputs, lever: low})
+    r_high = residual(target, value, {**inputs, lever: high})
+    valid = np.sign(r_low) != np.sign(r_high)
+    for _ in range(iterations):
+        mid = (low + high) / 2
+        r_mid = residual(target, value, {**inputs, lever: mid})
+        same_side = np.sign(r_mid) == np.sign(r_low)
+        low, r_low = np.where(same_side, mid, low), np.where(same_side, r_mid, r_low)
+        high = np.where(same_side, high, mid)
+    return np.where(valid, (low + high) / 2, np.nan)
+
+
+def irr(net, analysis_years, low=-99.0, high=1_000.0, iterations=80):
+    """Internal rate of return (%) of per-period net cash flows, by vectorized bisection."""
+    shape = net.shape[:-1]
+    low, high = np.full(shape, low), np.full(shape, high)
+    f_low = roi_engine.npv(net, low, analysis_years)
+    valid = np.sign(f_low) != np.sign(roi_engine.npv(net, high, analysis_years))
+    for _ in range(iterations):
+        mid = (low + high) / 2
+        f_mid = roi_engine.npv(net, mid, analysis_years)
+        same_side = np.sign(f_mid) == np.sign(f_low)
+        low, f_low = np.where(same_side, mid, low), np.where(same_side, f_mid, f_low)
+        high = np.where(same_side, high, mid)
+    return np.where(valid, (low + high) / 2, np.nan)
+
+
+def achieved(target, **inputs):
+    """The ``target`` metric (breakeven years, NPV $ or IRR %) the model reports for raw ``inputs``."""
+    flows, derived = roi_engine.evaluate_inputs(**inputs)
+    if target == "breakeven":
+        return flows.breakeven
+    if target == "npv":
+        return flows.npv
+    if target == "irr":
+        return irr(flows.net, derived["analysis_years"])
+    raise ValueError(f"Unknown target {target!r}; expected one of {TARGETS}")
+
+
+def solve_frame(frame, lever, target, value=None, bracket=None):
+    """``solve`` every deal (row) of a DataFrame; returns it with ``solved_<lever>`` and ``achieved_<target>``.
+
+    Columns use the raw tab input names; missing columns and blank cells take
+    the tab defaults. A ``target_value`` column overrides ``value`` per deal.
+    """
+    inputs = {name: frame[name].fillna(default).to_numpy() for name, default in roi_engine.DEFAULT_INPUTS.items()
+              if name in frame.columns and name != lever}
+    values = frame["target_value"].fillna(value).to_numpy(dtype=float) if "target_value" in frame.columns else value
+    if values is None:
+        raise ValueError("Give a target value or a target_value column")
+    solved = solve(lever, target, values, bracket, **inputs)
+    return frame.assign(**{f"solved_{lever}": solved, f"achieved_{target}": achieved(target, **inputs, **{lever: solved})})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve one lever of every deal in a pipeline for a target.")
+    parser.add_argument("input", help="CSV file with one row per deal")
+    parser.add_argument("output", help="CSV file to write")
+    parser.add_argument("--lever", required=True, choices=list(roi_engine.DEFAULT_INPUTS))
+    parser.add_argument("--target", required=True, choices=TARGETS)
+    parser.add_argument("--value", type=float, help="Target breakeven (years), NPV ($) or IRR (%%), unless a target_value column is given")
+    parser.add_argument("--bracket", type=float, nargs=2, metavar=("LOW", "HIGH"), help="Search range for a bisected lever")
+    parser.add_argument("--chunk-rows", type=int, default=100_000, help="Deals per chunk")
+    args = parser.parse_args(argv)
+
+    import pandas as pd
+
+    text_inputs = {name: str for name, default in roi_engine.DEFAULT_INPUTS.items() if isinstance(default, str)}
+    solved = unsolved = 0
+    for i, chunk in enumerate(pd.read_csv(args.input, chunksize=args.chunk_rows, dtype=text_inputs)):
+        result = solve_frame(chunk, args.lever, args.target, args.value, args.bracket)
+        result.to_csv(args.output, mode="w" if i == 0 else "a", header=i == 0, index=False)
+        found = int(result[f"solved_{args.lever}"].notna().sum())
+        solved, unsolved = solved + found, unsolved + len(result) - found
+    print(f"Solved {args.lever} for {solved:,} deals -> {args.output} ({unsolved:,} without a solution)")
+
+
+if __name__ == "__main__":
+    main()
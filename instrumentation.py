@@ -0,0 +1,246 @@
+"""Per-rerun timing spans, metrics files and an opt-in debug panel for the apps.
+
+Each Streamlit rerun gets a ``Rerun`` whose ``span`` context manager times a
+section of the script. Metrics files are opt-in: with ``ROI_METRICS_DIR`` set
+to a directory, each finished rerun's spans and the session's rerun count are
+appended to ``<ROI_METRICS_DIR>/reruns.jsonl`` (rotated to ``reruns.jsonl.1``
+past ``RERUNS_MAX_BYTES``), and running totals go to
+``<ROI_METRICS_DIR>/metrics.prom`` in Prometheus text format for a local
+scraper. Unset or empty, nothing is written.
+
+Opening an app with ``?debug=1`` shows the slowest spans of the current rerun
+in the sidebar, with the model nodes that recomputed, the result cache hit
+rate and a button that runs cProfile over the rerun it triggers and saves the
+profile under ``<ROI_METRICS_DIR>/profiles``. The approximate size of
+``session_state`` is only measured in those debug or profiled reruns, since
+walking it costs time on every rerun.
+
+Only ``finish_rerun`` imports Streamlit, so the rest loads without it.
+"""
+import bisect
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+import numpy as np
+
+import result_cache
+
+METRICS_DIR = os.environ.get("ROI_METRICS_DIR", "")
+
+# reruns.jsonl is rotated once it grows past this size, keeping one previous file.
+RERUNS_MAX_BYTES = 64 * 1024 * 1024
+
+# Upper bounds of the session_state size histogram: 4 KiB to 64 MiB.
+SESSION_BYTES_BUCKETS = tuple(4 ** k * 1024 for k in range(1, 9))
+
+
+def deep_sizeof(obj, _seen=None):
+    """Approximate bytes held by ``obj`` and everything it references."""
+    seen = _seen if _seen is not None else set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes + sys.getsizeof(obj)
+    if hasattr(obj, "memory_usage") and hasattr(obj, "columns"):
+        return int(obj.memory_usage(deep=True).sum())
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    elif hasattr(obj, "__dict__") and not isinstance(obj, type):
+        size += deep_sizeof(vars(obj), seen)
+    return size
+
+
+def max_rss_bytes():
+    """Peak resident set size of this process, or ``None`` where it cannot be read."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class MetricsSink:
+    """Process-wide aggregates written as JSON lines and a Prometheus text file."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self.reruns = {}
+        self.rerun_seconds = {}
+        self.span_seconds = {}
+        self.span_counts = {}
+        self.session_bytes = {}  # app -> {"counts": per bucket, then +Inf, "sum": bytes}
+
+    def record(self, record):
+        with self._lock:
+            app = record["app"]
+            self.reruns[app] = self.reruns.get(app, 0) + 1
+            self.rerun_seconds[app] = self.rerun_seconds.get(app, 0.0) + record["seconds"]
+            for span in record["spans"]:
+                key = (app, span["name"])
+                self.span_seconds[key] = self.span_seconds.get(key, 0.0) + span["seconds"]
+                self.span_counts[key] = self.span_counts.get(key, 0) + 1
+            size = record["session_state_bytes"]
+            if size is not None:
+                histogram = self.session_bytes.setdefault(app, {"counts": [0] * (len(SESSION_BYTES_BUCKETS) + 1), "sum": 0})
+                histogram["counts"][bisect.bisect_left(SESSION_BYTES_BUCKETS, size)] += 1
+                histogram["sum"] += size
+            if not self.directory:
+                return
+            os.makedirs(self.directory, exist_ok=True)
+            path = os.path.join(self.directory, "reruns.jsonl")
+            if os.path.exists(path) and os.path.getsize(path) > RERUNS_MAX_BYTES:
+                os.replace(path, path + ".1")
+            with open(path, "a") as f:
+                f.write(json.dumps(record) + "\n")
+            self._write_prometheus(record.get("max_rss_bytes"))
+
+    def _write_prometheus(self, max_rss_bytes):
+        lines = [
+            "# HELP roi_app_reruns_total Script reruns completed.",
+            "# TYPE roi_app_reruns_total counter",
+            *[f'roi_app_reruns_total{{app="{app}"}} {count}' for app, count in self.reruns.items()],
+            "# HELP roi_app_rerun_seconds_total Wall time spent in reruns.",
+            "# TYPE roi_app_rerun_seconds_total counter",
+            *[f'roi_app_rerun_seconds_total{{app="{app}"}} {secs:.6f}' for app, secs in self.rerun_seconds.items()],
+            "# HELP roi_app_span_seconds_total Wall time spent in each instrumented section.",
+            "# TYPE roi_app_span_seconds_total counter",
+            *[f'roi_app_span_seconds_total{{app="{app}",span="{span}"}} {secs:.6f}'
+              for (app, span), secs in self.span_seconds.items()],
+            "# HELP roi_app_span_calls_total Executions of each instrumented section.",
+            "# TYPE roi_app_span_calls_total counter",
+            *[f'roi_app_span_calls_total{{app="{app}",span="{span}"}} {count}'
+              for (app, span), count in self.span_counts.items()],
+            "# HELP roi_app_session_state_bytes Approximate session_state size at the end of each rerun.",
+            "# TYPE roi_app_session_state_bytes histogram",
+        ]
+        for app, histogram in self.session_bytes.items():
+            cumulative = np.cumsum(histogram["counts"])
+            lines += [f'roi_app_session_state_bytes_bucket{{app="{app}",le="{bound}"}} {count}'
+                      for bound, count in zip((*SESSION_BYTES_BUCKETS, "+Inf"), cumulative)]
+            lines += [f'roi_app_session_state_bytes_sum{{app="{app}"}} {histogram["sum"]}',
+                      f'roi_app_session_state_bytes_count{{app="{app}"}} {cumulative[-1]}']
+        if max_rss_bytes is not None:
+            lines += ["# HELP roi_process_max_rss_bytes Peak resident set size of the server process.",
+                      "# TYPE roi_process_max_rss_bytes gauge",
+                      f"roi_process_max_rss_bytes {max_rss_bytes}"]
+        path = os.path.join(self.directory, "metrics.prom")
+        with open(path + ".tmp", "w") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(path + ".tmp", path)
+
+
+SINK = MetricsSink(METRICS_DIR)
+
+
+class Rerun:
+    def __init__(self, app, session_id, rerun_number, sink=SINK):
+        self.app = app
+        self.session_id = session_id
+        self.rerun_number = rerun_number
+        self.sink = sink
+        self.spans = []
+        self.profile_path = None
+        self.record = None
+        self._profiler = None
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def span(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.spans.append((name, time.perf_counter() - start))
+
+    @property
+    def profiling(self):
+        return self._profiler is not None
+
+    def start_profile(self):
+        self._profiler = cProfile.Profile()
+        self._profiler.enable()
+
+    def finish(self, session_state_bytes=None, **extra):
+        """Close the rerun and record it with any ``extra`` fields; later calls return the first record."""
+        if self.record is not None:
+            return self.record
+        if self._profiler is not None:
+            self._profiler.disable()
+            if self.sink.directory:
+                profile_dir = os.path.join(self.sink.directory, "profiles")
+                os.makedirs(profile_dir, exist_ok=True)
+                self.profile_path = os.path.join(
+                    profile_dir, f"{self.app}-{self.session_id[:8]}-{int(time.time())}.prof")
+                self._profiler.dump_stats(self.profile_path)
+        self.record = {
+            "ts": time.time(),
+            "app": self.app,
+            "session": self.session_id,
+            "rerun": self.rerun_number,
+            "seconds": time.perf_counter() - self._start,
+            "spans": [{"name": name, "seconds": secs} for name, secs in self.spans],
+            "session_state_bytes": session_state_bytes,
+            "max_rss_bytes": max_rss_bytes(),
+            "profile": self.profile_path,
+            **extra,
+        }
+        self.sink.record(self.record)
+        return self.record
+
+
+def begin_rerun(app, session_state):
+    """Start timing a rerun; call at the top of the script."""
+    if "_session_id" not in session_state:
+        session_state["_session_id"] = uuid.uuid4().hex
+        session_state["_rerun_count"] = 0
+    session_state["_rerun_count"] += 1
+    rerun = Rerun(app, session_state["_session_id"], session_state["_rerun_count"])
+    if session_state.get("_profile_next_rerun"):
+        session_state["_profile_next_rerun"] = False
+        rerun.start_profile()
+    return rerun
+
+
+def finish_rerun(rerun, session_state, graph=None):
+    """Record the rerun and, with ``?debug=1``, show the debug panel; call before the script ends or stops.
+
+    ``graph`` is the session's ``ModelGraph``; its recompute log is recorded
+    alongside the spans, as are the shared result cache counters.
+    """
+    import streamlit as st
+
+    debug = st.query_params.get("debug") == "1"
+    state_bytes = None
+    if debug or rerun.profiling:
+        state_bytes = deep_sizeof({key: session_state[key] for key in session_state.keys()})
+    graph_nodes = [{"name": name, "seconds": secs} for name, secs in graph.recomputed] if graph is not None else []
+    record = rerun.finish(session_state_bytes=state_bytes, graph_nodes=graph_nodes, cache=result_cache.RESULTS.stats())
+    if not debug:
+        return
+    with st.sidebar.expander("🛠️ Performance Debug", expanded=True):
+        st.caption(f"Rerun #{record['rerun']} took {record['seconds'] * 1000:,.0f} ms · "
+                   f"session state ≈ {record['session_state_bytes'] / 1024:,.0f} KiB")
+        slowest = sorted(rerun.spans, key=lambda span: span[1], reverse=True)[:10]
+        st.table({"Span": [name for name, _ in slowest], "ms": [round(secs * 1000, 1) for _, secs in slowest]})
+        if graph_nodes:
+            st.caption("Recomputed model nodes: " + ", ".join(
+                f"{node['name']} ({node['seconds'] * 1000:.1f} ms)" for node in graph_nodes))
+        st.caption("Result cache: {entries} entries, {hit_rate:.0%} hit rate, {evictions} evictions".format(**record["cache"]))
+        if record["profile"]:
+            st.caption(f"cProfile saved to `{record['profile']}`")
+        elif rerun.profiling:
+            st.caption("Set ROI_METRICS_DIR to save the cProfile output.")
+        # The callback runs before the rerun the click triggers, so begin_rerun profiles that rerun
+        st.button("Profile Next Rerun", on_click=session_state.__setitem__, args=("_profile_next_rerun", True))
@@ -0,0 +1,177 @@
+"""Concurrent-session load harness for the Streamlit apps.
+
+Drives simulated browser sessions through ``streamlit.testing.v1.AppTest``:
+every session opens the app, then repeats a realistic interaction sequence
+(``SEQUENCE``) for ``--iterations`` rounds. A step is one widget change plus
+the rerun it triggers. ``--concurrency`` sessions run at a time, so
+throughput shows how the app scales as sessions compete for the machine.
+
+AppTest swaps process-wide Streamlit state (the runtime, config options) on
+every run and leaves the app script as ``__main__``, so sessions cannot share
+a process as they do in the server: each session runs in a fresh worker
+process. The results therefore exclude in-process contention between sessions
+(the GIL, the shared caches' locks) and any sharing of ``result_cache.RESULTS``
+or ``scenario_store.STORE`` across sessions; concurrent sessions compete only
+for CPU and memory. The report says so in its ``isolation`` field.
+
+For each concurrency level the report gives:
+
+* rerun latency percentiles and throughput (reruns per second);
+* ``session_state`` bytes per session (``instrumentation.deep_sizeof``) and
+  their growth per rerun, which flags state that leaks in long-lived sessions;
+* figure bytes per session: the Plotly specs the last rerun sent to the browser;
+* the bytes held by a session's result cache, and peak worker RSS.
+
+    python load_harness.py --concurrency 1 2 4 8 --sessions 8 --iterations 5 --output load_report.json
+
+Leave ``ROI_METRICS_DIR`` unset to keep the apps' own metrics files out of the timing.
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import instrumentation
+import result_cache
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "strategic_model.py")
+PERCENTILES = (50, 90, 95, 99)
+
+ISOLATION = ("one process per session: excludes in-process contention and cross-session sharing "
+             "of result_cache.RESULTS and scenario_store.STORE")
+
+# The deal every session starts from (widget keys of strategic_model.py).
+START_STATE = {"salary_state": "100,000", "saas_state": "50,000", "services_state": "20,000", "baseline_waste_hrs": 4.0}
+
+
+def _by_label(widgets, label):
+    return next(widget for widget in widgets if widget.label == label)
+
+
+# --- Interaction steps: each changes one widget; the harness then reruns the app ---
+def change_salary(at, rng):
+    at.text_input(key="salary_state").set_value(f"{int(rng.integers(60, 160)) * 1_000:,}")
+
+
+def toggle_target_mode(at, rng):
+    toggle = at.toggle(key="target_mode")
+    toggle.set_value(not toggle.value)
+
+
+def change_sensitivity_grid(at, rng):
+    # Expander bodies always run; resizing the grid is what opening and using it costs
+    _by_label(at.select_slider, "Grid Resolution").set_value(int(rng.choice([5, 10, 25, 50])))
+
+
+def switch_chart_view(at, rng):
+    radio = _by_label(at.radio, "Chart View:")
+    radio.set_value("Annual Net ROI" if radio.value == "Cumulative ROI" else "Cumulative ROI")
+
+
+SEQUENCE = (change_salary, toggle_target_mode, change_sensitivity_grid, switch_chart_view, toggle_target_mode)
+
+
+def _figure_bytes(at):
+    return sum(len(chart.proto.spec) for chart in at.get("plotly_chart"))
+
+
+def run_session(session, iterations, app_path=APP_PATH, sequence=SEQUENCE, timeout=120):
+    """One simulated session; returns its rerun latencies, errors and memory samples."""
+    from streamlit.testing.v1 import AppTest
+
+    rng = np.random.default_rng(session)
+    at = AppTest.from_file(app_path, default_timeout=timeout)
+    for key, value in START_STATE.items():
+        at.session_state[key] = value
+    latencies, state_bytes, errors = [], [], 0
+    steps = [None] + [step for _ in range(iterations) for step in sequence]
+    for step in steps:
+        try:
+            if step is not None:
+                step(at, rng)
+            start = time.perf_counter()
+            at.run()
+            latencies.append(time.perf_counter() - start)
+        except Exception:  # a failed step is counted, and the session carries on
+            errors += 1
+            continue
+        errors += len(at.exception)
+        state_bytes.append(instrumentation.deep_sizeof(at.session_state.to_dict()))
+    return {"latencies": latencies, "errors": errors, "session_state_bytes": state_bytes, "figure_bytes": _figure_bytes(at),
+            "result_cache_bytes": instrumentation.deep_sizeof(result_cache.RESULTS.values()),
+            "max_rss_bytes": instrumentation.max_rss_bytes()}
+
+
+def _growth_per_rerun(samples):
+    # Least-squares slope after the first rerun, which builds the session
+    samples = samples[1:]
+    if len(samples) < 2:
+        return 0.0
+    return float(np.polyfit(np.arange(len(samples)), samples, 1)[0])
+
+
+def run_level(concurrency, sessions, iterations, app_path=APP_PATH):
+    """Run ``sessions`` sessions, ``concurrency`` at a time, and summarise them."""
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=concurrency, max_tasks_per_child=1) as pool:
+        results = list(pool.map(run_session, range(sessions), [iterations] * sessions, [app_path] * sessions))
+    seconds = time.perf_counter() - start
+    latencies = np.array([latency for r in results for latency in r["latencies"]])
+    final_state = [r["session_state_bytes"][-1] for r in results if r["session_state_bytes"]]
+    return {
+        "concurrency": concurrency,
+        "sessions": sessions,
+        "reruns": int(latencies.size),
+        "errors": sum(r["errors"] for r in results),
+        "seconds": seconds,
+        "throughput_reruns_per_s": latencies.size / seconds,
+        "latency_ms": {f"p{q}": float(np.percentile(latencies, q) * 1000) for q in PERCENTILES} if latencies.size else {},
+        "session_state_bytes": {"mean": statistics.fmean(final_state), "max": max(final_state)} if final_state else {},
+        "session_state_growth_bytes_per_rerun": statistics.median(_growth_per_rerun(r["session_state_bytes"]) for r in results),
+        "figure_bytes": {"mean": statistics.fmean(r["figure_bytes"] for r in results),
+                         "max": max(r["figure_bytes"] for r in results)},
+        "result_cache_bytes": max(r["result_cache_bytes"] for r in results),
+        "max_rss_bytes": max((r["max_rss_bytes"] or 0) for r in results),
+    }
+
+
+def run(levels, sessions, iterations, app_path=APP_PATH):
+    """Load-test every concurrency level in turn, each on fresh worker processes."""
+    report = {"app": app_path, "iterations": iterations, "steps": [step.__name__ for step in SEQUENCE],
+              "isolation": ISOLATION, "levels": []}
+    for concurrency in levels:
+        report["levels"].append(run_level(concurrency, max(sessions, concurrency), iterations, app_path))
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Drive concurrent simulated sessions through a Streamlit app.")
+    parser.add_argument("--app", default=APP_PATH, help="Streamlit script to load (default: strategic_model.py)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8], help="Concurrent sessions per level")
+    parser.add_argument("--sessions", type=int, default=8, help="Sessions per level (at least the concurrency)")
+    parser.add_argument("--iterations", type=int, default=3, help="Rounds of the interaction sequence per session")
+    parser.add_argument("--output", help="Write the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = run(args.concurrency, args.sessions, args.iterations, args.app)
+    print(f"{'sessions':>8} {'conc.':>5} {'reruns/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'state KiB':>9} {'growth B/rerun':>14} {'figs KiB':>8} {'errors':>6}")
+    for level in report["levels"]:
+        print(f"{level['sessions']:>8} {level['concurrency']:>5} {level['throughput_reruns_per_s']:>9.1f} "
+              f"{level['latency_ms'].get('p50', 0):>8.0f} {level['latency_ms'].get('p95', 0):>8.0f} {level['latency_ms'].get('p99', 0):>8.0f} "
+              f"{level['session_state_bytes'].get('mean', 0) / 1024:>9.1f} {level['session_state_growth_bytes_per_rerun']:>14.0f} "
+              f"{level['figure_bytes']['mean'] / 1024:>8.1f} {level['errors']:>6}")
+    print(f"Result cache per session ≈ {report['levels'][-1]['result_cache_bytes'] / 1024 / 1024:,.1f} MiB · "
+          f"peak worker RSS {report['levels'][-1]['max_rss_bytes'] / 1024 / 1024:,.0f} MiB")
+    print(f"Note: {ISOLATION}.")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""Incremental dependency graph for the derived quantities of the strategic model.
+
+Each node is a function whose parameter names are the nodes or inputs it
+reads. Setting an input only dirties the nodes downstream of it, and a node is
+recomputed lazily the next time it is read, so an edit that touches one leaf
+costs only its subgraph. The graph records which nodes recomputed, and how
+long each took, since the last ``begin_run``.
+"""
+import inspect
+import math
+import time
+
+import numpy as np
+
+import goal_seek
+import roi_engine
+
+
+def _same(a, b):
+    try:
+        return bool(np.all(a == b)) and type(a) is type(b)
+    except (TypeError, ValueError):
+        return False
+
+
+class ModelGraph:
+    def __init__(self):
+        self._nodes = {}
+        self._dependents = {}
+        self._values = {}
+        self.recomputed = []
+
+    def node(self, func):
+        """Register ``func`` as a node named after it; its parameters are its inputs."""
+        inputs = tuple(inspect.signature(func).parameters)
+        self._nodes[func.__name__] = (func, inputs)
+        for name in inputs:
+            self._dependents.setdefault(name, set()).add(func.__name__)
+        return func
+
+    def set(self, **inputs):
+        """Update input values, dirtying only the nodes that depend on changed ones."""
+        for name, value in inputs.items():
+            if name in self._values and _same(self._values[name], value):
+                continue
+            self._values[name] = value
+            self._invalidate(name)
+
+    def _invalidate(self, name):
+        # A node is only ever cached after its inputs, so an uncached node has
+        # no cached dependents to visit.
+        for dependent in self._dependents.get(name, ()):
+            if dependent in self._values:
+                del self._values[dependent]
+                self._invalidate(dependent)
+
+    def __getitem__(self, name):
+        if name in self._values:
+            return self._values[name]
+        if name not in self._nodes:
+            raise KeyError(f"Input {name!r} has not been set")
+        func, inputs = self._nodes[name]
+        args = [self[i] for i in inputs]
+        start = time.perf_counter()
+        value = func(*args)
+        self.recomputed.append((name, time.perf_counter() - start))
+        self._values[name] = value
+        return value
+
+    def begin_run(self):
+        """Start a new recompute log, e.g. at the top of each Streamlit rerun."""
+        self.recomputed = []
+
+
+def build_model_graph():
+    """The derived-quantity chain of ``strategic_model.py`` as a ``ModelGraph``.
+
+    Inputs are the tab widget values under their script names, plus
+    ``target_mode``/``target_yrs`` from the Breakeven Period Target controls.
+    The nodes that reach the period engine, the result cache and the scenario
+    store (``period_settings``, ``current_be`` and ``report_flows``) are left
+    for the app to register, so this module only needs the model.
+    """
+    graph = ModelGraph()
+
+    @graph.node
+    def burdened_cost_pp(annual_salary, fringe_rate):
+        return annual_salary * (1 + fringe_rate/100)
+
+    @graph.node
+    def total_annual_hours_pp(work_days, daily_hours):
+        return work_days * daily_hours
+
+    @graph.node
+    def hourly_rate_pp(burdened_cost_pp, total_annual_hours_pp):
+        return burdened_cost_pp / max(total_annual_hours_pp, 1)
+
+    @graph.node
+    def max_dur(impl_unit):
+        return roi_engine.MAX_DURATION[impl_unit]
+
+    @graph.node
+    def impl_factor(impl_duration, max_dur):
+        return (max_dur - impl_duration)/max_dur
+
+    @graph.node
+    def client_internal_investment(key_users, impl_intensity, hourly_rate_pp):
+        return key_users * roi_engine.INTENSITY_HOURS[impl_intensity] * hourly_rate_pp
+
+    @graph.node
+    def y1_investment_total(initial_setup, client_internal_investment, y1_recurring):
+        return initial_setup + client_internal_investment + y1_recurring
+
+    @graph.node
+    def model_inputs(burdened_cost_pp, total_annual_hours_pp, num_employees, improvement_target,
+                     escalation_rate, impl_factor, y1_investment_total, steady_state_recurring, analysis_years):
+        return dict(
+            burdened_cost_pp=burdened_cost_pp, total_annual_hours_pp=total_annual_hours_pp,
+            num_employees=num_employees, improvement_target=improvement_target,
+            escalation_rate=escalation_rate, impl_factor=impl_factor,
+            y1_investment_total=y1_investment_total, steady_state_recurring=steady_state_recurring,
+            analysis_years=analysis_years,
+        )
+
+    @graph.node
+    def current_be_key(model_inputs, baseline_waste_pct):
+        return dict(waste_pct=baseline_waste_pct, **model_inputs)
+
+    @graph.node
+    def lever_inputs(num_employees, annual_salary, fringe_rate, work_days, daily_hours, improvement_target,
+                     y1_recurring, steady_state_recurring, initial_setup, analysis_years, escalation_rate,
+                     impl_duration, impl_unit, key_users, impl_intensity):
+        # Raw tab inputs apart from the waste target and WACC, which breakeven does not depend on
+        return dict(
+            num_employees=num_employees, annual_salary=annual_salary, fringe_rate=fringe_rate,
+            work_days=work_days, daily_hours=daily_hours, improvement_target=improvement_target,
+            current_subscription=steady_state_recurring - y1_recurring, annual_subscription=steady_state_recurring,
+            initial_setup=initial_setup, analysis_years=analysis_years, escalation_rate=escalation_rate,
+            impl_duration=impl_duration, impl_unit=impl_unit, key_users=key_users, impl_intensity=impl_intensity,
+        )
+
+    @graph.node
+    def final_calc_pct(target_mode, target_yrs, baseline_waste_pct, lever_inputs):
+        if target_mode:
+            return float(goal_seek.solve("waste_pct", "breakeven", target_yrs, **lever_inputs)) / 100
+        return baseline_waste_pct
+
+    @graph.node
+    def report_key(model_inputs, final_calc_pct, wacc, period_settings):
+        return dict(waste_pct=final_calc_pct, wacc=wacc, **model_inputs, **period_settings)
+
+    @graph.node
+    def flows_key(report_key, period_settings, y1_recurring):
+        # The monthly/weekly engine also splits the year 1 subscription out of the one-off costs
+        return dict(report_key, y1_recurring=y1_recurring) if period_settings else report_key
+
+    @graph.node
+    def cash_flow_table(report_flows, analysis_years):
+        import pandas as pd
+
+        flows, _ = report_flows
+        df = pd.DataFrame({"Period": [f"Year {i}" for i in range(1, analysis_years + 1)], "Investment": flows.investments.tolist(), "Gross Savings": flows.savings.tolist()})
+        df["Net Cash Flow"] = df["Investment"] + df["Gross Savings"]
+        df["Cumulative Cash Flow"] = df["Net Cash Flow"].cumsum()
+        return df
+
+    @graph.node
+    def total_sub_cost(y1_recurring, steady_state_recurring, analysis_years):
+        return y1_recurring + (steady_state_recurring * (analysis_years - 1))
+
+    @graph.node
+    def total_tco(total_sub_cost, initial_setup, client_internal_investment):
+        return total_sub_cost + initial_setup + client_internal_investment
+
+    @graph.node
+    def annual_hrs(total_annual_hours_pp, final_calc_pct, improvement_target, num_employees):
+        return total_annual_hours_pp * final_calc_pct * (improvement_target/100) * num_employees
+
+    @graph.node
+    def fte_reclaimed(annual_hrs, total_annual_hours_pp):
+        return math.floor((annual_hrs / max(total_annual_hours_pp, 1)) * 10) / 10.0
+
+    @graph.node
+    def scenario_inputs(lever_inputs, final_calc_pct, wacc):
+        # The report scenario as raw tab inputs, for the sensitivity and tornado views
+        return dict(lever_inputs, waste_pct=final_calc_pct * 100, wacc=wacc)
+
+    return graph
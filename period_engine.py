@@ -0,0 +1,210 @@
+"""Monthly or weekly cash-flow engine with adoption ramps, rolled up to years.
+
+The annual engine in ``roi_engine`` prorates year 1 savings by a single
+``impl_factor``. Here each year is split into ``periods_per_year`` periods:
+savings start at go-live (``1 - impl_factor`` of the first year) and follow
+an adoption ramp, subscription billing may start part-way through the year,
+and every period is discounted at its own end. ``roll_up`` sums the periods
+back into the annual ``CashFlows`` layout the report table uses.
+
+Inputs broadcast as in ``roi_engine``, with periods on a trailing axis of
+length ``max(analysis_years) * periods_per_year``. ``ramp`` and the period
+count are scalars. ``batch_metrics`` evaluates large scenario sets in chunks,
+so peak memory stays bounded however many scenarios are passed.
+"""
+from typing import NamedTuple
+
+import numpy as np
+
+import roi_engine
+
+PERIODS_PER_YEAR = {"Monthly": 12, "Weekly": 52}
+RAMPS = ("Immediate", "Linear", "S-Curve", "Stepped")
+
+
+class PeriodFlows(NamedTuple):
+    savings: np.ndarray
+    investments: np.ndarray
+    net: np.ndarray
+    cumulative: np.ndarray
+    npv: np.ndarray
+    breakeven: np.ndarray
+    periods_per_year: int
+
+
+def period_index(analysis_years, periods_per_year):
+    """Period numbers ``1..max(analysis_years) * periods_per_year``."""
+    return np.arange(1, int(np.max(analysis_years)) * periods_per_year + 1)
+
+
+def _overlap(start, end, lo, hi):
+    # Length of [start, end) inside [lo, hi), in years.
+    return np.clip(np.minimum(end, hi) - np.maximum(start, lo), 0.0, None)
+
+
+def _adoption_integral(tau, ramp, ramp_years, ramp_steps):
+    """Integral of the adoption curve from go-live to ``tau`` years after it."""
+    tau = np.maximum(tau, 0.0)
+    length = np.maximum(ramp_years, 1e-9)
+    x = np.minimum(tau / length, 1.0)
+    if ramp == "Immediate":
+        return tau
+    if ramp == "Linear":
+        ramped = x * x / 2
+    elif ramp == "S-Curve":
+        # Smoothstep 3x^2 - 2x^3: slow start, fast middle, slow finish
+        ramped = x * x * x * (1 - x / 2)
+    elif ramp == "Stepped":
+        # Equal steps of 1/ramp_steps, the first taken at go-live
+        steps = np.asarray(ramp_steps, dtype=float)
+        done = np.minimum(np.floor(x * steps), steps)
+        ramped = done * (done + 1) / (2 * steps ** 2) + (x - done / steps) * np.minimum(done + 1, steps) / steps
+    else:
+        raise ValueError(f"Unknown ramp {ramp!r}; expected one of {RAMPS}")
+    return length * ramped + np.maximum(tau - length, 0.0)
+
+
+def adoption_vector(impl_factor, analysis_years, periods_per_year=12, ramp="Immediate",
+                    ramp_months=0.0, ramp_steps=3):
+    """Average share of full adoption in each period (0 before go-live)."""
+    boundaries = np.arange(len(period_index(analysis_years, periods_per_year)) + 1) / periods_per_year
+    since_go_live = boundaries - (1 - roi_engine.column(impl_factor))
+    integral = _adoption_integral(since_go_live, ramp, roi_engine.column(ramp_months) / 12,
+                                  roi_engine.column(ramp_steps))
+    return np.diff(integral, axis=-1) * periods_per_year
+
+
+def savings_vector(burdened_cost_pp, total_annual_hours_pp, waste_pct, num_employees,
+                   improvement_target, escalation_rate, adoption, analysis_years, periods_per_year=12):
+    """Gross savings per period: the escalated annual run-rate times adoption."""
+    p = period_index(analysis_years, periods_per_year)
+    # Salaries step up on each anniversary, so escalate per year and repeat per period
+    escalation = np.repeat(roi_engine.escalation_vector(escalation_rate, analysis_years), periods_per_year, axis=-1)
+    hours = roi_engine.column(total_annual_hours_pp)
+    hourly_rate = roi_engine.column(burdened_cost_pp) * escalation / np.maximum(hours, 1)
+    annual = (hours * roi_engine.column(waste_pct) * roi_engine.column(num_employees)
+              * (roi_engine.column(improvement_target) / 100) * hourly_rate)
+    savings = annual * adoption / periods_per_year
+    return np.where(p <= roi_engine.column(analysis_years) * periods_per_year, savings, 0.0)
+
+
+def investment_vector(y1_investment_total, y1_recurring, steady_state_recurring, analysis_years,
+                      periods_per_year=12, subscription_start_month=0.0):
+    """Investment outflow per period (negative).
+
+    The one-off costs (year 1 total less the year 1 subscription) fall in the
+    first period. Subscription is billed pro rata from
+    ``subscription_start_month``: its first twelve months at the year 1 rate
+    (the uplift, for an upgrade), then at ``steady_state_recurring``.
+    """
+    p = period_index(analysis_years, periods_per_year)
+    start, end = (p - 1) / periods_per_year, p / periods_per_year
+    sub_start = roi_engine.column(subscription_start_month) / 12
+    subscription = (roi_engine.column(y1_recurring) * _overlap(start, end, sub_start, sub_start + 1)
+                    + roi_engine.column(steady_state_recurring) * _overlap(start, end, sub_start + 1, np.inf))
+    one_off = np.where(p == 1, roi_engine.column(y1_investment_total) - roi_engine.column(y1_recurring), 0.0)
+    return np.where(p <= roi_engine.column(analysis_years) * periods_per_year, -(one_off + subscription), 0.0)
+
+
+def discount_vector(wacc, analysis_years, periods_per_year=12):
+    """Discount factor ``1 / (1 + wacc)^(p / periods_per_year)`` for each period."""
+    p = period_index(analysis_years, periods_per_year)
+    return np.exp(-np.log1p(roi_engine.column(wacc) / 100) * (p / periods_per_year))
+
+
+def breakeven_years(savings, investments, waste_pct, periods_per_year=12):
+    """Fractional years until cumulative cash flow turns non-negative.
+
+    Interpolates as ``roi_engine.breakeven_years`` does, so one period per
+    year gives the annual engine's breakeven: in the first period the one-off
+    and subscription costs are paid back at its savings rate, in later periods
+    the shortfall is recovered as the period's net cash flow accrues evenly.
+    Returns ``0.0`` where there is no waste or no breakeven within the horizon.
+    """
+    net = savings + investments
+    cum = np.cumsum(net, axis=-1)
+    found = cum >= 0
+    hit = found.any(axis=-1)
+    idx = np.argmax(found, axis=-1)[..., np.newaxis]
+    prev_cum = np.take_along_axis(cum, np.maximum(idx - 1, 0), axis=-1)[..., 0]
+    net_now = np.take_along_axis(net, idx, axis=-1)[..., 0]
+    first_savings, first_investments = savings[..., 0], investments[..., 0]
+    idx = idx[..., 0]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        in_first = np.where(first_savings > 0, -first_investments / first_savings, 0.0)
+        later = np.where(net_now > 0, -prev_cum / net_now, 0.0)
+    result = np.where(hit, (idx + np.where(idx == 0, in_first, later)) / periods_per_year, 0.0)
+    return np.where(np.asarray(waste_pct) <= 0, 0.0, result)
+
+
+def evaluate(burdened_cost_pp, total_annual_hours_pp, waste_pct, num_employees, improvement_target,
+             escalation_rate, impl_factor, y1_investment_total, y1_recurring, steady_state_recurring,
+             analysis_years, wacc, periods_per_year=12, ramp="Immediate", ramp_months=0.0, ramp_steps=3,
+             subscription_start_month=0.0):
+    """Per-period savings, investments, cumulative cash flow, NPV and breakeven."""
+    adoption = adoption_vector(impl_factor, analysis_years, periods_per_year, ramp, ramp_months, ramp_steps)
+    savings = savings_vector(burdened_cost_pp, total_annual_hours_pp, waste_pct, num_employees,
+                             improvement_target, escalation_rate, adoption, analysis_years, periods_per_year)
+    investments = investment_vector(y1_investment_total, y1_recurring, steady_state_recurring,
+                                    analysis_years, periods_per_year, subscription_start_month)
+    savings, investments = np.broadcast_arrays(savings, investments)
+    net = savings + investments
+    return PeriodFlows(
+        savings=savings,
+        investments=investments,
+        net=net,
+        cumulative=np.cumsum(net, axis=-1),
+        npv=np.sum(net * discount_vector(wacc, analysis_years, periods_per_year), axis=-1),
+        breakeven=breakeven_years(savings, investments, waste_pct, periods_per_year),
+        periods_per_year=periods_per_year,
+    )
+
+
+def roll_up(flows):
+    """Annual ``roi_engine.CashFlows`` from period flows, keeping the period NPV and breakeven."""
+    def yearly(values):
+        return values.reshape(values.shape[:-1] + (-1, flows.periods_per_year)).sum(axis=-1)
+
+    savings, investments = yearly(flows.savings), yearly(flows.investments)
+    net = savings + investments
+    return roi_engine.CashFlows(savings=savings, investments=investments, net=net,
+                                cumulative=np.cumsum(net, axis=-1), npv=flows.npv, breakeven=flows.breakeven)
+
+
+def risk_adjusted_npv(waste_pct, wacc, scenarios=roi_engine.RISK_SCENARIOS, **model):
+    """Weighted NPV across the downside / expected / upside efficiency scenarios."""
+    total = 0.0
+    # One scenario at a time keeps a single set of period arrays alive
+    for multiplier, weight in scenarios:
+        total = total + weight * evaluate(waste_pct=np.asarray(waste_pct) * multiplier, wacc=wacc, **model).npv
+    return total
+
+
+def batch_metrics(chunk_size=20_000, periods_per_year=12, ramp="Immediate", **model):
+    """NPV, breakeven and annual net cash flow for many scenarios, in chunks.
+
+    ``model`` takes the array inputs of ``evaluate``. Scenarios are flattened
+    and evaluated ``chunk_size`` at a time, so only the annual roll-up of each
+    chunk is kept rather than the full period arrays.
+    """
+    shape = np.broadcast_shapes(*(np.shape(v) for v in model.values()))
+    # Scalar inputs stay scalar; only per-scenario inputs are flattened and sliced
+    flat = {name: np.broadcast_to(value, shape).reshape(-1) for name, value in model.items() if np.ndim(value)}
+    fixed = {name: value for name, value in model.items() if not np.ndim(value)}
+    count = int(np.prod(shape))
+    npv, breakeven = np.empty(count), np.empty(count)
+    annual_net = np.empty((count, int(np.max(model["analysis_years"]))))
+    for lo in range(0, count, chunk_size):
+        chunk = {name: values[lo:lo + chunk_size] for name, values in flat.items()}
+        flows = evaluate(periods_per_year=periods_per_year, ramp=ramp, **fixed, **chunk)
+        rolled = roll_up(flows)
+        npv[lo:lo + chunk_size] = rolled.npv
+        breakeven[lo:lo + chunk_size] = rolled.breakeven
+        # A chunk whose horizons are all shorter than the batch's has fewer years
+        annual_net[lo:lo + chunk_size] = 0.0
+        annual_net[lo:lo + chunk_size, :rolled.net.shape[-1]] = rolled.net
+    return {
+        "npv": npv.reshape(shape),
+        "breakeven": breakeven.reshape(shape),
+        "annual_net": annual_net.reshape(shape + annual_net.shape[-1:]),
+    }
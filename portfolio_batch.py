@@ -0,0 +1,126 @@
+"""Headless batch scoring of a deal pipeline.
+
+Reads one row per deal from a CSV or Parquet file, using the input names in
+``roi_engine.DEFAULT_INPUTS`` as column names (missing columns take the tab
+defaults), and writes the input columns plus the headline report metrics to a
+Parquet file. Deals that cannot be scored get NaN metrics and the reason in an
+``error`` column.
+
+The input is streamed in chunks and each chunk is scored in a worker process.
+Only a bounded number of chunks is in flight at once and results are written
+in input order as they complete, so memory stays flat however large the file is.
+
+    python portfolio_batch.py pipeline.csv scored.parquet --workers 8
+"""
+import argparse
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+import roi_engine
+
+REQUIRED_COLUMNS = ("num_employees", "annual_salary", "waste_pct")
+RESULT_COLUMNS = ("risk_adj_npv", "expected_npv", "total_tco", "breakeven_years", "fte_reclaimed")
+
+# Pinned so every chunk writes the same Parquet schema, e.g. when a blank cell
+# would otherwise turn one chunk's integer column into floats.
+INPUT_DTYPES = {name: str if isinstance(default, str) else np.float64
+                for name, default in roi_engine.DEFAULT_INPUTS.items()}
+
+# Allowed values of the text inputs; a row with any other value is not scored.
+CHOICES = {"impl_unit": tuple(roi_engine.MAX_DURATION), "impl_intensity": tuple(roi_engine.INTENSITY_HOURS)}
+
+
+def read_chunks(path, chunk_rows):
+    """Yield DataFrames of at most ``chunk_rows`` rows from a CSV or Parquet file."""
+    if path.endswith(".parquet"):
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows):
+            frame = batch.to_pandas()
+            yield frame.astype({name: dtype for name, dtype in INPUT_DTYPES.items() if name in frame.columns})
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_rows, dtype=INPUT_DTYPES)
+
+
+def score_chunk(chunk):
+    """Append the headline report metrics and an ``error`` column to a chunk of deals.
+
+    Rows with an unknown ``impl_unit`` or ``impl_intensity`` get NaN metrics
+    and the first reason in ``error``; the rest of the chunk is scored as usual.
+    """
+    missing = [col for col in REQUIRED_COLUMNS if col not in chunk.columns]
+    if missing:
+        raise ValueError(f"Input is missing required columns: {', '.join(missing)}")
+    errors = pd.Series(pd.NA, index=chunk.index, dtype="string")
+    inputs = {}
+    for name, default in roi_engine.DEFAULT_INPUTS.items():
+        if name not in chunk.columns:
+            inputs[name] = np.full(len(chunk), default)
+            continue
+        values = chunk[name].fillna(default)
+        if name in CHOICES:
+            bad = ~values.isin(CHOICES[name])
+            errors = errors.fillna((f"unknown {name}: " + values.astype(str)).where(bad))
+            values = values.where(~bad, default)
+        inputs[name] = values.to_numpy()
+    metrics = roi_engine.deal_metrics(**inputs)
+    failed = errors.notna().to_numpy()
+    scored = chunk.copy()
+    for name in RESULT_COLUMNS:
+        scored[name] = np.where(failed, np.nan, np.broadcast_to(metrics[name], len(chunk)))
+    scored["error"] = errors
+    return scored
+
+
+def run_batch(input_path, output_path, workers=None, chunk_rows=50_000):
+    """Score ``input_path`` into ``output_path``; returns the number of deals written."""
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = workers * 2
+    pending = deque()
+    writer = None
+    written = 0
+
+    def write(scored):
+        nonlocal writer, written
+        table = pa.Table.from_pandas(scored, preserve_index=False)
+        if writer is None:
+            writer = pq.ParquetWriter(output_path, table.schema)
+        writer.write_table(table)
+        written += len(scored)
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for chunk in read_chunks(input_path, chunk_rows):
+                if len(pending) >= max_in_flight:
+                    write(pending.popleft().result())
+                pending.append(pool.submit(score_chunk, chunk))
+            while pending:
+                write(pending.popleft().result())
+    except BaseException:
+        # Don't leave a truncated file that looks like a finished run
+        if writer is not None:
+            writer.close()
+            os.remove(output_path)
+        raise
+    if writer is not None:
+        writer.close()
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a pipeline of deals with the strategic ROI model.")
+    parser.add_argument("input", help="CSV or Parquet file with one row per deal")
+    parser.add_argument("output", help="Parquet file to write")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--chunk-rows", type=int, default=50_000, help="Deals per chunk")
+    args = parser.parse_args(argv)
+    written = run_batch(args.input, args.output, workers=args.workers, chunk_rows=args.chunk_rows)
+    print(f"Scored {written:,} deals -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,459 @@
+"""Board-report export: a self-contained HTML report with static charts, for one deal or a portfolio.
+
+Each deal section holds the board-level overview shown on the report tab, the
+headline metrics, the cash-flow table and three static SVG charts: cumulative
+cash flow, the NPV sensitivity matrix and the NPV tornado. Charts are cached
+on disk under ``<ROI_EXPORT_CACHE>/<chart>-<hash>.svg``, keyed by
+``result_cache.canonical_key`` over what they plot. Re-exporting an unchanged
+deal, or any deal of a batch that shares its inputs, reuses the file instead
+of re-rendering it. Each new file prunes the directory to the
+``CHART_MAX_FILES`` most recently used charts, dropping any unused for
+``CHART_MAX_AGE_SECONDS``. Set ``ROI_EXPORT_CACHE`` to an empty string to
+disable the cache.
+
+``ReportExporter`` renders off the caller's thread: a coordinating thread
+hands deal sections to a worker pool and assembles the document, so the app
+only polls a future. The app's ``EXPORTER`` uses worker threads, because
+Streamlit runs the script as ``__main__`` and spawned processes would re-run
+it; the command line uses worker processes. The report prints to PDF from any
+browser, with every deal on a new page.
+
+    python report_export.py pipeline.csv --output board_report.html --workers 8
+
+Pipeline files use the input names in ``roi_engine.DEFAULT_INPUTS`` as column
+names, plus optional ``name``, ``industry`` and ``solution_name`` columns.
+"""
+import argparse
+import html
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+import benchmark_data
+import result_cache
+import roi_engine
+import sensitivity
+
+CHART_DIR = os.environ.get("ROI_EXPORT_CACHE", os.path.join("exports", "charts"))
+
+# Cached charts kept on disk: the most recently used, up to a week since last use.
+CHART_MAX_FILES = 2_000
+CHART_MAX_AGE_SECONDS = 7 * 24 * 3600.0
+
+# The sensitivity matrix of the report tab at its default settings.
+HEATMAP_AXES = ("efficiency", "wacc")
+HEATMAP_STEPS = 5
+
+DEFAULT_IMPACT = "greater throughput from the same headcount."
+
+
+# --- Board-level overview (also rendered on the report tab) ---
+def board_overview_html(total_tco, analysis_years, solution_name, annual_hrs, fte_reclaimed, industry_impact, risk_adj_npv):
+    """The Strategic Analysis block of the report tab as an HTML string."""
+    solution_name, industry_impact = html.escape(solution_name, quote=False), html.escape(industry_impact, quote=False)
+    npv_status = "POSITIVE" if risk_adj_npv > 0 else "NEGATIVE"
+    recommendation = "STRATEGICALLY VIABLE" if risk_adj_npv > 0 else "REQUIRES OPTIMIZATION"
+
+    if risk_adj_npv < 0:
+        viability_text = f"This {npv_status} Risk-Adjusted Net Present Value indicates that the current scope of automation must be either expanded to recover more latent waste or costs must be aligned with yield."
+    else:
+        viability_text = f"This {npv_status} Risk-Adjusted Net Present Value signifies that the productivity dividends, when discounted and risk-weighted, outperform the total investment cost."
+
+    financial_viability = f'<div style="background-color:rgba(128,128,128,0.05); border-left:4px solid #1f77b4; padding:20px; border-radius:8px; margin-bottom:20px;"><div style="color:{"#2E7D32" if risk_adj_npv > 0 else "#D32F2F"}; margin-bottom:10px;"><b>{"✅" if risk_adj_npv > 0 else "⚠️"} Financial Viability: {npv_status} RISK-ADJUSTED NPV</b><br>The investment yields a <b>Risk-Adjusted NPV of ${risk_adj_npv:,.0f}</b>, confirming that the project is <b>{recommendation}</b>.</div> {viability_text} This pro-active weighting ensures that our business case remains defensible even under conservative implementation outcomes.</div>'
+
+    return (
+        f'<div style="border:1px solid rgba(128,128,128,0.3); padding:30px; border-radius:10px; font-family:\'Segoe UI\',sans-serif; line-height:1.8;">'
+        f'<div style="margin-bottom:20px;"><b style="text-transform:uppercase;">Strategic Project Overview</b><br>'
+        f'This initiative targets a TCO of <b>${total_tco:,.0f}</b> over a <b>{analysis_years}-year horizon</b>. Beyond a simple software deployment, this represents a transition to a <b>Cognitive solution</b> powered by <b>Blue Yonder\'s {solution_name}</b>. By embedding AI and ML into daily workflows, the organization shifts from reactive manual planning to <b>_autonomous "exception-only" management_</b>.</div>'
+        f'<div style="margin-bottom:20px;"><b style="text-transform:uppercase;">Capacity Realization (Shadow Capacity)</b><br>'
+        f'The implementation reclaims <b>{annual_hrs:,.0f} productive hours annually</b>: the financial and operational equivalent of adding <b>{fte_reclaimed} staff members</b>. This "Shadow Capacity" acts as a <b>Volume Multiplier</b>, directly enabling {industry_impact}</div>'
+        f'<hr style="border:0; border-top:1px solid rgba(128,128,128,0.3); margin:25px 0;">{financial_viability}</div>'
+    )
+
+
+def industry_impact(industry):
+    """The benchmark dataset's impact text for ``industry``, or a generic one."""
+    try:
+        return benchmark_data.DATASET.vertical_info(industry)["impact"] or DEFAULT_IMPACT
+    except ValueError:
+        return DEFAULT_IMPACT
+
+
+# --- Static SVG charts ---
+def _money(value):
+    sign = "-" if value < 0 else ""
+    value = abs(value)
+    if value >= 1_000_000:
+        return f"{sign}${value / 1_000_000:.1f}M"
+    if value >= 1_000:
+        return f"{sign}${value / 1_000:.0f}k"
+    return f"{sign}${value:.0f}"
+
+
+def _ticks(lo, hi, count=5):
+    """Round tick values spanning [lo, hi]."""
+    if hi <= lo:
+        hi = lo + 1.0
+    raw = (hi - lo) / count
+    magnitude = 10 ** np.floor(np.log10(raw))
+    step = next(m * magnitude for m in (1, 2, 2.5, 5, 10) if m * magnitude >= raw)
+    return np.arange(np.floor(lo / step) * step, hi + step / 2, step)
+
+
+def _svg(width, height, body):
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}" '
+            f'font-family="Segoe UI, sans-serif" font-size="11">{"".join(body)}</svg>')
+
+
+def _text(x, y, text, anchor="middle", **attrs):
+    extra = "".join(f' {name.replace("_", "-")}="{value}"' for name, value in attrs.items())
+    return f'<text x="{x:.1f}" y="{y:.1f}" text-anchor="{anchor}"{extra}>{html.escape(str(text))}</text>'
+
+
+def cash_flow_svg(net, cumulative, width=640, height=300):
+    """Annual net cash flow bars with the cumulative cash flow line."""
+    left, right, top, bottom = 70, 20, 20, 40
+    ticks = _ticks(min(0.0, np.min(net), np.min(cumulative)), max(0.0, np.max(net), np.max(cumulative)))
+    lo, hi = ticks[0], ticks[-1]
+    plot_w, plot_h = width - left - right, height - top - bottom
+
+    def y(value):
+        return top + (hi - value) / (hi - lo) * plot_h
+
+    slot = plot_w / len(net)
+    body = []
+    for tick in ticks:
+        body += [f'<line x1="{left}" x2="{width - right}" y1="{y(tick):.1f}" y2="{y(tick):.1f}" stroke="#e5e5e5"/>',
+                 _text(left - 6, y(tick) + 4, _money(tick), anchor="end")]
+    for i, value in enumerate(net):
+        x = left + i * slot + slot * 0.2
+        body += [f'<rect x="{x:.1f}" y="{min(y(value), y(0)):.1f}" width="{slot * 0.6:.1f}" height="{abs(y(value) - y(0)):.1f}" '
+                 f'fill="{"#2ca02c" if value >= 0 else "#d62728"}" opacity="0.6"/>',
+                 _text(left + (i + 0.5) * slot, height - bottom + 16, f"Year {i + 1}")]
+    points = " ".join(f"{left + (i + 0.5) * slot:.1f},{y(value):.1f}" for i, value in enumerate(cumulative))
+    body += [f'<line x1="{left}" x2="{width - right}" y1="{y(0):.1f}" y2="{y(0):.1f}" stroke="gray" stroke-dasharray="4 3"/>',
+             f'<polyline points="{points}" fill="none" stroke="#1f77b4" stroke-width="3"/>',
+             *[f'<circle cx="{left + (i + 0.5) * slot:.1f}" cy="{y(value):.1f}" r="4" fill="#1f77b4"/>' for i, value in enumerate(cumulative)],
+             _text(left, height - 6, "Bars: annual net cash flow · Line: cumulative cash flow", anchor="start", fill="#666")]
+    return _svg(width, height, body)
+
+
+def _rdylgn(share):
+    # Red -> yellow -> green, as the app's RdYlGn colour scale
+    stops = np.array([[215, 48, 39], [255, 255, 191], [26, 152, 80]], dtype=float)
+    share = float(np.clip(share, 0.0, 1.0)) * 2
+    lower = min(int(share), 1)
+    rgb = stops[lower] + (stops[lower + 1] - stops[lower]) * (share - lower)
+    return "#" + "".join(f"{int(round(c)):02x}" for c in rgb)
+
+
+def heatmap_svg(matrix, y_labels, x_labels, y_title, x_title, highlight=None, width=640, height=300):
+    """NPV matrix with each cell labelled; ``highlight`` is the (row, column) of the current inputs."""
+    left, top, bottom = 130, 20, 45
+    rows, cols = matrix.shape
+    cell_w, cell_h = (width - left - 10) / cols, (height - top - bottom) / rows
+    lo, hi = float(np.min(matrix)), float(np.max(matrix))
+    body = []
+    for r in range(rows):
+        body.append(_text(left - 6, top + (r + 0.5) * cell_h + 4, y_labels[r], anchor="end"))
+        for c in range(cols):
+            value = matrix[r, c]
+            x, y = left + c * cell_w, top + r * cell_h
+            body.append(f'<rect x="{x:.1f}" y="{y:.1f}" width="{cell_w:.1f}" height="{cell_h:.1f}" '
+                        f'fill="{_rdylgn((value - lo) / (hi - lo) if hi > lo else 0.5)}" stroke="white"/>')
+            weight = "bold" if highlight == (r, c) else "normal"
+            body.append(_text(x + cell_w / 2, y + cell_h / 2 + 4, _money(value), font_weight=weight))
+    body += [_text(left + (c + 0.5) * cell_w, height - bottom + 16, x_labels[c]) for c in range(cols)]
+    body += [_text(left + (width - left) / 2, height - 8, x_title, fill="#666"),
+             _text(12, top + (height - top - bottom) / 2, y_title, fill="#666",
+                   transform=f"rotate(-90 12 {top + (height - top - bottom) / 2:.1f})")]
+    return _svg(width, height, body)
+
+
+def tornado_svg(base_npv, bars, width=640, height=300):
+    """One-at-a-time NPV swings around ``base_npv``, widest first."""
+    left, right, top, bottom = 170, 20, 20, 35
+    ticks = _ticks(min(base_npv, *(min(low, high) for _, low, high in bars)),
+                   max(base_npv, *(max(low, high) for _, low, high in bars)))
+    lo, hi = ticks[0], ticks[-1]
+    plot_w = width - left - right
+    bar_h = (height - top - bottom) / len(bars)
+
+    def x(value):
+        return left + (value - lo) / (hi - lo) * plot_w
+
+    body = [_text(x(tick), height - bottom + 16, _money(tick)) for tick in ticks]
+    for i, (name, low, high) in enumerate(bars):
+        y = top + i * bar_h
+        body.append(_text(left - 6, y + bar_h / 2 + 4, sensitivity.AXES[name], anchor="end"))
+        for value, color in ((low, "#d62728"), (high, "#2ca02c")):
+            body.append(f'<rect x="{min(x(value), x(base_npv)):.1f}" y="{y + bar_h * 0.15:.1f}" width="{abs(x(value) - x(base_npv)):.1f}" '
+                        f'height="{bar_h * 0.7:.1f}" fill="{color}" opacity="0.75"/>')
+    body += [f'<line x1="{x(base_npv):.1f}" x2="{x(base_npv):.1f}" y1="{top}" y2="{height - bottom}" stroke="gray" stroke-dasharray="4 3"/>',
+             _text(left, height - 4, "Red: low input · Green: high input", anchor="start", fill="#666")]
+    return _svg(width, height, body)
+
+
+class ChartCache:
+    """SVG files keyed by a canonical hash of what they plot, shared by every process using ``directory``.
+
+    A reused file has its modification time refreshed, so pruning keeps the
+    most recently used charts.
+    """
+
+    def __init__(self, directory=CHART_DIR, max_files=CHART_MAX_FILES, max_age_seconds=CHART_MAX_AGE_SECONDS):
+        self.directory = directory
+        self.max_files = max_files
+        self.max_age_seconds = max_age_seconds
+        self.rendered = 0
+        self.reused = 0
+        self.pruned = 0
+
+    def get_or_render(self, name, inputs, render):
+        if not self.directory:
+            self.rendered += 1
+            return render()
+        path = os.path.join(self.directory, f"{name}-{result_cache.canonical_key(name, inputs)}.svg")
+        try:
+            with open(path) as f:
+                svg = f.read()
+            os.utime(path)
+            self.reused += 1
+            return svg
+        except FileNotFoundError:
+            pass
+        svg = render()
+        os.makedirs(self.directory, exist_ok=True)
+        # Write then rename, so concurrent workers never read a partial file
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w") as f:
+            f.write(svg)
+        os.replace(tmp, path)
+        self.rendered += 1
+        self.prune()
+        return svg
+
+    def prune(self):
+        """Delete charts unused for ``max_age_seconds`` and the least recently used beyond ``max_files``."""
+        charts = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".svg"):
+                try:
+                    charts.append((entry.stat().st_mtime, entry.path))
+                except FileNotFoundError:  # pruned by another process
+                    pass
+        charts.sort(reverse=True)
+        cutoff = time.time() - self.max_age_seconds
+        for rank, (mtime, path) in enumerate(charts):
+            if rank >= self.max_files or mtime < cutoff:
+                try:
+                    os.remove(path)
+                    self.pruned += 1
+                except FileNotFoundError:
+                    pass
+
+
+# --- Report sections ---
+def _table(header, rows):
+    head = "".join(f"<th>{html.escape(str(h))}</th>" for h in header)
+    body = "".join("<tr>" + "".join(f"<td>{html.escape(str(v))}</td>" for v in row) + "</tr>" for row in rows)
+    return f"<table><thead><tr>{head}</tr></thead><tbody>{body}</tbody></table>"
+
+
+def _heatmap_label(name, value, inputs):
+    if name == "efficiency":
+        return f"{round(value * 100)}%"
+    if name in ("wacc", "escalation_rate"):
+        return f"{round(value, 2):g}%"
+    if name == "impl_duration":
+        return f"{value:.1f} {inputs['impl_unit']}"
+    if name == "num_employees":
+        return f"{value:,.0f}"
+    return _money(value)
+
+
+def deal_section(inputs, title="Deal", solution_name="", industry="", flows=None, risk_adj_npv=None, chart_dir=CHART_DIR):
+    """One deal's report section as ``{"title", "html", "metrics", "charts_rendered", "charts_reused"}``.
+
+    ``inputs`` are raw tab inputs (see ``roi_engine.DEFAULT_INPUTS``). Pass
+    ``flows`` (``roi_engine.CashFlows``) and ``risk_adj_npv`` to report figures
+    already computed elsewhere, such as the monthly engine's roll-up.
+    """
+    inputs = {**roi_engine.DEFAULT_INPUTS, **inputs}
+    metrics = {name: float(value) for name, value in roi_engine.deal_metrics(**inputs).items()}
+    computed, derived = roi_engine.evaluate_inputs(**inputs)
+    flows = computed if flows is None else flows
+    if risk_adj_npv is not None:
+        metrics["risk_adj_npv"] = float(risk_adj_npv)
+    metrics["expected_npv"], metrics["breakeven_years"] = float(flows.npv), float(flows.breakeven)
+    annual_hrs = float(derived["total_annual_hours_pp"] * derived["waste_pct"]
+                       * (derived["improvement_target"] / 100) * derived["num_employees"])
+    analysis_years = int(inputs["analysis_years"])
+    charts = ChartCache(chart_dir)
+
+    net, cumulative = np.asarray(flows.net)[:analysis_years], np.asarray(flows.cumulative)[:analysis_years]
+    cash_flow_chart = charts.get_or_render(
+        "cash_flow", {"net": net, "cumulative": cumulative}, lambda: cash_flow_svg(net, cumulative))
+
+    def render_heatmap():
+        y_axis, x_axis = HEATMAP_AXES
+        y_values = sensitivity.axis_values(y_axis, inputs, HEATMAP_STEPS)
+        x_values = sensitivity.axis_values(x_axis, inputs, HEATMAP_STEPS)
+        matrix = sensitivity.npv_grid(inputs, y_axis, y_values, x_axis, x_values)
+        base_y = 1.0 if y_axis == "efficiency" else inputs[y_axis]
+        base_x = 1.0 if x_axis == "efficiency" else inputs[x_axis]
+        highlight = (int(np.argmin(np.abs(y_values - base_y))), int(np.argmin(np.abs(x_values - base_x))))
+        return heatmap_svg(matrix, [_heatmap_label(y_axis, v, inputs) for v in y_values],
+                           [_heatmap_label(x_axis, v, inputs) for v in x_values],
+                           sensitivity.AXES[y_axis], sensitivity.AXES[x_axis], highlight)
+
+    heatmap_chart = charts.get_or_render("sensitivity", dict(inputs, axes=HEATMAP_AXES, steps=HEATMAP_STEPS), render_heatmap)
+    tornado_chart = charts.get_or_render("tornado", inputs, lambda: tornado_svg(*sensitivity.tornado(inputs)))
+
+    overview = board_overview_html(metrics["total_tco"], analysis_years, solution_name, annual_hrs,
+                                   metrics["fte_reclaimed"], industry_impact(industry), metrics["risk_adj_npv"])
+    # The report tab renders the overview as Markdown; plain HTML needs the italics spelled out
+    overview = overview.replace("<b>_", "<b><i>").replace("_</b>", "</i></b>")
+    breakeven = metrics["breakeven_years"]
+    headline = _table(["TOTAL TCO", "Risk-Adjusted NPV", "Expected NPV", "Break Even", "FTE Equivalence", "Hours Reclaimed (Annual)"], [[
+        f"${metrics['total_tco']:,.0f}", f"${metrics['risk_adj_npv']:,.0f}", f"${metrics['expected_npv']:,.0f}",
+        f"{breakeven:.1f} Yrs" if breakeven > 0 else "Beyond Horizon", f"{metrics['fte_reclaimed']} FTE", f"{annual_hrs:,.0f}",
+    ]])
+    cash_flows = _table(["Period", "Investment", "Gross Savings", "Net Cash Flow", "Cumulative Cash Flow"], [
+        [f"Year {yr + 1}", f"${flows.investments[yr]:,.0f}", f"${flows.savings[yr]:,.0f}", f"${net[yr]:,.0f}", f"${cumulative[yr]:,.0f}"]
+        for yr in range(analysis_years)
+    ])
+    section = (
+        f'<section class="deal"><h2>{html.escape(title)}</h2>{headline}{overview}'
+        f'<h3>Cumulative ROI</h3>{cash_flow_chart}{cash_flows}'
+        f'<h3>Sensitivity Analysis: NPV Variance</h3>{heatmap_chart}'
+        f'<h3>NPV Tornado (One-at-a-Time Sensitivity)</h3>{tornado_chart}</section>'
+    )
+    return {"title": title, "html": section, "metrics": metrics,
+            "charts_rendered": charts.rendered, "charts_reused": charts.reused}
+
+
+def _render_deal(deal):
+    # Worker-process entry point; module-level so it pickles
+    return deal_section(**deal)
+
+
+STYLE = """
+body { font-family: 'Segoe UI', sans-serif; color: #222; max-width: 960px; margin: 24px auto; padding: 0 16px; }
+table { border-collapse: collapse; width: 100%; margin: 12px 0; font-size: 13px; }
+th, td { border-bottom: 1px solid #ddd; padding: 6px 8px; text-align: right; }
+th:first-child, td:first-child { text-align: left; }
+section.deal { margin-top: 32px; }
+@media print { section.deal { page-break-before: always; } }
+"""
+
+
+def document(title, sections):
+    """Assemble rendered sections into one HTML document; a portfolio gets a ranked summary first."""
+    summary = ""
+    if len(sections) > 1:
+        ranked = sorted(sections, key=lambda s: s["metrics"]["risk_adj_npv"], reverse=True)
+        summary = "<h2>Portfolio Summary</h2>" + _table(
+            ["Rank", "Deal", "Risk-Adjusted NPV", "TOTAL TCO", "Break Even", "FTE Equivalence"],
+            [[rank, s["title"], f"${s['metrics']['risk_adj_npv']:,.0f}", f"${s['metrics']['total_tco']:,.0f}",
+              f"{s['metrics']['breakeven_years']:.1f} Yrs" if s["metrics"]["breakeven_years"] > 0 else "Beyond Horizon",
+              f"{s['metrics']['fte_reclaimed']} FTE"] for rank, s in enumerate(ranked, 1)])
+    generated = time.strftime("%Y-%m-%d %H:%M")
+    return (f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>{html.escape(title)}</title><style>{STYLE}</style></head>'
+            f'<body><h1>{html.escape(title)}</h1><p>Generated {generated}</p>{summary}'
+            f'{"".join(s["html"] for s in sections)}</body></html>')
+
+
+def deals_from_frame(frame):
+    """Deal dicts for ``deal_section`` from a pipeline DataFrame."""
+    columns = [name for name in roi_engine.DEFAULT_INPUTS if name in frame.columns]
+    deals = []
+    for i, row in enumerate(frame.to_dict("records")):
+        inputs = {name: row[name] for name in columns if row[name] == row[name]}  # skip NaN
+        deals.append({
+            "inputs": {k: v.item() if isinstance(v, np.generic) else v for k, v in inputs.items()},
+            "title": str(row.get("name") or f"Deal {i + 1}"),
+            "solution_name": str(row.get("solution_name") or ""),
+            "industry": str(row.get("industry") or ""),
+        })
+    return deals
+
+
+class ReportExporter:
+    """Background report rendering: a coordinating thread feeding a lazily started worker pool."""
+
+    def __init__(self, workers=None, processes=False):
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self.processes = processes
+        self._pool = None
+        self._lock = threading.Lock()
+        self._coordinator = ThreadPoolExecutor(max_workers=2, thread_name_prefix="report-export")
+
+    def _workers(self):
+        with self._lock:
+            if self._pool is None:
+                if self.processes:
+                    # Spawned rather than forked, as the caller may be multi-threaded
+                    self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+                else:
+                    self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="report-render")
+            return self._pool
+
+    def export(self, deals, title="Board Report"):
+        """Render ``deals`` (keyword arguments of ``deal_section``) into one report; blocks until done.
+
+        Returns the report ``html`` with ``deals``, ``charts_rendered``, ``charts_reused`` and ``seconds``.
+        """
+        start = time.perf_counter()
+        chunksize = max(1, len(deals) // (self.workers * 4))
+        sections = list(self._workers().map(_render_deal, deals, chunksize=chunksize))
+        return dict(
+            html=document(title, sections),
+            deals=len(sections),
+            charts_rendered=sum(s["charts_rendered"] for s in sections),
+            charts_reused=sum(s["charts_reused"] for s in sections),
+            seconds=time.perf_counter() - start,
+        )
+
+    def submit(self, deals, title="Board Report"):
+        """``export`` in the background; returns a ``concurrent.futures.Future``."""
+        return self._coordinator.submit(self.export, deals, title)
+
+    def shutdown(self):
+        self._coordinator.shutdown()
+        if self._pool is not None:
+            self._pool.shutdown()
+
+
+# Shared by every session of the Streamlit app.
+EXPORTER = ReportExporter()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export a board report for a pipeline of deals.")
+    parser.add_argument("input", help="CSV or Parquet file with one row per deal")
+    parser.add_argument("--output", default="board_report.html", help="HTML file to write")
+    parser.add_argument("--title", default="Board Report")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: up to 4)")
+    args = parser.parse_args(argv)
+
+    import pandas as pd
+
+    frame = pd.read_parquet(args.input) if args.input.endswith(".parquet") else pd.read_csv(args.input)
+    exporter = ReportExporter(args.workers, processes=True)
+    try:
+        result = exporter.export(deals_from_frame(frame), args.title)
+    finally:
+        exporter.shutdown()
+    with open(args.output, "w", encoding="utf-8") as f:
+        f.write(result["html"])
+    print(f"Exported {result['deals']:,} deals -> {args.output} in {result['seconds']:.1f}s "
+          f"({result['charts_rendered']:,} charts rendered, {result['charts_reused']:,} reused)")
+
+
+if __name__ == "__main__":
+    main()
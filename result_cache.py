@@ -0,0 +1,101 @@
+"""Process-wide result cache keyed on a canonical hash of the model inputs.
+
+Streamlit serves every browser session from threads of one process, so a
+module-level cache is shared by all sessions: two account executives working
+from the same benchmark preset compute each result once. Entries are evicted
+least-recently-used beyond ``max_entries`` and after ``ttl_seconds``.
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+
+def _canonical(value):
+    # Numbers hash by value regardless of type, so 100000, 100000.0 and
+    # np.float64(100000) share an entry.
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in sorted(value.items())}
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, (bool, int, float, np.number, np.bool_)):
+        return repr(float(value))
+    return str(value)
+
+
+def canonical_key(namespace, inputs):
+    """SHA-256 hex digest of ``namespace`` and an inputs dict, independent of key order."""
+    payload = json.dumps([namespace, _canonical(inputs)], separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResultCache:
+    """Thread-safe LRU cache with per-entry time-to-live and hit/miss counters."""
+
+    def __init__(self, max_entries=512, ttl_seconds=3600.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_compute(self, namespace, inputs, compute):
+        """Return the cached result for ``inputs`` or store and return ``compute()``.
+
+        Results are shared between callers and must be treated as read-only.
+        """
+        key = canonical_key(namespace, inputs)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] <= self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        result = compute()
+        # Stamp on completion, so a slow computation gets its full TTL
+        now = time.monotonic()
+        with self._lock:
+            self._entries[key] = (now, result)
+            self._entries.move_to_end(key)
+            self._evict(now)
+        return result
+
+    def _evict(self, now):
+        for key in [k for k, (stored, _) in self._entries.items() if now - stored > self.ttl_seconds]:
+            del self._entries[key]
+            self.evictions += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def values(self):
+        """Snapshot of the cached results, e.g. for measuring their memory."""
+        with self._lock:
+            return [value for _, value in self._entries.values()]
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+# Shared by every session of the Streamlit app.
+RESULTS = ResultCache()
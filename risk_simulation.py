@@ -0,0 +1,91 @@
+"""Monte Carlo risk simulation for the strategic ROI model.
+
+Draws the uncertain levers from triangular (low, mode, high) distributions and
+pushes every draw through ``roi_engine.evaluate`` in chunks, so 10^5-10^6 draws
+stay within a few arrays' worth of memory. Draws are reproducible for a given
+seed and chunk size.
+"""
+from typing import NamedTuple
+
+import numpy as np
+
+import roi_engine
+
+PERCENTILES = (10, 50, 90)
+
+
+class SimulationResult(NamedTuple):
+    npv: np.ndarray
+    breakeven: np.ndarray
+    breaks_even: np.ndarray
+    percentiles: dict
+    prob_breakeven: float
+
+
+def default_ranges(waste_pct, wacc, escalation_rate, impl_duration, max_dur, waste_band=(0.8, 1.2)):
+    """Triangular (low, mode, high) ranges centred on the current tab inputs.
+
+    Efficiency spans the same 80-120% band as the Risk-Adjusted NPV scenarios;
+    implementation is skewed towards overruns and capped at ``max_dur``.
+    ``waste_band`` scales the waste input to its low and high, e.g. an
+    industry benchmark's P10/P50 and P90/P50 ratios.
+    """
+    low, high = waste_band
+    return {
+        "waste_pct": (waste_pct * low, waste_pct, waste_pct * high),
+        "efficiency": (0.8, 1.0, 1.2),
+        "escalation_rate": (max(escalation_rate - 2, 0), escalation_rate, escalation_rate + 2),
+        "impl_duration": (impl_duration * 0.75, impl_duration, min(impl_duration * 1.5, max_dur)),
+        "wacc": (max(wacc - 2, 0), wacc, wacc + 3),
+    }
+
+
+def _triangular(rng, low, mode, high, size):
+    if high <= low:
+        return np.full(size, float(mode))
+    return rng.triangular(low, mode, high, size)
+
+
+def simulate(ranges, max_dur, draws=100_000, seed=0, chunk_size=50_000, **model):
+    """Run ``draws`` scenarios and summarise the NPV and breakeven distribution.
+
+    ``ranges`` maps waste_pct, efficiency, escalation_rate, impl_duration and
+    wacc to (low, mode, high) triangles (see ``default_ranges``). ``model``
+    holds the remaining ``roi_engine.evaluate`` inputs; ``impl_factor`` is
+    derived from the drawn duration against ``max_dur``.
+    """
+    rng = np.random.default_rng(seed)
+    model = {k: v for k, v in model.items() if k not in ("waste_pct", "wacc", "escalation_rate", "impl_factor")}
+    npv = np.empty(draws)
+    breakeven = np.empty(draws)
+    breaks_even = np.empty(draws, dtype=bool)
+
+    for start in range(0, draws, chunk_size):
+        size = min(chunk_size, draws - start)
+        sample = {name: _triangular(rng, *ranges[name], size) for name in
+                  ("waste_pct", "efficiency", "escalation_rate", "impl_duration", "wacc")}
+        duration = np.clip(sample["impl_duration"], 0.0, max_dur)
+        flows = roi_engine.evaluate(
+            waste_pct=sample["waste_pct"] * sample["efficiency"],
+            wacc=sample["wacc"],
+            escalation_rate=sample["escalation_rate"],
+            impl_factor=(max_dur - duration) / max_dur,
+            **model,
+        )
+        npv[start:start + size] = flows.npv
+        breakeven[start:start + size] = flows.breakeven
+        breaks_even[start:start + size] = (flows.cumulative >= 0).any(axis=-1)
+
+    return SimulationResult(
+        npv=npv,
+        breakeven=breakeven,
+        breaks_even=breaks_even,
+        percentiles=dict(zip(PERCENTILES, np.percentile(npv, PERCENTILES))),
+        prob_breakeven=float(breaks_even.mean()),
+    )
+
+
+def npv_histogram(npv, bins=60):
+    """Bin the NPV draws so only ``bins`` bars reach the browser."""
+    counts, edges = np.histogram(npv, bins=bins)
+    return (edges[:-1] + edges[1:]) / 2, counts / max(len(npv), 1)
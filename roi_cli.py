@@ -0,0 +1,145 @@
+"""Command-line access to both calculators, without Streamlit or Plotly.
+
+    python -m roi_cli productivity --num-employees 25 --unproductive-pct 15
+    python -m roi_cli strategic --json deal.json --wacc 12
+    python -m roi_cli import-report
+
+Inputs use the names of ``calculator_model.DEFAULT_INPUTS`` and
+``roi_engine.DEFAULT_INPUTS`` (rates in percent, as the sliders show them).
+A ``--json`` file supplies any of them; flags override the file.
+``import-report`` times the import of each module in a fresh interpreter so
+cold-start regressions are visible, and the first run of each app script
+under Streamlit's ``AppTest``, as a first session sees it (Streamlit import
+included). Importing an app script instead would run it in bare mode, where
+``st.stop()`` does not stop, so the apps are not import targets.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import textwrap
+
+import calculator_model
+import roi_engine
+
+# Modules and app scripts timed by import-report, and modules the CLI must never load.
+IMPORT_TARGETS = ("roi_cli", "roi_engine", "calculator_model", "numpy", "pandas",
+                  "plotly.graph_objects", "plotly.express", "streamlit")
+APP_SCRIPTS = ("strategic_model.py", "calculator.py")
+UI_MODULES = ("streamlit", "plotly")
+
+
+def _add_input_flags(parser, defaults):
+    parser.add_argument("--json", help="JSON file of inputs")
+    for name, default in defaults.items():
+        parser.add_argument(f"--{name.replace('_', '-')}", dest=name,
+                            type=type(default) if isinstance(default, str) else float)
+
+
+def _inputs(args, defaults):
+    inputs = dict(defaults)
+    if args.json:
+        with open(args.json) as f:
+            inputs.update(json.load(f))
+    inputs.update({name: getattr(args, name) for name in defaults if getattr(args, name) is not None})
+    return inputs
+
+
+def productivity(inputs):
+    """calculator.py outputs for sidebar-style inputs."""
+    results = calculator_model.hours_allocation(
+        inputs["num_employees"], inputs["annual_salary"], inputs["fringe_rate"] / 100,
+        inputs["work_days"], inputs["daily_hours"], inputs["unproductive_pct"] / 100,
+        inputs["improvement_pct"] / 100,
+    )
+    results["weekly_waste_hours"] = calculator_model.weekly_hours_from_pct(
+        inputs["unproductive_pct"] / 100, inputs["work_days"], inputs["daily_hours"])
+    return results
+
+
+def strategic(inputs):
+    """strategic_model.py headline metrics for tab-style inputs."""
+    return {name: float(value) for name, value in roi_engine.deal_metrics(**inputs).items()}
+
+
+def _run_fresh(args):
+    # A fresh interpreter in the repo directory, writing no rerun metrics
+    return subprocess.run([sys.executable, *args], capture_output=True, text=True,
+                          cwd=os.path.dirname(os.path.abspath(__file__)), env={**os.environ, "ROI_METRICS_DIR": ""})
+
+
+def _top_level_imports(statement):
+    # Cumulative microseconds of each module imported at depth 0 by a fresh interpreter running ``statement``
+    proc = _run_fresh(["-X", "importtime", "-c", statement])
+    if proc.returncode != 0:
+        return None
+    times = {}
+    for line in proc.stderr.splitlines():
+        fields = line.split("|")
+        if line.startswith("import time:") and fields[1].strip().isdigit() and not fields[2].startswith("  "):
+            times[fields[2].strip()] = int(fields[1])
+    return times
+
+
+def import_report(targets=IMPORT_TARGETS):
+    """Import time (ms) of each target, each in a fresh interpreter.
+
+    Sums every top-level import the target triggers, parent packages included,
+    less the imports the interpreter makes at startup.
+    """
+    startup = _top_level_imports("pass") or {}
+    report = {}
+    for target in targets:
+        times = _top_level_imports(f"import {target}")
+        report[target] = None if times is None else sum(us for name, us in times.items() if name not in startup) / 1000
+    return report
+
+
+def first_run_report(scripts=APP_SCRIPTS, timeout=120):
+    """Wall time (ms) of the first run of each app script, each in a fresh interpreter.
+
+    Timed from interpreter start-up to the end of the first ``AppTest`` run with
+    the app's default inputs; None if the run fails.
+    """
+    report = {}
+    for script in scripts:
+        proc = _run_fresh(["-c", textwrap.dedent(f"""
+            import time
+            start = time.perf_counter()
+            from streamlit.testing.v1 import AppTest
+            app = AppTest.from_file({os.path.join(os.path.dirname(os.path.abspath(__file__)), script)!r}, default_timeout={timeout}).run()
+            print("failed" if app.exception else (time.perf_counter() - start) * 1000)
+        """)])
+        lines = proc.stdout.split()
+        report[script] = float(lines[-1]) if proc.returncode == 0 and lines and lines[-1] != "failed" else None
+    return report
+
+
+def ui_modules_loaded():
+    """UI packages present in ``sys.modules`` of this process."""
+    return sorted({name.split(".")[0] for name in sys.modules if name.split(".")[0] in UI_MODULES})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m roi_cli", description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    _add_input_flags(commands.add_parser("productivity", help="calculator.py outputs"), calculator_model.DEFAULT_INPUTS)
+    _add_input_flags(commands.add_parser("strategic", help="strategic_model.py headline metrics"), roi_engine.DEFAULT_INPUTS)
+    commands.add_parser("import-report", help="import time of each module and first-run time of each app")
+    args = parser.parse_args(argv)
+
+    if args.command == "productivity":
+        output = productivity(_inputs(args, calculator_model.DEFAULT_INPUTS))
+    elif args.command == "strategic":
+        output = strategic(_inputs(args, roi_engine.DEFAULT_INPUTS))
+    else:
+        output = {"import_ms": import_report(), "first_run_ms": first_run_report()}
+    loaded = ui_modules_loaded()
+    if loaded:
+        output["ui_modules_loaded"] = loaded
+    print(json.dumps(output, indent=2))
+
+
+if __name__ == "__main__":
+    main()
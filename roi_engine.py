@@ -0,0 +1,228 @@
+"""Vectorized cash-flow engine behind the strategic ROI model.
+
+Every function here takes the same named inputs the Streamlit tabs collect
+and broadcasts them NumPy-style: pass scalars for a single deal, or arrays of
+any (mutually broadcastable) shape to evaluate many scenarios in one call.
+Period vectors are laid out on a trailing axis of length ``max(analysis_years)``;
+periods beyond a scenario's own horizon carry zero cash flow.
+"""
+from typing import NamedTuple
+
+import numpy as np
+
+# (efficiency multiplier, weight) pairs behind the Risk-Adjusted NPV metric.
+RISK_SCENARIOS = ((0.8, 0.25), (1.0, 0.60), (1.2, 0.15))
+
+# Key-user hours per intensity level and the duration ceiling per unit (tab 2).
+INTENSITY_HOURS = {"Low": 250, "Medium": 500, "High": 750}
+MAX_DURATION = {"Weeks": 52.0, "Months": 12.0}
+
+# Outputs of ``derive_inputs`` used by the report but not by ``evaluate``.
+REPORT_INPUTS = ("y1_recurring", "initial_setup", "client_internal_investment")
+
+# Tab input defaults, keyed by the names used in strategic_model.py.
+DEFAULT_INPUTS = {
+    "num_employees": 1,
+    "annual_salary": 0.0,
+    "fringe_rate": 20,
+    "work_days": 220,
+    "daily_hours": 8.0,
+    "waste_pct": 10.0,
+    "improvement_target": 100,
+    "current_subscription": 0.0,
+    "annual_subscription": 0.0,
+    "initial_setup": 0.0,
+    "analysis_years": 5,
+    "escalation_rate": 3,
+    "impl_duration": 26.0,
+    "impl_unit": "Weeks",
+    "key_users": 5,
+    "impl_intensity": "Medium",
+    "wacc": 10,
+}
+
+
+class CashFlows(NamedTuple):
+    savings: np.ndarray
+    investments: np.ndarray
+    net: np.ndarray
+    cumulative: np.ndarray
+    npv: np.ndarray
+    breakeven: np.ndarray
+
+
+def column(value):
+    """``value`` as floats with a trailing axis, so scenario inputs broadcast against periods."""
+    return np.asarray(value, dtype=float)[..., np.newaxis]
+
+
+def periods(analysis_years):
+    """Year numbers ``1..max(analysis_years)`` as an integer vector."""
+    return np.arange(1, int(np.max(analysis_years)) + 1)
+
+
+def active_periods(analysis_years):
+    """Boolean mask of the periods that fall inside each scenario's horizon."""
+    return periods(analysis_years) <= column(analysis_years)
+
+
+def escalation_vector(escalation_rate, analysis_years):
+    """Salary escalation factor ``(1 + r)^(yr - 1)`` for each period."""
+    return (1 + column(escalation_rate) / 100) ** (periods(analysis_years) - 1)
+
+
+def discount_vector(wacc, analysis_years):
+    """Discount factor ``1 / (1 + wacc)^yr`` for each period."""
+    return (1 + column(wacc) / 100) ** -periods(analysis_years).astype(float)
+
+
+def savings_vector(burdened_cost_pp, total_annual_hours_pp, waste_pct, num_employees,
+                   improvement_target, escalation_rate, impl_factor, analysis_years):
+    """Gross savings per period, with year 1 prorated by ``impl_factor``."""
+    yrs = periods(analysis_years)
+    hours = column(total_annual_hours_pp)
+    hourly_rate = column(burdened_cost_pp) * escalation_vector(escalation_rate, analysis_years) / np.maximum(hours, 1)
+    savings = hours * column(waste_pct) * column(num_employees) * (column(improvement_target) / 100) * hourly_rate
+    savings = np.where(yrs == 1, savings * column(impl_factor), savings)
+    return np.where(active_periods(analysis_years), savings, 0.0)
+
+
+def investment_vector(y1_investment_total, steady_state_recurring, analysis_years):
+    """Investment outflow per period (negative): the year 1 total, then the recurring subscription."""
+    yrs = periods(analysis_years)
+    invest = np.where(yrs == 1, -column(y1_investment_total), -column(steady_state_recurring))
+    return np.where(active_periods(analysis_years), invest, 0.0)
+
+
+def npv(net, wacc, analysis_years):
+    """Net present value of a per-period net cash flow array."""
+    return np.sum(net * discount_vector(wacc, analysis_years), axis=-1)
+
+
+def breakeven_years(savings, investments, waste_pct, y1_investment_total):
+    """Fractional years until cumulative cash flow turns non-negative.
+
+    Returns ``0.0`` where the scenario has no waste or never breaks even
+    within its horizon, matching the "Beyond Horizon" convention of the report.
+    """
+    net = savings + investments
+    cum = np.cumsum(net, axis=-1)
+    # Periods past a scenario's horizon repeat its final cumulative value, so
+    # they can never be the first non-negative period.
+    found = cum >= 0
+    hit = found.any(axis=-1)
+    idx = np.argmax(found, axis=-1)
+
+    net_now = np.take_along_axis(net, idx[..., np.newaxis], axis=-1)[..., 0]
+    prev_idx = np.maximum(idx - 1, 0)[..., np.newaxis]
+    prev_cum = np.take_along_axis(cum, prev_idx, axis=-1)[..., 0]
+    first_savings = savings[..., 0]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        in_year_one = np.where(first_savings > 0, np.asarray(y1_investment_total, dtype=float) / first_savings, 0.0)
+        later = np.where(net_now > 0, idx + np.abs(prev_cum) / net_now, idx)
+    result = np.where(idx == 0, in_year_one, later)
+    result = np.where(hit, result, 0.0)
+    return np.where(np.asarray(waste_pct) <= 0, 0.0, result)
+
+
+def evaluate(burdened_cost_pp, total_annual_hours_pp, waste_pct, num_employees,
+             improvement_target, escalation_rate, impl_factor, y1_investment_total,
+             steady_state_recurring, analysis_years, wacc):
+    """Savings, investments, cumulative cash flow, NPV and breakeven in one pass."""
+    savings = savings_vector(burdened_cost_pp, total_annual_hours_pp, waste_pct, num_employees,
+                             improvement_target, escalation_rate, impl_factor, analysis_years)
+    investments = investment_vector(y1_investment_total, steady_state_recurring, analysis_years)
+    savings, investments = np.broadcast_arrays(savings, investments)
+    net = savings + investments
+    return CashFlows(
+        savings=savings,
+        investments=investments,
+        net=net,
+        cumulative=np.cumsum(net, axis=-1),
+        npv=npv(net, wacc, analysis_years),
+        breakeven=breakeven_years(savings, investments, waste_pct, y1_investment_total),
+    )
+
+
+def risk_adjusted_npv(waste_pct, wacc, scenarios=RISK_SCENARIOS, **model):
+    """Weighted NPV across the downside / expected / upside efficiency scenarios."""
+    multipliers = np.array([m for m, _ in scenarios])
+    weights = np.array([w for _, w in scenarios])
+    ndim = max(np.ndim(v) for v in (waste_pct, wacc, *model.values()))
+    multipliers = multipliers.reshape((-1,) + (1,) * ndim)
+    weights = weights.reshape((-1,) + (1,) * ndim)
+    result = evaluate(waste_pct=np.asarray(waste_pct) * multipliers, wacc=wacc, **model)
+    return np.sum(result.npv * weights, axis=0)
+
+
+def derive_inputs(num_employees, annual_salary, fringe_rate, work_days, daily_hours, waste_pct,
+                  improvement_target, current_subscription, annual_subscription, initial_setup,
+                  analysis_years, escalation_rate, impl_duration, impl_unit, key_users,
+                  impl_intensity, wacc):
+    """Turn raw tab inputs (see ``DEFAULT_INPUTS``) into engine inputs.
+
+    ``waste_pct`` is a percentage of the working week. A non-zero
+    ``current_subscription`` models a "Pre-existing Solution Upgrade": year 1
+    pays only the uplift over the legacy spend. Returns the keyword arguments
+    of ``evaluate`` plus the TCO components shown on the report tab.
+    """
+    burdened_cost_pp = np.asarray(annual_salary, dtype=float) * (1 + np.asarray(fringe_rate) / 100)
+    total_annual_hours_pp = np.asarray(work_days, dtype=float) * daily_hours
+    hourly_rate_pp = burdened_cost_pp / np.maximum(total_annual_hours_pp, 1)
+    max_dur = np.where(np.asarray(impl_unit) == "Months", MAX_DURATION["Months"], MAX_DURATION["Weeks"])
+    intensity = np.vectorize(INTENSITY_HOURS.__getitem__, otypes=[float])(impl_intensity)
+    client_internal_investment = np.asarray(key_users) * intensity * hourly_rate_pp
+    y1_recurring = np.asarray(annual_subscription, dtype=float) - current_subscription
+    steady_state_recurring = np.asarray(annual_subscription, dtype=float)
+    return {
+        "burdened_cost_pp": burdened_cost_pp,
+        "total_annual_hours_pp": total_annual_hours_pp,
+        "waste_pct": np.asarray(waste_pct, dtype=float) / 100,
+        "num_employees": np.asarray(num_employees, dtype=float),
+        "improvement_target": np.asarray(improvement_target, dtype=float),
+        "escalation_rate": np.asarray(escalation_rate, dtype=float),
+        "impl_factor": (max_dur - impl_duration) / max_dur,
+        "y1_investment_total": initial_setup + client_internal_investment + y1_recurring,
+        "steady_state_recurring": steady_state_recurring,
+        "analysis_years": np.asarray(analysis_years, dtype=int),
+        "wacc": np.asarray(wacc, dtype=float),
+        "y1_recurring": y1_recurring,
+        "initial_setup": np.asarray(initial_setup, dtype=float),
+        "client_internal_investment": client_internal_investment,
+    }
+
+
+def engine_inputs(derived):
+    """The subset of ``derive_inputs`` output accepted by ``evaluate``."""
+    return {k: v for k, v in derived.items() if k not in REPORT_INPUTS}
+
+
+def evaluate_inputs(**inputs):
+    """``evaluate`` for raw tab inputs; missing inputs take their defaults.
+
+    Returns the cash flows together with the full ``derive_inputs`` dict.
+    """
+    derived = derive_inputs(**{**DEFAULT_INPUTS, **inputs})
+    return evaluate(**engine_inputs(derived)), derived
+
+
+def deal_metrics(**inputs):
+    """Headline report metrics for raw tab inputs; missing inputs take their defaults.
+
+    Returns risk-adjusted NPV, expected NPV, TCO, breakeven years (``0.0`` for
+    beyond horizon) and FTE reclaimed, each broadcast over the scenarios.
+    """
+    flows, derived = evaluate_inputs(**inputs)
+    years = derived["analysis_years"]
+    hours = derived["total_annual_hours_pp"]
+    annual_hrs = hours * derived["waste_pct"] * (derived["improvement_target"] / 100) * derived["num_employees"]
+    total_tco = (derived["y1_recurring"] + derived["steady_state_recurring"] * (years - 1)
+                 + derived["initial_setup"] + derived["client_internal_investment"])
+    return {
+        "risk_adj_npv": risk_adjusted_npv(**engine_inputs(derived)),
+        "expected_npv": flows.npv,
+        "total_tco": total_tco,
+        "breakeven_years": flows.breakeven,
+        "fte_reclaimed": np.floor(annual_hrs / np.maximum(hours, 1) * 10) / 10.0,
+    }
@@ -0,0 +1,275 @@
+"""Local SQLite store of saved deals and their content-addressed results.
+
+Four tables:
+
+* ``results`` holds cash flows and headline metrics, keyed by
+  ``result_cache.canonical_key("cash_flows", inputs)`` over the engine inputs,
+  the same key as the in-process result cache. Each distinct input set is
+  computed and stored once, however many deals share it.
+* ``scenarios`` holds each saved deal: its full input set (as JSON, keyed by
+  a canonical hash of those inputs), its name, industry and solution, plus
+  indexed copies of the risk-adjusted NPV and breakeven for searching.
+* ``views`` holds the report's other results (sensitivity grid, tornado,
+  Monte Carlo summary, ...), pickled and keyed like the result cache, and
+  ``scenario_views`` links each deal to the views saved with it.
+
+Loading a deal reads its stored inputs, cash flows and view keys without
+touching the model; the report then reads the cash flows and views back
+through ``result_or_compute`` and ``view_or_compute`` under the same keys. The database defaults to ``scenarios.db`` in the working directory;
+set ``ROI_STORE_PATH`` to move it. It is created by the first save, so
+searching or loading before then reads as an empty store.
+"""
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+import result_cache
+import roi_engine
+
+STORE_PATH = os.environ.get("ROI_STORE_PATH", "scenarios.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    result_key TEXT PRIMARY KEY,
+    risk_adj_npv REAL NOT NULL,
+    npv REAL NOT NULL,
+    breakeven_years REAL NOT NULL,
+    total_tco REAL,
+    fte_reclaimed REAL,
+    savings BLOB NOT NULL,
+    investments BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS scenarios (
+    scenario_key TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    industry TEXT,
+    solution_name TEXT,
+    inputs TEXT NOT NULL,
+    result_key TEXT NOT NULL REFERENCES results(result_key),
+    risk_adj_npv REAL NOT NULL,
+    breakeven_years REAL,
+    saved_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS views (
+    view_key TEXT PRIMARY KEY,
+    value BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS scenario_views (
+    scenario_key TEXT NOT NULL REFERENCES scenarios(scenario_key),
+    namespace TEXT NOT NULL,
+    view_key TEXT NOT NULL REFERENCES views(view_key),
+    PRIMARY KEY (scenario_key, namespace)
+);
+CREATE INDEX IF NOT EXISTS scenarios_industry_npv ON scenarios(industry, risk_adj_npv);
+CREATE INDEX IF NOT EXISTS scenarios_npv ON scenarios(risk_adj_npv);
+CREATE INDEX IF NOT EXISTS scenarios_breakeven ON scenarios(breakeven_years);
+"""
+
+
+def _blob(values):
+    return np.asarray(values, dtype=np.float64).tobytes()
+
+
+def _flows(savings, investments, npv, breakeven):
+    savings = np.frombuffer(savings, dtype=np.float64)
+    investments = np.frombuffer(investments, dtype=np.float64)
+    net = savings + investments
+    return roi_engine.CashFlows(savings=savings, investments=investments, net=net, cumulative=np.cumsum(net),
+                                npv=np.float64(npv), breakeven=np.float64(breakeven))
+
+
+def _plain(inputs):
+    # 0-d arrays from derive_inputs become floats so the key and JSON are stable
+    return {k: v.item() if isinstance(v, np.ndarray) and v.ndim == 0 else v for k, v in inputs.items()}
+
+
+class ScenarioStore:
+    """Thread-safe wrapper around one SQLite connection, opened on first use."""
+
+    def __init__(self, path=STORE_PATH):
+        self.path = path
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def exists(self):
+        """Whether the database has been created; reads of a missing one find nothing."""
+        return self._conn is not None or os.path.exists(self.path)
+
+    def _connection(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def load_result(self, result_key):
+        """``(CashFlows, risk_adj_npv)`` stored under ``result_key``, or ``None``."""
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT savings, investments, npv, breakeven_years, risk_adj_npv FROM results WHERE result_key = ?",
+                (result_key,)).fetchone()
+        if row is None:
+            return None
+        return _flows(row["savings"], row["investments"], row["npv"], row["breakeven_years"]), row["risk_adj_npv"]
+
+    def result_or_compute(self, key_inputs, compute):
+        """Stored ``(CashFlows, risk_adj_npv)`` for ``key_inputs``, else ``compute()`` (not stored until saved)."""
+        if not self.exists():
+            return compute()
+        return self.load_result(result_cache.canonical_key("cash_flows", _plain(key_inputs))) or compute()
+
+    def load_view(self, view_key):
+        """View stored under ``view_key``, or ``None``."""
+        with self._lock:
+            row = self._connection().execute("SELECT value FROM views WHERE view_key = ?", (view_key,)).fetchone()
+        return None if row is None else pickle.loads(row["value"])
+
+    def view_or_compute(self, namespace, key_inputs, compute):
+        """Stored view for ``namespace`` and ``key_inputs``, else ``compute()`` (not stored until saved)."""
+        if not self.exists():
+            return compute()
+        stored = self.load_view(result_cache.canonical_key(namespace, key_inputs))
+        return compute() if stored is None else stored
+
+    def save(self, name, inputs, key_inputs, flows, risk_adj_npv, total_tco=None, fte_reclaimed=None,
+             industry=None, solution_name=None, views=None):
+        """Save a deal and, unless already stored, its results; returns its scenario key.
+
+        ``inputs`` is the full input set needed to restore the deal and
+        ``key_inputs`` the engine inputs its results were computed from.
+        ``views`` maps a namespace to the ``(key_inputs, value)`` of a view
+        shown with the deal. Saving the same inputs again renames the
+        existing deal and replaces its views.
+        """
+        inputs = _plain(inputs)
+        scenario_key = result_cache.canonical_key("scenario", inputs)
+        result_key = result_cache.canonical_key("cash_flows", _plain(key_inputs))
+        breakeven = float(flows.breakeven)
+        with self._lock, self._connection() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (result_key, float(risk_adj_npv), float(flows.npv), breakeven, total_tco, fte_reclaimed,
+                 _blob(flows.savings), _blob(flows.investments)))
+            conn.execute(
+                "INSERT INTO scenarios VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT(scenario_key) DO UPDATE SET "
+                "name = excluded.name, industry = excluded.industry, solution_name = excluded.solution_name, "
+                "saved_at = excluded.saved_at",
+                (scenario_key, name, industry, solution_name, json.dumps(inputs), result_key, float(risk_adj_npv),
+                 breakeven if breakeven > 0 else None, time.time()))
+            conn.execute("DELETE FROM scenario_views WHERE scenario_key = ?", (scenario_key,))
+            for namespace, (view_inputs, value) in (views or {}).items():
+                view_key = result_cache.canonical_key(namespace, view_inputs)
+                conn.execute("INSERT OR IGNORE INTO views VALUES (?, ?)", (view_key, pickle.dumps(value)))
+                conn.execute("INSERT INTO scenario_views VALUES (?, ?, ?)", (scenario_key, namespace, view_key))
+        return scenario_key
+
+    def save_deal(self, name, inputs, industry=None, solution_name=None):
+        """Save raw tab inputs (see ``roi_engine.DEFAULT_INPUTS``), computing results only if not yet stored."""
+        inputs = {**roi_engine.DEFAULT_INPUTS, **inputs}
+        key_inputs = _plain(roi_engine.engine_inputs(roi_engine.derive_inputs(**inputs)))
+        result_key = result_cache.canonical_key("cash_flows", key_inputs)
+        with self._lock:
+            stored = self._connection().execute(
+                "SELECT total_tco, fte_reclaimed FROM results WHERE result_key = ?", (result_key,)).fetchone()
+        if stored is not None:
+            flows, risk_adj_npv = self.load_result(result_key)
+            total_tco, fte_reclaimed = stored["total_tco"], stored["fte_reclaimed"]
+        else:
+            flows, _ = roi_engine.evaluate_inputs(**inputs)
+            metrics = roi_engine.deal_metrics(**inputs)
+            risk_adj_npv, total_tco, fte_reclaimed = (float(metrics[k]) for k in ("risk_adj_npv", "total_tco", "fte_reclaimed"))
+        return self.save(name, inputs, key_inputs, flows, risk_adj_npv, total_tco, fte_reclaimed, industry, solution_name)
+
+    def search(self, industries=None, npv_above=None, breakeven_below=None, name_contains=None, limit=200):
+        """Saved deals matching every given filter, best risk-adjusted NPV first.
+
+        ``breakeven_below`` excludes deals that do not break even within their horizon.
+        """
+        clauses, params = [], []
+        if industries:
+            clauses.append(f"s.industry IN ({', '.join('?' * len(industries))})")
+            params += list(industries)
+        if npv_above is not None:
+            clauses.append("s.risk_adj_npv > ?")
+            params.append(npv_above)
+        if breakeven_below is not None:
+            clauses.append("s.breakeven_years < ?")
+            params.append(breakeven_below)
+        if name_contains:
+            clauses.append("s.name LIKE ?")
+            params.append(f"%{name_contains}%")
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        if not self.exists():
+            return []
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT s.scenario_key, s.name, s.industry, s.solution_name, s.risk_adj_npv, s.breakeven_years, "
+                f"r.npv, r.total_tco, r.fte_reclaimed, s.saved_at FROM scenarios s JOIN results r USING (result_key) {where} "
+                "ORDER BY s.risk_adj_npv DESC LIMIT ?", (*params, limit)).fetchall()
+        return [dict(row) for row in rows]
+
+    def load(self, scenario_key):
+        """A saved deal with its inputs, stored cash flows and view keys, or ``None``.
+
+        Only the store is read. ``views`` maps each namespace saved with the
+        deal to its view key, the ``result_cache.canonical_key`` the report
+        looks it up by.
+        """
+        if not self.exists():
+            return None
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT s.name, s.industry, s.solution_name, s.inputs, s.result_key, r.* FROM scenarios s "
+                "JOIN results r USING (result_key) WHERE s.scenario_key = ?", (scenario_key,)).fetchone()
+        if row is None:
+            return None
+        with self._lock:
+            views = self._connection().execute(
+                "SELECT namespace, view_key FROM scenario_views WHERE scenario_key = ?", (scenario_key,)).fetchall()
+        return {
+            "name": row["name"],
+            "industry": row["industry"],
+            "solution_name": row["solution_name"],
+            "inputs": json.loads(row["inputs"]),
+            "result_key": row["result_key"],
+            "flows": _flows(row["savings"], row["investments"], row["npv"], row["breakeven_years"]),
+            "risk_adj_npv": row["risk_adj_npv"],
+            "total_tco": row["total_tco"],
+            "fte_reclaimed": row["fte_reclaimed"],
+            "views": {view["namespace"]: view["view_key"] for view in views},
+        }
+
+    def diff(self, scenario_a, scenario_b):
+        """Year-by-year cash flows of two saved deals and their difference (b - a).
+
+        The shorter horizon is padded with zero cash flow. Returns ``None`` if
+        either deal is missing.
+        """
+        a, b = self.load(scenario_a), self.load(scenario_b)
+        if a is None or b is None:
+            return None
+        years = max(len(a["flows"].net), len(b["flows"].net))
+        rows = {"year": np.arange(1, years + 1)}
+        for field in ("savings", "investments", "net"):
+            values_a, values_b = (np.pad(s["flows"]._asdict()[field], (0, years - len(s["flows"].net))) for s in (a, b))
+            rows[f"{field}_a"], rows[f"{field}_b"], rows[f"{field}_delta"] = values_a, values_b, values_b - values_a
+        rows["cumulative_a"], rows["cumulative_b"] = np.cumsum(rows["net_a"]), np.cumsum(rows["net_b"])
+        rows["cumulative_delta"] = rows["cumulative_b"] - rows["cumulative_a"]
+        return {"a": a, "b": b, "years": rows}
+
+    def delete(self, scenario_key):
+        if not self.exists():
+            return
+        with self._lock, self._connection() as conn:
+            conn.execute("DELETE FROM scenario_views WHERE scenario_key = ?", (scenario_key,))
+            conn.execute("DELETE FROM scenarios WHERE scenario_key = ?", (scenario_key,))
+
+
+# Shared by every session of the Streamlit app.
+STORE = ScenarioStore()
@@ -0,0 +1,98 @@
+"""Sensitivity surfaces and tornado analysis for the strategic ROI model.
+
+Both work on raw tab inputs (see ``roi_engine.DEFAULT_INPUTS``) and evaluate
+every grid cell or tornado bar in a single broadcasted ``roi_engine`` call.
+``efficiency`` is not a tab input: it scales the waste being addressed, as the
+efficiency achievement rows of the original NPV Sensitivity Matrix did.
+"""
+import numpy as np
+
+import roi_engine
+
+# Selectable inputs and their display labels.
+AXES = {
+    "efficiency": "Efficiency Achievement (%)",
+    "wacc": "WACC (%)",
+    "annual_salary": "Avg. Annual Salary ($)",
+    "num_employees": "Headcount",
+    "escalation_rate": "Salary Increases (%)",
+    "impl_duration": "Implementation Duration",
+    "annual_subscription": "Annual Subscription ($)",
+}
+
+
+def axis_range(name, inputs):
+    """Default (low, high) range of an axis around the current inputs."""
+    if name == "efficiency":
+        return 0.8, 1.2
+    value = inputs[name]
+    if name == "wacc":
+        return value - 4, value + 4
+    if name == "escalation_rate":
+        return max(value - 2, 0), value + 2
+    if name == "impl_duration":
+        return 0.0, roi_engine.MAX_DURATION[inputs["impl_unit"]]
+    return value * 0.8, value * 1.2
+
+
+def axis_values(name, inputs, steps):
+    """``steps`` evenly spaced values across ``axis_range``."""
+    return np.linspace(*axis_range(name, inputs), steps)
+
+
+def _with(inputs, name, values):
+    if name == "efficiency":
+        return {**inputs, "waste_pct": np.multiply(inputs["waste_pct"], values)}
+    return {**inputs, name: values}
+
+
+def npv_grid(inputs, y_axis, y_values, x_axis, x_values):
+    """Expected NPV with ``y_values`` down the rows and ``x_values`` across the columns."""
+    inputs = {**roi_engine.DEFAULT_INPUTS, **inputs}
+    grid = _with(inputs, y_axis, np.asarray(y_values, dtype=float)[:, np.newaxis])
+    grid = _with(grid, x_axis, np.asarray(x_values, dtype=float)[np.newaxis, :])
+    flows, _ = roi_engine.evaluate_inputs(**grid)
+    return np.broadcast_to(flows.npv, (len(y_values), len(x_values)))
+
+
+def tornado(inputs, names=tuple(AXES)):
+    """One-at-a-time NPV swing of each input between the ends of its ``axis_range``.
+
+    Returns the base NPV and ``(name, low_npv, high_npv)`` rows sorted by
+    descending swing.
+    """
+    inputs = {**roi_engine.DEFAULT_INPUTS, **inputs}
+    # Row 0 is the base case; rows 2k+1 / 2k+2 move input k to its low / high end.
+    rows = 1 + 2 * len(names)
+    batch = {k: np.full(rows, v, dtype=object if isinstance(v, str) else float) for k, v in inputs.items()}
+    efficiency = np.ones(rows)
+    for k, name in enumerate(names):
+        target = efficiency if name == "efficiency" else batch[name]
+        target[2 * k + 1], target[2 * k + 2] = axis_range(name, inputs)
+    batch["waste_pct"] = batch["waste_pct"] * efficiency
+    flows, _ = roi_engine.evaluate_inputs(**batch)
+    npv = flows.npv
+    bars = [(name, npv[2 * k + 1], npv[2 * k + 2]) for k, name in enumerate(names)]
+    bars.sort(key=lambda bar: abs(bar[2] - bar[1]), reverse=True)
+    return npv[0], bars
+
+
+def _bin_edges(n, bins):
+    return np.unique(np.linspace(0, n, min(n, bins) + 1).astype(int))[:-1]
+
+
+def downsample(matrix, y_values, x_values, max_bins=100):
+    """Block-average a grid to at most ``max_bins`` x ``max_bins`` cells for plotting.
+
+    Axis values are averaged over the same blocks, so labels stay aligned.
+    """
+    matrix = np.asarray(matrix)
+    y_edges = _bin_edges(matrix.shape[0], max_bins)
+    x_edges = _bin_edges(matrix.shape[1], max_bins)
+    y_counts = np.diff(np.append(y_edges, matrix.shape[0]))
+    x_counts = np.diff(np.append(x_edges, matrix.shape[1]))
+    binned = np.add.reduceat(np.add.reduceat(matrix, y_edges, axis=0), x_edges, axis=1)
+    binned = binned / np.outer(y_counts, x_counts)
+    y_binned = np.add.reduceat(np.asarray(y_values, dtype=float), y_edges) / y_counts
+    x_binned = np.add.reduceat(np.asarray(x_values, dtype=float), x_edges) / x_counts
+    return binned, y_binned, x_binned
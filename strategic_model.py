@@ -1,13 +1,25 @@
 import streamlit as st
-import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
 import numpy as np
-import math
 import re
+import time
+
+# Plotly and pandas are imported inside the figure builders and graph nodes that use
+# them, so a cold start only pays for Streamlit and NumPy.
+import benchmark_data
+import deal_optimizer
+import instrumentation
+import model_graph
+import period_engine
+import report_export
+import result_cache
+import risk_simulation
+import roi_engine
+import scenario_store
+import sensitivity
 
 # --- App Configuration (Baseline v4 Locked) ---
 st.set_page_config(page_title="Productivity Business Case Calculator", layout="wide")
+rerun = instrumentation.begin_rerun("strategic_model", st.session_state)
 
 st.title("🏛️ Productivity Value Realization")
 st.markdown("Quantifying the multi-year value of improving operational efficiency.")
@@ -28,19 +40,90 @@ def currency_input(label, default_value, help_text, key):
     clean_numeric = re.sub(r'[^\d]', '', st.session_state[key])
     return float(clean_numeric) if clean_numeric else 0.0
 
+# --- Helper to seed widget defaults, so saved scenarios can be restored through session state ---
+def widget_default(key, default_value):
+    if key not in st.session_state:
+        st.session_state[key] = default_value
+    return key
+
+# --- Helper for report views saved with a deal, so loading the deal reads them back instead of recomputing ---
+def stored_view(namespace, key_inputs, compute):
+    value = result_cache.RESULTS.get_or_compute(
+        namespace, key_inputs, lambda: scenario_store.STORE.view_or_compute(namespace, key_inputs, compute))
+    st.session_state.report_views[namespace] = (key_inputs, value)
+    return value
+
+# Widget keys that make up a saved scenario (see the Scenario Library on the report tab)
+SCENARIO_WIDGETS = (
+    "investment_strategy", "industry", "num_employees", "salary_state", "fringe_rate", "work_days", "daily_hours",
+    "input_method", "baseline_waste_hrs", "baseline_waste_pct", "improvement_target", "solution_name",
+    "curr_sub_state", "future_sub_state", "saas_state", "services_state", "analysis_years", "escalation_rate",
+    "granularity", "ramp", "ramp_months", "ramp_steps", "subscription_start_month", "unit_choice", "last_unit",
+    "dur_key", "key_users", "impl_intensity", "wacc", "target_mode", "target_yrs", "benchmark_region", "benchmark_role",
+)
+
+# --- Derived quantities: only the nodes downstream of a changed input recompute on rerun ---
+def build_report_graph():
+    # The model graph plus the nodes that reach the period engine, the result cache and the scenario store
+    graph = model_graph.build_model_graph()
+
+    @graph.node
+    def period_settings(granularity, ramp, ramp_months, ramp_steps, subscription_start_month):
+        # Empty for the annual engine, so annual cache keys are unaffected
+        if granularity == "Annual":
+            return {}
+        return dict(periods_per_year=period_engine.PERIODS_PER_YEAR[granularity], ramp=ramp, ramp_months=ramp_months,
+                    ramp_steps=ramp_steps, subscription_start_month=subscription_start_month)
+
+    @graph.node
+    def current_be(current_be_key):
+        # Breakeven is undiscounted, so any WACC will do; read back from the store when a saved deal has these inputs
+        compute = lambda: float(roi_engine.evaluate(wacc=roi_engine.DEFAULT_INPUTS["wacc"], **current_be_key).breakeven)
+        return result_cache.RESULTS.get_or_compute(
+            "current_be", current_be_key, lambda: scenario_store.STORE.view_or_compute("current_be", current_be_key, compute))
+
+    @graph.node
+    def report_flows(flows_key, model_inputs, final_calc_pct, wacc, period_settings, y1_recurring):
+        # Shared across sessions through the result cache, and read back from the
+        # scenario store rather than recomputed when a saved deal has these inputs
+        if period_settings:
+            compute = lambda: (
+                period_engine.roll_up(period_engine.evaluate(waste_pct=final_calc_pct, wacc=wacc, y1_recurring=y1_recurring,
+                                                             **model_inputs, **period_settings)),
+                float(period_engine.risk_adjusted_npv(waste_pct=final_calc_pct, wacc=wacc, y1_recurring=y1_recurring,
+                                                      **model_inputs, **period_settings)),
+            )
+        else:
+            compute = lambda: (
+                roi_engine.evaluate(waste_pct=final_calc_pct, wacc=wacc, **model_inputs),
+                float(roi_engine.risk_adjusted_npv(waste_pct=final_calc_pct, wacc=wacc, **model_inputs)),
+            )
+        return result_cache.RESULTS.get_or_compute(
+            "cash_flows", flows_key, lambda: scenario_store.STORE.result_or_compute(flows_key, compute))
+
+    return graph
+
+if "model_graph" not in st.session_state:
+    st.session_state.model_graph = build_report_graph()
+graph = st.session_state.model_graph
+graph.begin_run()
+# Views shown this run (see stored_view); the Scenario Library saves them with the deal
+st.session_state.report_views = {}
+
 # --- Tabs ---
 tab1, tab2, tab3 = st.tabs(["📊 Baseline & Industry", "💰 Investment & Horizon", "📈 ROI Report"])
 
 # =================================================================
 # TAB 1: OPERATIONAL STRATEGY
 # =================================================================
-with tab1:
+with tab1, rerun.span("tab1_inputs"):
     st.header("1. Operational Strategy")
     
     investment_strategy = st.radio(
         "Investment Context:",
         ["New Solution", "Pre-existing Solution Upgrade"],
         horizontal=True,
+        key="investment_strategy",
         help="New: Implementing a capability for the first time. Upgrade: Moving an existing Blue Yonder customer to an AI-Native/Cognitive version."
     )
     
@@ -48,56 +131,72 @@ with tab1:
     with col1:
         industry = st.selectbox(
             "Industry Vertical", 
-            ["Retail", "Logistics Service Providers (LSP)", "Manufacturing"], 
+            benchmark_data.DATASET.verticals(), 
+            key="industry",
             help="Contextualizes the business environment and selects relevant productivity benchmarks."
         )
         
-        benchmarks = {
-            "Retail": {"leakage": 20.0, "hours": 8.0, "context": "Promo friction & stock-outs"},
-            "Logistics Service Providers (LSP)": {"leakage": 25.0, "hours": 10.0, "context": "Manual dispatching & carrier churn"},
-            "Manufacturing": {"leakage": 18.0, "hours": 7.2, "context": "Schedule jitter & material lag"}
-        }
-        
-        st.info(f"**Industry Context:** {benchmarks[industry]['context']}. Typical productive leakage is {benchmarks[industry]['leakage']}% ({benchmarks[industry]['hours']} hrs/wk).")
+        # Region and role filters only appear when the dataset breaks verticals down by them
+        regions, roles = benchmark_data.DATASET.regions(), benchmark_data.DATASET.roles()
+        benchmark_region = st.selectbox("Benchmark Region", ["All Regions", *regions], key="benchmark_region") if len(regions) > 1 else "All Regions"
+        benchmark_role = st.selectbox("Benchmark Role", ["All Roles", *roles], key="benchmark_role") if len(roles) > 1 else "All Roles"
+        region = None if benchmark_region == "All Regions" else benchmark_region
+        role = None if benchmark_role == "All Roles" else benchmark_role
+
+        def benchmark_summary(region, role):
+            return result_cache.RESULTS.get_or_compute(
+                "benchmark", dict(path=benchmark_data.DATASET.path, vertical=industry, region=region, role=role),
+                lambda: benchmark_data.DATASET.summary(industry, region, role))
+
+        benchmark = benchmark_summary(region, role)
+        if benchmark is None:
+            st.caption(f"No benchmark observations for {benchmark_region} / {benchmark_role}; showing all of {industry}.")
+            benchmark = benchmark_summary(None, None)
+        leakage_band, hours_band = benchmark["leakage_pct"], benchmark["hours_per_week"]
+        benchmark_info = f"**Industry Context:** {benchmark_data.DATASET.vertical_info(industry)['context'] or industry}. Typical productive leakage is {leakage_band[50]:.1f}% ({hours_band[50]:.1f} hrs/wk)."
+        if leakage_band[90] > leakage_band[10]:
+            benchmark_info += f" P10–P90: {leakage_band[10]:.1f}–{leakage_band[90]:.1f}% across {benchmark['observations']:,} observations."
+        st.info(benchmark_info)
 
-        num_employees = st.number_input("Total Headcount in Scope", min_value=1, value=1, help="Number of users of the solution.")
+        num_employees = st.number_input("Total Headcount in Scope", min_value=1, key=widget_default("num_employees", 1), help="Number of users of the solution.")
         annual_salary = currency_input("Avg. Annual Salary ($)", 0, "Average base salary.", "salary_state")
-        fringe_rate = st.slider("Employee Burden Rate (%)", 0, 50, 20, help="Local statutory costs (Super, Tax, etc.).")
-        burdened_cost_pp = annual_salary * (1 + fringe_rate/100)
+        fringe_rate = st.slider("Employee Burden Rate (%)", 0, 50, key=widget_default("fringe_rate", 20), help="Local statutory costs (Super, Tax, etc.).")
+        graph.set(num_employees=num_employees, annual_salary=annual_salary, fringe_rate=fringe_rate)
     
     with col2:
-        work_days = st.number_input("Productive Working Days / Year", value=220, help="Standardized annual working days.")
-        daily_hours = st.number_input("Productive Hours / Day", value=8.00, help="Actual time spent on core tasks.")
-        total_annual_hours_pp = work_days * daily_hours
-        hourly_rate_pp = burdened_cost_pp / max(total_annual_hours_pp, 1)
+        work_days = st.number_input("Productive Working Days / Year", step=1, key=widget_default("work_days", 220), help="Standardized annual working days.")
+        daily_hours = st.number_input("Productive Hours / Day", key=widget_default("daily_hours", 8.00), help="Actual time spent on core tasks.")
+        graph.set(work_days=work_days, daily_hours=daily_hours)
         
         st.divider()
-        input_method = st.radio("Inefficiency Target:", ["Hours per Week", "Percentage of Week"], horizontal=True, help="Enter the hours per week per user of inefficiency to be reduced or eliminated.")
+        input_method = st.radio("Inefficiency Target:", ["Hours per Week", "Percentage of Week"], horizontal=True, key="input_method", help="Enter the hours per week per user of inefficiency to be reduced or eliminated.")
         
         if st.button(f"✨ Apply {industry} Benchmark"):
-            st.session_state['manual_target_hrs'] = benchmarks[industry]['hours']
-            st.session_state['manual_target_pct'] = benchmarks[industry]['leakage']
+            st.session_state['manual_target_hrs'] = st.session_state['baseline_waste_hrs'] = hours_band[50]
+            st.session_state['manual_target_pct'] = leakage_band[50]
+            st.session_state['baseline_waste_pct'] = int(leakage_band[50])
         
         weekly_productive_hours = daily_hours * 5
         if input_method == "Hours per Week":
             default_hrs = st.session_state.get('manual_target_hrs', 0.0)
-            baseline_waste_hrs_pw = st.number_input("Productive Inefficiency (Hrs/Wk/Person)", value=default_hrs, min_value=0.0, max_value=float(weekly_productive_hours))
+            baseline_waste_hrs_pw = st.number_input("Productive Inefficiency (Hrs/Wk/Person)", key=widget_default("baseline_waste_hrs", default_hrs), min_value=0.0, max_value=float(weekly_productive_hours))
             baseline_waste_pct = baseline_waste_hrs_pw / max(weekly_productive_hours, 1)
         else:
             default_pct = st.session_state.get('manual_target_pct', 10.0)
-            baseline_waste_pct_input = st.slider("Inefficiency Percentage (%)", 0, 100, int(default_pct))
+            baseline_waste_pct_input = st.slider("Inefficiency Percentage (%)", 0, 100, key=widget_default("baseline_waste_pct", int(default_pct)))
             baseline_waste_pct = baseline_waste_pct_input / 100
         
-        improvement_target = st.slider("Target Efficiency Gain (%)", 1, 100, 100)
+        improvement_target = st.slider("Target Efficiency Gain (%)", 1, 100, key=widget_default("improvement_target", 100))
+        graph.set(baseline_waste_pct=baseline_waste_pct, improvement_target=improvement_target)
 
 # =================================================================
 # TAB 2: INVESTMENT & HORIZON (Baseline v4 Locked)
 # =================================================================
-with tab2:
+with tab2, rerun.span("tab2_inputs"):
     st.header("2. Investment & Time Horizon")
     c1, c2 = st.columns(2)
     with c1:
-        solution_name = st.text_input("Solution Name", value="Cognitive Merchandise Financial Planning (CMFP)", help="Specific solution or module name.")
+        solution_name = st.text_input("Solution Name", key=widget_default("solution_name", "Cognitive Merchandise Financial Planning (CMFP)"), help="Specific solution or module name.")
         
         if investment_strategy == "Pre-existing Solution Upgrade":
             curr_sub = currency_input("Current Annual Subscription ($)", 0, "Current legacy spend.", "curr_sub_state")
@@ -110,8 +209,22 @@ with tab2:
         
         st.divider()
         initial_setup = currency_input("Implementation Services Fees", 0, "Professional services costs.", "services_state")
-        analysis_years = st.slider("ROI Horizon (Years)", 2, 10, 5)
-        escalation_rate = st.slider("Annual Employee Salary Increases (%)", 0, 10, 3)
+        analysis_years = st.slider("ROI Horizon (Years)", 2, 10, key=widget_default("analysis_years", 5))
+        escalation_rate = st.slider("Annual Employee Salary Increases (%)", 0, 10, key=widget_default("escalation_rate", 3))
+        graph.set(y1_recurring=y1_recurring, steady_state_recurring=steady_state_recurring, initial_setup=initial_setup,
+                  analysis_years=analysis_years, escalation_rate=escalation_rate)
+
+        granularity = st.radio("Cash-Flow Granularity", ["Annual", *period_engine.PERIODS_PER_YEAR], horizontal=True, key="granularity", help="Monthly and Weekly model the adoption ramp after go-live, a later subscription start and per-period discounting, then roll up to the annual table. Savings start at go-live rather than being prorated over year 1, so NPV and Break Even can differ from Annual.")
+        ramp, ramp_months, ramp_steps, subscription_start_month = "Immediate", 0.0, 3, 0.0
+        if granularity != "Annual":
+            ramp = st.select_slider("Adoption Ramp", options=list(period_engine.RAMPS), key=widget_default("ramp", "S-Curve"), help="How savings build up to the full target after go-live.")
+            if ramp != "Immediate":
+                ramp_months = st.number_input("Ramp Length (Months)", min_value=0.0, max_value=36.0, step=1.0, key=widget_default("ramp_months", 6.0))
+            if ramp == "Stepped":
+                ramp_steps = st.number_input("Adoption Steps", min_value=1, max_value=12, key=widget_default("ramp_steps", 3))
+            subscription_start_month = st.number_input("Subscription Start (Month)", min_value=0.0, max_value=float(analysis_years * 12 - 1), step=1.0, key=widget_default("subscription_start_month", 0.0), help="Months after project start before subscription billing begins.")
+        graph.set(granularity=granularity, ramp=ramp, ramp_months=ramp_months, ramp_steps=ramp_steps,
+                  subscription_start_month=subscription_start_month)
 
     with c2:
         st.divider()
@@ -132,108 +245,124 @@ with tab2:
         impl_unit = st.radio("Implementation Duration Unit:", ["Weeks", "Months"], horizontal=True, key="unit_choice", on_change=convert_duration)
         max_dur = 52.0 if impl_unit == "Weeks" else 12.0
         impl_duration = st.number_input(f"Duration ({impl_unit})", key="dur_key", step=0.1, min_value=0.0, max_value=max_dur)
-        impl_factor = (max_dur - impl_duration)/max_dur
+        graph.set(impl_unit=impl_unit, impl_duration=impl_duration)
         
         st.subheader("Client Internal Team")
-        key_users = st.number_input("Number of Key Users Dedicated to the Project", value=5)
-        impl_intensity = st.select_slider("Intensity", options=["Low", "Medium", "High"], value="Medium")
-        intensity_map = {"Low": 250, "Medium": 500, "High": 750}
-        client_internal_investment = (key_users * intensity_map[impl_intensity] * hourly_rate_pp)
+        key_users = st.number_input("Number of Key Users Dedicated to the Project", step=1, key=widget_default("key_users", 5))
+        impl_intensity = st.select_slider("Intensity", options=["Low", "Medium", "High"], key=widget_default("impl_intensity", "Medium"))
+        graph.set(key_users=key_users, impl_intensity=impl_intensity)
+        client_internal_investment = graph["client_internal_investment"]
         st.info(f"Estimated Client Investment (Shadow Cost): ${client_internal_investment:,.0f}")
         
         wacc = st.slider(
             "Discount Rate / Weighted Average Cost of Capital (WACC) %", 
-            5, 15, 10, 
+            5, 15,
+            key=widget_default("wacc", 10),
             help="Weighted Average Cost of Capital hurdle rate."
         )
-
-    y1_investment_total = initial_setup + client_internal_investment + y1_recurring
+        graph.set(wacc=wacc)
 
 # =================================================================
 # TAB 3: ROI REPORT (Fixed Heatmap with Bold Intersect)
 # =================================================================
-with tab3:
+with tab3, rerun.span("tab3_report"):
+    # --- SCENARIO LIBRARY (saved deals reload their cash flows and report views from the store instead of recomputing) ---
+    with st.expander("💾 Scenario Library"), rerun.span("scenario_library"):
+        def save_scenario(name):
+            # Runs before the next rerun, so the graph and report_views still hold the report just shown
+            flows, risk_adj_npv = graph["report_flows"]
+            scenario_store.STORE.save(
+                name, {key: st.session_state[key] for key in SCENARIO_WIDGETS if key in st.session_state},
+                graph["flows_key"], flows, risk_adj_npv, total_tco=graph["total_tco"], fte_reclaimed=graph["fte_reclaimed"],
+                industry=industry, solution_name=solution_name,
+                views=dict(st.session_state.report_views, current_be=(graph["current_be_key"], graph["current_be"])),
+            )
+            st.session_state.library_message = f"Saved **{name}**."
+
+        def load_scenario(scenario_key):
+            saved = scenario_store.STORE.load(scenario_key)
+            st.session_state.update(saved["inputs"])
+            # A Monte Carlo profile saved with the deal is shown again without pressing Run Simulation
+            if "risk_profile" in saved["views"]:
+                st.session_state.risk_profile_run = saved["views"]["risk_profile"]
+            st.session_state.library_message = f"Loaded **{saved['name']}**."
+
+        if "library_message" in st.session_state:
+            st.success(st.session_state.pop("library_message"))
+
+        l1, l2, l3 = st.columns(3)
+        scenario_name = l1.text_input("Scenario Name", value=f"{industry} · {solution_name}")
+        l1.button("Save Current Scenario", on_click=save_scenario, args=(scenario_name,), disabled=annual_salary <= 0)
+        industry_filter = l2.multiselect("Industries", benchmark_data.DATASET.verticals())
+        npv_filter = l2.number_input("Risk-Adjusted NPV Above ($)", value=None, step=10_000.0, placeholder="Any")
+        breakeven_filter = l3.number_input("Breakeven Within (Years)", min_value=0.0, value=None, step=0.5, placeholder="Any")
+        name_filter = l3.text_input("Name Contains")
+
+        matches = scenario_store.STORE.search(industry_filter, npv_filter, breakeven_filter, name_filter)
+        if matches:
+            st.dataframe({
+                "Scenario": [m["name"] for m in matches],
+                "Industry": [m["industry"] for m in matches],
+                "Risk-Adjusted NPV": [f"${m['risk_adj_npv']:,.0f}" for m in matches],
+                "Break Even": [f"{m['breakeven_years']:.1f} Yrs" if m["breakeven_years"] else "Beyond Horizon" for m in matches],
+                "TOTAL TCO": [f"${m['total_tco']:,.0f}" for m in matches],
+            }, hide_index=True, use_container_width=True)
+            # Options are scenario keys; deals that share a name are told apart by when they were saved
+            labels = {m["scenario_key"]: f"{m['name']} · saved {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(m['saved_at']))}"
+                      for m in matches}
+            p1, p2 = st.columns(2)
+            chosen = p1.selectbox("Saved Scenario", list(labels), format_func=labels.get)
+            p1.button("Load Scenario", on_click=load_scenario, args=(chosen,))
+            compare_with = p2.selectbox("Compare With", ["—", *labels], format_func=lambda key: labels.get(key, key))
+            if compare_with != "—":
+                diff = scenario_store.STORE.diff(chosen, compare_with)
+                d1, d2 = p2.columns(2)
+                d1.metric("Δ Risk-Adjusted NPV", f"${diff['b']['risk_adj_npv'] - diff['a']['risk_adj_npv']:,.0f}")
+                d2.metric("Δ TOTAL TCO", f"${diff['b']['total_tco'] - diff['a']['total_tco']:,.0f}")
+                years = diff["years"]
+                st.dataframe({
+                    "Period": [f"Year {y}" for y in years["year"]],
+                    "Net Cash Flow (Saved)": [f"${v:,.0f}" for v in years["net_a"]],
+                    "Net Cash Flow (Compared)": [f"${v:,.0f}" for v in years["net_b"]],
+                    "Δ Net Cash Flow": [f"${v:,.0f}" for v in years["net_delta"]],
+                    "Δ Cumulative Cash Flow": [f"${v:,.0f}" for v in years["cumulative_delta"]],
+                }, hide_index=True, use_container_width=True)
+        else:
+            st.caption("No saved scenarios match these filters.")
+
     if annual_salary <= 0:
         st.warning("⚠️ Please provide an **Avg. Annual Salary** in Tab 1.")
+        instrumentation.finish_rerun(rerun, st.session_state, graph)
         st.stop()
 
     st.header("📈 ROI Report & Targeter")
     
-    def calc_npv_logic(eff_multiplier, current_wacc):
-        test_pct = final_calc_pct * eff_multiplier
-        c_savings = []
-        for yr in range(1, analysis_years + 1):
-            yr_rate = (burdened_cost_pp * ((1 + escalation_rate/100) ** (yr - 1))) / max(total_annual_hours_pp, 1)
-            yr_sav = (total_annual_hours_pp * test_pct * num_employees) * (improvement_target/100) * yr_rate
-            c_savings.append(yr_sav * impl_factor if yr == 1 else yr_sav)
-        c_invest = [-y1_investment_total] + ([-steady_state_recurring] * (analysis_years - 1))
-        return sum((c_savings[k] + c_invest[k]) / (1+(current_wacc/100))**(k+1) for k in range(analysis_years))
-
-    def get_be_years(in_waste_pct):
-        if in_waste_pct <= 0: return 0.0
-        s, i = [], []
-        for yr in range(1, analysis_years + 1):
-            yr_rate = (burdened_cost_pp * ((1 + escalation_rate/100) ** (yr - 1))) / max(total_annual_hours_pp, 1)
-            yr_sav = (total_annual_hours_pp * in_waste_pct * num_employees) * (improvement_target/100) * yr_rate
-            if yr == 1:
-                s.append(yr_sav * impl_factor)
-                i.append(-y1_investment_total)
-            else:
-                s.append(yr_sav)
-                i.append(-steady_state_recurring)
-        cum_cf = np.cumsum(np.array(s) + np.array(i))
-        for idx in range(len(cum_cf)):
-            if cum_cf[idx] >= 0:
-                if idx == 0: return y1_investment_total / s[0] if s[0] > 0 else 0
-                prev_cum = cum_cf[idx-1]
-                net_now = (s[idx] + i[idx])
-                return idx + (abs(prev_cum) / net_now) if net_now > 0 else idx
-        return 0.0
-
-    current_be = get_be_years(baseline_waste_pct)
-    target_mode = st.toggle("Enable Breakeven Period Target")
-    final_calc_pct = baseline_waste_pct
+    model_inputs = graph["model_inputs"]
+    current_be = graph["current_be"]
+    target_mode = st.toggle("Enable Breakeven Period Target", key="target_mode")
+    target_yrs = None
     
     if target_mode:
-        target_yrs = st.number_input("Target Years to Breakeven", min_value=1.1, value=float(round(current_be, 2)) if current_be > 0 else 3.7, step=0.1)
-        cumulative_investment = y1_investment_total + (steady_state_recurring * (target_yrs - 1))
-        weight_sum = 0
-        for yr in range(1, int(math.ceil(target_yrs)) + 1):
-            yr_rate = (burdened_cost_pp * ((1 + escalation_rate/100) ** (yr - 1))) / max(total_annual_hours_pp, 1)
-            yr_weight = total_annual_hours_pp * num_employees * (improvement_target/100) * yr_rate
-            if yr == 1: weight_sum += yr_weight * impl_factor
-            elif yr < target_yrs: weight_sum += yr_weight
-            else: weight_sum += yr_weight * (target_yrs - (yr - 1))
-        
-        final_calc_pct = cumulative_investment / max(weight_sum, 1)
+        target_yrs = st.number_input("Target Years to Breakeven", min_value=1.1, key=widget_default("target_yrs", float(round(current_be, 2)) if current_be > 0 else 3.7), step=0.1)
+    graph.set(target_mode=target_mode, target_yrs=target_yrs)
+    final_calc_pct = graph["final_calc_pct"]
+
+    if target_mode:
         target_hrs_pw_person = final_calc_pct * (daily_hours * 5)
         st.markdown(f'<div style="background-color:rgba(30,144,255,0.1); border-left:5px solid #1E90FF; padding:20px; border-radius:5px; margin-bottom:25px;"><span style="font-size:22px; font-weight:bold; color:#1E90FF;">Target identified: Address {target_hrs_pw_person:.2f} productive hours / week per person.</span></div>', unsafe_allow_html=True)
 
-    savings, investments = [], []
-    for yr in range(1, analysis_years + 1):
-        yr_hourly_rate = (burdened_cost_pp * ((1 + escalation_rate/100) ** (yr - 1))) / max(total_annual_hours_pp, 1)
-        yr_saving = (total_annual_hours_pp * final_calc_pct * num_employees) * (improvement_target/100) * yr_hourly_rate
-        if yr == 1:
-            savings.append(yr_saving * impl_factor)
-            investments.append(-y1_investment_total)
-        else:
-            savings.append(yr_saving)
-            investments.append(-steady_state_recurring)
-    
-    df = pd.DataFrame({"Period": [f"Year {i}" for i in range(1, analysis_years + 1)], "Investment": investments, "Gross Savings": savings})
-    df["Net Cash Flow"] = df["Investment"] + df["Gross Savings"]
-    df["Cumulative Cash Flow"] = df["Net Cash Flow"].cumsum()
-
-    final_be = get_be_years(final_calc_pct)
-    total_sub_cost = y1_recurring + (steady_state_recurring * (analysis_years - 1))
-    total_tco = total_sub_cost + initial_setup + client_internal_investment
-    annual_hrs = total_annual_hours_pp * final_calc_pct * (improvement_target/100) * num_employees
-    fte_reclaimed = math.floor((annual_hrs / max(total_annual_hours_pp, 1)) * 10) / 10.0
-    
-    expected_npv = calc_npv_logic(1.0, wacc)
-    downside_npv = calc_npv_logic(0.8, wacc)
-    upside_npv = calc_npv_logic(1.2, wacc)
-    risk_adj_npv = (expected_npv * 0.60) + (downside_npv * 0.25) + (upside_npv * 0.15)
+    with rerun.span("report_model"):
+        scenario_inputs = graph["scenario_inputs"]
+        report_key = graph["report_key"]
+        flows, risk_adj_npv = graph["report_flows"]
+        savings = flows.savings.tolist()
+        df = graph["cash_flow_table"]
+
+        final_be = float(flows.breakeven)
+        total_sub_cost = graph["total_sub_cost"]
+        total_tco = graph["total_tco"]
+        annual_hrs = graph["annual_hrs"]
+        fte_reclaimed = graph["fte_reclaimed"]
 
     st.subheader("Total Investment Summary (TCO)")
     i1, i2, i3, i4, i5, i6, i7, i8 = st.columns(8)
@@ -248,6 +377,111 @@ with tab3:
     i6.metric("TOTAL TCO", f"${total_tco:,.0f}")
     i7.metric("Break Even", f"{final_be:.1f} Yrs" if final_be > 0 else "Beyond Horizon")
     i8.metric("Risk-Adjusted NPV", f"${risk_adj_npv:,.0f}")
+    with st.expander("🎲 Monte Carlo Risk Profile (NPV Distribution)"), rerun.span("monte_carlo"):
+        mc_draws = st.select_slider("Simulation Draws", options=[10_000, 100_000, 1_000_000], value=100_000, help="Scenarios drawn across waste, efficiency, salary escalation, implementation duration and WACC.")
+        # The waste range takes the spread of the industry benchmark when it has one
+        waste_band = (leakage_band[10] / leakage_band[50], leakage_band[90] / leakage_band[50]) if leakage_band[90] > leakage_band[10] > 0 else (0.8, 1.2)
+        mc_ranges = risk_simulation.default_ranges(final_calc_pct, wacc, escalation_rate, impl_duration, max_dur, waste_band)
+        if leakage_band[90] > leakage_band[10] > 0:
+            st.caption(f"Waste varies with the {industry} benchmark P10–P90 band ({waste_band[0]:.0%}–{waste_band[1]:.0%} of the input).")
+
+        def simulate_risk_profile():
+            mc = risk_simulation.simulate(mc_ranges, max_dur, draws=mc_draws, seed=42, **model_inputs)
+            # Only the summary and the histogram are kept; the raw draws are dropped
+            return mc.percentiles, mc.prob_breakeven, risk_simulation.npv_histogram(mc.npv)
+
+        def build_risk_figure():
+            import plotly.graph_objects as go
+
+            bin_centers, bin_share = mc_histogram
+            fig_mc = go.Figure(go.Bar(x=bin_centers, y=bin_share * 100, marker_color='#1f77b4'))
+            fig_mc.add_vline(x=risk_adj_npv, line_dash="dash", line_color="gray", annotation_text="Risk-Adjusted NPV")
+            fig_mc.update_layout(xaxis_title="NPV ($)", yaxis_title="Share of Draws (%)", margin=dict(l=20, r=20, t=30, b=20), height=300, template="plotly_white")
+            return fig_mc
+
+        # Expander bodies run even when collapsed, so the simulation waits for the button
+        mc_key = dict(report_key, draws=mc_draws, ranges=mc_ranges, max_dur=max_dur)
+        if st.button("Run Simulation"):
+            st.session_state.risk_profile_run = result_cache.canonical_key("risk_profile", mc_key)
+        if st.session_state.get("risk_profile_run") not in (None, result_cache.canonical_key("risk_profile", mc_key)):
+            st.caption("Inputs changed since the last run; run the simulation again.")
+        elif st.session_state.get("risk_profile_run") is not None:
+            mc_percentiles, mc_prob_breakeven, mc_histogram = stored_view("risk_profile", mc_key, simulate_risk_profile)
+            fig_mc = result_cache.RESULTS.get_or_compute("risk_profile_figure", mc_key, build_risk_figure)
+            m1, m2, m3, m4 = st.columns(4)
+            m1.metric("P10 NPV (Downside)", f"${mc_percentiles[10]:,.0f}")
+            m2.metric("P50 NPV (Median)", f"${mc_percentiles[50]:,.0f}")
+            m3.metric("P90 NPV (Upside)", f"${mc_percentiles[90]:,.0f}")
+            m4.metric("Breakeven Within Horizon", f"{mc_prob_breakeven:.0%}")
+            st.plotly_chart(fig_mc, use_container_width=True)
+
+    # --- DEAL OPTIMIZER (several pricing and scope levers searched together under the deal constraints) ---
+    with st.expander("🧮 Deal Optimizer (Pricing & Scope)"), rerun.span("deal_optimizer"):
+        lever_labels = {"annual_subscription": "Annual Subscription ($)", "initial_setup": "Implementation Services ($)",
+                        "key_users": "Key Users", "impl_intensity": "Intensity"}
+        o1, o2, o3 = st.columns(3)
+        opt_objective = o1.selectbox("Maximize", list(deal_optimizer.OBJECTIVES), format_func=deal_optimizer.OBJECTIVES.get, key="opt_objective")
+        opt_breakeven = o2.number_input("Breakeven Within (Years)", min_value=0.5, max_value=float(analysis_years), step=0.5, key=widget_default("opt_breakeven", min(3.0, float(analysis_years))))
+        opt_min_npv = o3.number_input("Risk-Adjusted NPV At Least ($)", step=10_000.0, key=widget_default("opt_min_npv", 0.0))
+        opt_levers = st.multiselect("Levers", list(lever_labels), format_func=lever_labels.get, key=widget_default("opt_levers", list(lever_labels)))
+
+        opt_bounds = {}
+        bound_defaults = {"annual_subscription": max(3 * steady_state_recurring, 100_000.0), "initial_setup": max(3 * initial_setup, 100_000.0),
+                          "key_users": float(max(2 * key_users, 20))}
+        for lever in opt_levers:
+            b1, b2 = st.columns(2)
+            if lever == "impl_intensity":
+                opt_bounds[lever] = b1.multiselect("Intensity Levels", ["Low", "Medium", "High"], key=widget_default("opt_intensity", ["Low", "Medium", "High"])) or [impl_intensity]
+                continue
+            step = 1.0 if lever == "key_users" else 1_000.0
+            low = b1.number_input(f"{lever_labels[lever]} From", min_value=0.0, step=step, key=widget_default(f"opt_{lever}_low", 1.0 if lever == "key_users" else 0.0))
+            high = b2.number_input(f"{lever_labels[lever]} To", min_value=low, step=step, key=widget_default(f"opt_{lever}_high", bound_defaults[lever]))
+            opt_bounds[lever] = (low, high)
+
+        opt_key = dict(scenario_inputs, bounds=opt_bounds, objective=opt_objective, max_breakeven=opt_breakeven, min_risk_adj_npv=opt_min_npv)
+        if st.button("Run Optimizer", disabled=not opt_bounds):
+            st.session_state.optimizer_run = result_cache.canonical_key("deal_optimizer", opt_key)
+        if granularity != "Annual":
+            st.caption("The optimizer scores candidates with the annual cash-flow model.")
+
+        # Results stay on screen until an input changes
+        if st.session_state.get("optimizer_run") not in (None, result_cache.canonical_key("deal_optimizer", opt_key)):
+            st.caption("Inputs changed since the last run; run the optimizer again.")
+        elif st.session_state.get("optimizer_run") is not None:
+            optimum = result_cache.RESULTS.get_or_compute("deal_optimizer", opt_key, lambda: deal_optimizer.optimize(
+                opt_bounds, objective=opt_objective, max_breakeven=opt_breakeven, min_risk_adj_npv=opt_min_npv, **scenario_inputs))
+            if optimum.best is None:
+                st.warning(f"No feasible deal among {optimum.evaluated:,} candidates. Widen the lever ranges or relax the constraints.")
+            else:
+                best = optimum.best
+                p1, p2, p3, p4 = st.columns(4)
+                p1.metric(deal_optimizer.OBJECTIVES[opt_objective], f"${best['objective']:,.0f}")
+                p2.metric("Risk-Adjusted NPV", f"${best['risk_adj_npv']:,.0f}")
+                p3.metric("Break Even", f"{best['breakeven_years']:.1f} Yrs")
+                p4.metric("TOTAL TCO", f"${best['total_tco']:,.0f}")
+                st.caption(f"Best of {optimum.feasible:,} feasible candidates ({optimum.evaluated:,} scored): " + " · ".join(
+                    f"{lever_labels[lever]} {best[lever] if lever == 'impl_intensity' else f'{best[lever]:,.0f}'}" for lever in opt_bounds))
+
+                def apply_optimum():
+                    money = {"annual_subscription": "future_sub_state" if investment_strategy == "Pre-existing Solution Upgrade" else "saas_state",
+                             "initial_setup": "services_state"}
+                    for lever in opt_bounds:
+                        if lever in money:
+                            st.session_state[money[lever]] = f"{int(round(best[lever])):,}"
+                        else:
+                            st.session_state[lever] = int(best[lever]) if lever == "key_users" else best[lever]
+
+                st.button("Apply Best Deal to Inputs", on_click=apply_optimum)
+
+                def build_frontier_chart():
+                    import plotly.graph_objects as go
+
+                    fig_frontier = go.Figure(go.Scatter(x=optimum.frontier["objective"], y=optimum.frontier["risk_adj_npv"], mode="markers+lines", marker_color="#1f77b4"))
+                    fig_frontier.update_layout(xaxis_title=deal_optimizer.OBJECTIVES[opt_objective], yaxis_title="Risk-Adjusted NPV ($)", margin=dict(l=20, r=20, t=30, b=20), height=300, template="plotly_white")
+                    return fig_frontier
+
+                st.markdown("**Feasible Frontier** (no other feasible deal is better on both axes)")
+                st.plotly_chart(result_cache.RESULTS.get_or_compute("optimizer_frontier", opt_key, build_frontier_chart), use_container_width=True)
     st.divider()
 
     st.subheader("Efficiency & Value Realization")
@@ -259,83 +493,142 @@ with tab3:
     st.divider()
 
     st.subheader("🏛️ Strategic Analysis: Board-Level Overview")
-    npv_status = "POSITIVE" if risk_adj_npv > 0 else "NEGATIVE"
-    recommendation = "STRATEGICALLY VIABLE" if risk_adj_npv > 0 else "REQUIRES OPTIMIZATION"
-
-    if risk_adj_npv < 0:
-        viability_text = f"This {npv_status} Risk-Adjusted Net Present Value indicates that the current scope of automation must be either expanded to recover more latent waste or costs must be aligned with yield."
-    else:
-        viability_text = f"This {npv_status} Risk-Adjusted Net Present Value signifies that the productivity dividends, when discounted and risk-weighted, outperform the total investment cost."
-
-    industry_impact = {
-        "Retail": "improved operational resilience and decision velocity in omni-channel environments.",
-        "Logistics Service Providers (LSP)": "increased throughput capacity and asset utilization in lean-margin environments.",
-        "Manufacturing": "enhanced production synchronization and reduced lead-time volatility."
-    }
-
-    financial_viability = f'<div style="background-color:rgba(128,128,128,0.05); border-left:4px solid #1f77b4; padding:20px; border-radius:8px; margin-bottom:20px;"><div style="color:{"#2E7D32" if risk_adj_npv > 0 else "#D32F2F"}; margin-bottom:10px;"><b>{"✅" if risk_adj_npv > 0 else "⚠️"} Financial Viability: {npv_status} RISK-ADJUSTED NPV</b><br>The investment yields a <b>Risk-Adjusted NPV of ${risk_adj_npv:,.0f}</b>, confirming that the project is <b>{recommendation}</b>.</div> {viability_text} This pro-active weighting ensures that our business case remains defensible even under conservative implementation outcomes.</div>'
-
-    summary_html = (
-        f'<div style="border:1px solid rgba(128,128,128,0.3); padding:30px; border-radius:10px; font-family:\'Segoe UI\',sans-serif; line-height:1.8;">'
-        f'<div style="margin-bottom:20px;"><b style="text-transform:uppercase;">Strategic Project Overview</b><br>'
-        f'This initiative targets a TCO of <b>${total_tco:,.0f}</b> over a <b>{analysis_years}-year horizon</b>. Beyond a simple software deployment, this represents a transition to a <b>Cognitive solution</b> powered by <b>Blue Yonder\'s {solution_name}</b>. By embedding AI and ML into daily workflows, the organization shifts from reactive manual planning to <b>_autonomous "exception-only" management_</b>.</div>'
-        f'<div style="margin-bottom:20px;"><b style="text-transform:uppercase;">Capacity Realization (Shadow Capacity)</b><br>'
-        f'The implementation reclaims <b>{annual_hrs:,.0f} productive hours annually</b>: the financial and operational equivalent of adding <b>{fte_reclaimed} staff members</b>. This "Shadow Capacity" acts as a <b>Volume Multiplier</b>, directly enabling {industry_impact[industry]}</div>'
-        f'<hr style="border:0; border-top:1px solid rgba(128,128,128,0.3); margin:25px 0;">{financial_viability}</div>'
-    )
+    summary_html = report_export.board_overview_html(total_tco, analysis_years, solution_name, annual_hrs, fte_reclaimed, report_export.industry_impact(industry), risk_adj_npv)
     st.markdown(summary_html, unsafe_allow_html=True)
 
+    # --- BOARD REPORT EXPORT (rendered by a background worker pool; unchanged charts are reused) ---
+    with st.expander("📤 Export Board Report"), rerun.span("report_export"):
+        e1, e2 = st.columns(2)
+        export_scope = e1.radio("Report Scope", ["This Deal", "Pipeline File"], horizontal=True, key="export_scope")
+        pipeline_file = e2.file_uploader("Pipeline (CSV)", type="csv", help="One row per deal: " + ", ".join(roi_engine.DEFAULT_INPUTS) + ", plus optional name, industry and solution_name columns.") if export_scope == "Pipeline File" else None
+        if st.button("Generate Report", disabled=export_scope == "Pipeline File" and pipeline_file is None):
+            if export_scope == "This Deal":
+                deals = [dict(inputs=scenario_inputs, title=f"{industry} · {solution_name}", solution_name=solution_name,
+                              industry=industry, flows=flows, risk_adj_npv=risk_adj_npv)]
+                report_title = f"Business Case: {solution_name}"
+            else:
+                import pandas as pd
+
+                deals = report_export.deals_from_frame(pd.read_csv(pipeline_file))
+                report_title = f"Portfolio Business Case ({len(deals):,} Deals)"
+            st.session_state.report_export = report_export.EXPORTER.submit(deals, report_title)
+
+        export_job = st.session_state.get("report_export")
+        export_pending = export_job is not None and not export_job.done()
+
+        # Polls the background job while it runs, without rerunning the whole report
+        @st.fragment(run_every=1.0 if export_pending else None)
+        def export_status():
+            if export_job is None:
+                return
+            if not export_job.done():
+                st.info("⏳ Rendering the report in the background. Charts already rendered for these inputs are reused.")
+                return
+            if export_pending:
+                st.rerun()  # Stops the polling
+            if export_job.exception() is not None:
+                st.error(f"Export failed: {export_job.exception()}")
+                return
+            result = export_job.result()
+            st.caption(f"{result['deals']:,} deal(s) in {result['seconds']:.1f}s · {result['charts_rendered']:,} charts rendered, {result['charts_reused']:,} reused from cache. Print to PDF from the browser.")
+            st.download_button("Download Report (HTML)", result["html"], file_name="board_report.html", mime="text/html")
+
+        export_status()
+
     # --- SENSITIVITY HEATMAP (Logic-Based Text Bolding) ---
     st.subheader("🎯 Sensitivity Analysis: NPV Variance")
-    with st.expander("📊 View NPV Sensitivity Matrix (Efficiency vs. WACC)"):
-        eff_variants = [0.8, 0.9, 1.0, 1.1, 1.2] 
-        wacc_variants = [wacc-4, wacc-2, wacc, wacc+2, wacc+4]
-        matrix_data = []
-        text_data = [] # Array to store the formatted labels
+    with st.expander("📊 View NPV Sensitivity Matrix"), rerun.span("sensitivity_heatmap"):
+        axis_names = list(sensitivity.AXES)
+        s1, s2, s3 = st.columns(3)
+        y_axis = s1.selectbox("Rows", axis_names, index=axis_names.index("efficiency"), format_func=sensitivity.AXES.get)
+        x_options = [a for a in axis_names if a != y_axis]
+        x_axis = s2.selectbox("Columns", x_options, index=x_options.index("wacc") if "wacc" in x_options else 0, format_func=sensitivity.AXES.get)
+        grid_steps = s3.select_slider("Grid Resolution", options=[5, 10, 25, 50, 100, 250, 500], value=5)
         base_hrs_reclaimed = final_calc_pct * (daily_hours * 5)
 
-        for e_var in eff_variants:
-            row_vals = []
-            row_text = []
-            for w_var in wacc_variants:
-                val = calc_npv_logic(e_var, w_var)
-                row_vals.append(val)
-                
-                # Format the number as 'k' or 'M'
-                if abs(val) >= 1_000_000:
-                    display_text = f"{val/1_000_000:.1f}M"
-                else:
-                    display_text = f"{val/1_000:.0f}k"
-                
-                # FEATURE: Bold and Annotate the Golden Intersect (100% Efficiency + Selected WACC)
-                if round(e_var, 1) == 1.0 and w_var == wacc:
-                    row_text.append(f"🎯 <b>{display_text}</b>")
-                else:
-                    row_text.append(display_text)
-            
-            matrix_data.append(row_vals)
-            text_data.append(row_text)
-
-        y_labels = [f"{int(ev*100)}% ({base_hrs_reclaimed * ev:.1f} hrs)" for ev in eff_variants]
-        x_labels = [f"{w}%" for w in wacc_variants]
-
-        fig_heat = px.imshow(
-            matrix_data,
-            labels=dict(x="WACC (%)", y="Efficiency Achievement (%)", color="NPV ($)"),
-            x=x_labels, y=y_labels,
-            color_continuous_scale="RdYlGn",
-            aspect="auto"
-        )
-        
-        # Apply the bold/annotated text labels directly to the heatmap
-        fig_heat.update_traces(
-            text=text_data,
-            texttemplate="%{text}",
-            textfont=dict(size=14)
-        )
+        def sensitivity_label(name, value):
+            if name == "efficiency":
+                return f"{round(value*100)}% ({base_hrs_reclaimed * value:.1f} hrs)"
+            if name in ("wacc", "escalation_rate"):
+                return f"{round(value, 2):g}%"
+            if name == "impl_duration":
+                return f"{value:.1f} {impl_unit}"
+            if name == "num_employees":
+                return f"{value:,.0f}"
+            return f"${value:,.0f}"
+
+        def build_heatmap():
+            import plotly.express as px  # only the sensitivity expander needs plotly.express
+
+            # The full grid is binned for the browser
+            matrix_data, y_values, x_values = sensitivity.downsample(heat_matrix, heat_y_values, heat_x_values, max_bins=100)
+
+            y_labels = [sensitivity_label(y_axis, v) for v in y_values]
+            x_labels = [sensitivity_label(x_axis, v) for v in x_values]
+
+            fig_heat = px.imshow(
+                matrix_data,
+                labels=dict(x=sensitivity.AXES[x_axis], y=sensitivity.AXES[y_axis], color="NPV ($)"),
+                x=x_labels, y=y_labels,
+                color_continuous_scale="RdYlGn",
+                aspect="auto"
+            )
+
+            if matrix_data.size <= 15 * 15:
+                base_y = 1.0 if y_axis == "efficiency" else scenario_inputs[y_axis]
+                base_x = 1.0 if x_axis == "efficiency" else scenario_inputs[x_axis]
+                text_data = [] # Array to store the formatted labels
+                for y_var, row_vals in zip(y_values, matrix_data):
+                    row_text = []
+                    for x_var, val in zip(x_values, row_vals):
+                        # Format the number as 'k' or 'M'
+                        if abs(val) >= 1_000_000:
+                            display_text = f"{val/1_000_000:.1f}M"
+                        else:
+                            display_text = f"{val/1_000:.0f}k"
+
+                        # FEATURE: Bold and Annotate the Golden Intersect (current inputs on both axes)
+                        if np.isclose(y_var, base_y) and np.isclose(x_var, base_x):
+                            row_text.append(f"🎯 <b>{display_text}</b>")
+                        else:
+                            row_text.append(display_text)
+                    text_data.append(row_text)
+
+                # Apply the bold/annotated text labels directly to the heatmap
+                fig_heat.update_traces(
+                    text=text_data,
+                    texttemplate="%{text}",
+                    textfont=dict(size=14)
+                )
+
+            return fig_heat
 
+        heat_key = dict(scenario_inputs, y_axis=y_axis, x_axis=x_axis, grid_steps=grid_steps)
+        # One broadcasted pass over the full grid
+        heat_y_values = sensitivity.axis_values(y_axis, scenario_inputs, grid_steps)
+        heat_x_values = sensitivity.axis_values(x_axis, scenario_inputs, grid_steps)
+        heat_matrix = stored_view("sensitivity_matrix", heat_key, lambda: sensitivity.npv_grid(
+            scenario_inputs, y_axis, heat_y_values, x_axis, heat_x_values))
+        fig_heat = result_cache.RESULTS.get_or_compute("sensitivity_figure", heat_key, build_heatmap)
         st.plotly_chart(fig_heat, use_container_width=True)
 
+    with st.expander("🌪️ View NPV Tornado (One-at-a-Time Sensitivity)"), rerun.span("tornado"):
+        def build_tornado():
+            import plotly.graph_objects as go
+
+            base_npv, tornado_bars = tornado_data
+            bar_labels = [sensitivity.AXES[name] for name, _, _ in tornado_bars]
+            fig_tornado = go.Figure()
+            fig_tornado.add_trace(go.Bar(y=bar_labels, x=[low - base_npv for _, low, _ in tornado_bars], base=base_npv, orientation='h', name="Low Input", marker_color='#d62728'))
+            fig_tornado.add_trace(go.Bar(y=bar_labels, x=[high - base_npv for _, _, high in tornado_bars], base=base_npv, orientation='h', name="High Input", marker_color='#2ca02c'))
+            fig_tornado.add_vline(x=base_npv, line_dash="dash", line_color="gray")
+            fig_tornado.update_layout(barmode="overlay", xaxis_title="NPV ($)", yaxis=dict(autorange="reversed"), margin=dict(l=20, r=20, t=30, b=20), height=350, template="plotly_white")
+            return fig_tornado
+
+        tornado_data = stored_view("tornado", scenario_inputs, lambda: sensitivity.tornado(scenario_inputs))
+        fig_tornado = result_cache.RESULTS.get_or_compute("tornado_figure", scenario_inputs, build_tornado)
+        st.plotly_chart(fig_tornado, use_container_width=True)
+
     with st.expander("📝 Professional Glossary & Blue Yonder Strategic Alignment"):
         st.write("**Net Present Value (NPV) Analysis:** NPV calculates the total excess value generated by an investment after accounting for the time value of money and the cost of capital.")
         st.info("""
@@ -346,11 +639,22 @@ with tab3:
         """)
     
     chart_view = st.radio("Chart View:", ["Cumulative ROI", "Annual Net ROI"], horizontal=True)
-    fig = go.Figure()
-    if chart_view == "Cumulative ROI":
-        fig.add_trace(go.Scatter(x=df["Period"], y=df["Cumulative Cash Flow"], mode='markers+lines', line=dict(color='#1f77b4', width=4), fill='tozeroy'))
-    else:
-        fig.add_trace(go.Bar(x=df["Period"], y=df["Net Cash Flow"], marker_color='#1f77b4'))
-    fig.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.3)
-    st.plotly_chart(fig, use_container_width=True)
-    st.dataframe(df.style.format({"Investment": "${:,.0f}", "Gross Savings": "${:,.0f}", "Net Cash Flow": "${:,.0f}", "Cumulative Cash Flow": "${:,.0f}"}), hide_index=True, use_container_width=True)
\ No newline at end of file
+
+    def build_roi_chart():
+        import plotly.graph_objects as go
+
+        fig = go.Figure()
+        if chart_view == "Cumulative ROI":
+            fig.add_trace(go.Scatter(x=df["Period"], y=df["Cumulative Cash Flow"], mode='markers+lines', line=dict(color='#1f77b4', width=4), fill='tozeroy'))
+        else:
+            fig.add_trace(go.Bar(x=df["Period"], y=df["Net Cash Flow"], marker_color='#1f77b4'))
+        fig.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.3)
+        return fig
+
+    with rerun.span("roi_chart"):
+        fig = result_cache.RESULTS.get_or_compute("roi_chart", dict(report_key, chart_view=chart_view), build_roi_chart)
+        st.plotly_chart(fig, use_container_width=True)
+    with rerun.span("cash_flow_table"):
+        st.dataframe(df.style.format({"Investment": "${:,.0f}", "Gross Savings": "${:,.0f}", "Net Cash Flow": "${:,.0f}", "Cumulative Cash Flow": "${:,.0f}"}), hide_index=True, use_container_width=True)
+
+instrumentation.finish_rerun(rerun, st.session_state, graph)
\ No newline at end of file
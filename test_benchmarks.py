@@ -0,0 +1,12 @@
+import benchmarks
+
+
+def _results(**medians):
+    return {"results": {name: {"median_s": median} for name, median in medians.items()}}
+
+
+def test_compare_flags_slow_and_missing_cases():
+    rows = benchmarks.compare(_results(fast=1.0, slow=1.0, gone=1.0), _results(fast=1.1, slow=1.5, added=1.0), 0.2)
+
+    assert [(name, failed) for name, *_, failed in rows] == [("fast", False), ("slow", True), ("gone", True)]
+    assert rows[2][2:4] == (None, None)
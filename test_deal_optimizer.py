@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+import deal_optimizer
+import roi_engine
+
+DEAL = {**roi_engine.DEFAULT_INPUTS, "num_employees": 40, "annual_salary": 100_000,
+        "annual_subscription": 50_000, "initial_setup": 20_000}
+BOUNDS = {"annual_subscription": (0, 500_000), "initial_setup": (0, 200_000), "key_users": (1, 20),
+          "impl_intensity": list(roi_engine.INTENSITY_HOURS)}
+
+
+def test_best_deal_meets_constraints():
+    result = deal_optimizer.optimize(BOUNDS, max_breakeven=3, min_risk_adj_npv=100_000, steps=11, **DEAL)
+
+    best = result.best
+    metrics = roi_engine.deal_metrics(**{**DEAL, **{lever: best[lever] for lever in BOUNDS}})
+    assert 0 < float(metrics["breakeven_years"]) <= 3
+    assert float(metrics["risk_adj_npv"]) >= 100_000
+    assert best["objective"] == best["annual_subscription"] == result.frontier["objective"].max()
+    for lever, bound in BOUNDS.items():
+        assert best[lever] in bound if lever == "impl_intensity" else bound[0] <= best[lever] <= bound[1]
+
+
+def test_frontier_is_feasible_and_non_dominated():
+    frontier = deal_optimizer.optimize(BOUNDS, max_breakeven=3, steps=11, **DEAL).frontier
+
+    assert (frontier["breakeven_years"] > 0).all() and (frontier["breakeven_years"] <= 3).all()
+    assert (frontier["risk_adj_npv"] >= 0).all()
+    assert (np.diff(frontier["objective"]) <= 0).all()
+    assert (np.diff(frontier["risk_adj_npv"]) > 0).all()
+
+
+def test_infeasible_constraints_have_no_best_deal():
+    result = deal_optimizer.optimize(BOUNDS, max_breakeven=0.01, steps=5, **DEAL)
+
+    assert result.best is None
+    assert result.feasible == 0
+
+
+def test_unknown_lever_is_rejected():
+    with pytest.raises(ValueError):
+        deal_optimizer.optimize({"wacc": (5, 15)}, **DEAL)
+
+
+def test_overlapping_refinement_rounds_count_each_candidate_once():
+    # Round 1 scores 0, 50 and 100; round 2 refines to 50, 75 and 100
+    result = deal_optimizer.optimize({"annual_subscription": (0, 100)}, min_risk_adj_npv=None, steps=3, refinements=1, **DEAL)
+
+    assert result.evaluated == 6
+    assert result.feasible == 4
+
+
+def test_pipeline_blank_bounds_use_global_bounds():
+    pd = pytest.importorskip("pandas")
+    deals = pd.DataFrame({"num_employees": [40, 40], "annual_salary": [100_000, 100_000],
+                          "annual_subscription_high": [100_000, None]})
+
+    optimized = deal_optimizer.optimize_pipeline(deals, {"annual_subscription": (0, 500_000)}, workers=1, steps=11)
+
+    assert optimized["optimal_annual_subscription"][0] <= 100_000
+    assert optimized["optimal_annual_subscription"][1] > 100_000
@@ -0,0 +1,15 @@
+import subprocess
+import sys
+
+# Model modules shared by the apps, the CLIs and the service; none may load the UI stack.
+ENGINE_MODULES = ("roi_engine", "calculator_model", "risk_simulation", "goal_seek", "sensitivity", "result_cache",
+                  "model_graph", "period_engine", "scenario_store", "benchmark_data", "report_export", "deal_optimizer")
+UI_MODULES = ("streamlit", "plotly")
+
+
+def test_engine_modules_do_not_import_ui_packages():
+    # A fresh interpreter, since other tests may already have loaded Streamlit
+    check = (f"import sys\nimport {', '.join(ENGINE_MODULES)}\n"
+             f"print(sorted({{m.split('.')[0] for m in sys.modules}} & {set(UI_MODULES)!r}))")
+    proc = subprocess.run([sys.executable, "-c", check], capture_output=True, text=True, check=True)
+    assert proc.stdout.strip() == "[]"
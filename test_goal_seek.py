@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import goal_seek
+import roi_engine
+
+DEAL = {**roi_engine.DEFAULT_INPUTS, "num_employees": 40, "annual_salary": 100_000,
+        "annual_subscription": 50_000, "initial_setup": 20_000}
+TARGETS = {"breakeven": 2.5, "npv": 250_000.0, "irr": 40.0}
+
+
+def _achieved(target, inputs):
+    flows, derived = roi_engine.evaluate_inputs(**inputs)
+    if target == "breakeven":
+        return float(flows.breakeven)
+    if target == "npv":
+        return float(flows.npv)
+    return float(goal_seek.irr(flows.net, derived["analysis_years"]))
+
+
+@pytest.mark.parametrize("lever", [*goal_seek.AFFINE_LEVERS, "annual_salary"])
+@pytest.mark.parametrize("target", sorted(TARGETS))
+def test_solved_lever_hits_target(lever, target):
+    value = TARGETS[target]
+    solved = float(goal_seek.solve(lever, target, value, **DEAL))
+
+    assert np.isfinite(solved)
+    assert _achieved(target, {**DEAL, lever: solved}) == pytest.approx(value, rel=1e-6, abs=1e-6)
+
+
+def test_solve_frame_uses_per_deal_targets_and_defaults():
+    deals = pd.DataFrame({
+        "num_employees": [40, 100],
+        "annual_salary": [100_000, 80_000],
+        "initial_setup": [20_000, None],
+        "target_value": [3.0, None],
+    })
+
+    solved = goal_seek.solve_frame(deals, "annual_subscription", "breakeven", value=2.0)
+
+    assert solved["achieved_breakeven"].tolist() == pytest.approx([3.0, 2.0])
+    second = {**roi_engine.DEFAULT_INPUTS, "num_employees": 100, "annual_salary": 80_000}
+    assert solved["solved_annual_subscription"][1] == pytest.approx(
+        float(goal_seek.solve("annual_subscription", "breakeven", 2.0, **second)))
@@ -0,0 +1,57 @@
+import model_graph
+
+
+def _graph():
+    graph = model_graph.ModelGraph()
+
+    @graph.node
+    def total(a, b):
+        return a + b
+
+    @graph.node
+    def doubled(total):
+        return total * 2
+
+    @graph.node
+    def scaled(c):
+        return c * 10
+
+    graph.set(a=1, b=2, c=3)
+    return graph
+
+
+def _recomputed(graph, *names):
+    graph.begin_run()
+    values = [graph[name] for name in names]
+    return values, [name for name, _ in graph.recomputed]
+
+
+def test_only_downstream_nodes_recompute():
+    graph = _graph()
+    assert _recomputed(graph, "doubled", "scaled") == ([6, 30], ["total", "doubled", "scaled"])
+
+    graph.set(a=5)
+
+    assert _recomputed(graph, "doubled", "scaled") == ([14, 30], ["total", "doubled"])
+
+
+def test_setting_an_unchanged_input_keeps_cached_nodes():
+    graph = _graph()
+    _recomputed(graph, "doubled", "scaled")
+
+    graph.set(a=1, c=3)
+
+    assert _recomputed(graph, "doubled", "scaled") == ([6, 30], [])
+
+
+def test_report_graph_discount_rate_leaves_inputs_alone():
+    graph = model_graph.build_model_graph()
+    graph.set(num_employees=40, annual_salary=100_000, fringe_rate=25, work_days=240, daily_hours=8,
+              baseline_waste_pct=0.1, improvement_target=50, y1_recurring=50_000, steady_state_recurring=50_000,
+              initial_setup=20_000, analysis_years=5, escalation_rate=3, impl_duration=0, impl_unit="Weeks",
+              key_users=5, impl_intensity="Medium", wacc=10, target_mode=False, target_yrs=None)
+    graph["scenario_inputs"]
+
+    graph.set(wacc=12)
+
+    assert _recomputed(graph, "scenario_inputs") == ([dict(graph["lever_inputs"], waste_pct=10.0, wacc=12)], ["scenario_inputs"])
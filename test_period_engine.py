@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+import period_engine
+import roi_engine
+
+DEALS = [
+    {"num_employees": 40, "annual_salary": 100_000, "annual_subscription": 50_000, "initial_setup": 20_000},
+    {"num_employees": 12, "annual_salary": 80_000, "current_subscription": 30_000, "annual_subscription": 90_000,
+     "analysis_years": 3, "impl_duration": 20, "escalation_rate": 5},
+    {"num_employees": 5, "annual_salary": 40_000, "waste_pct": 1, "annual_subscription": 400_000},
+]
+
+
+@pytest.mark.parametrize("deal", DEALS)
+def test_one_period_per_year_matches_annual_engine(deal):
+    derived = roi_engine.derive_inputs(**{**roi_engine.DEFAULT_INPUTS, **deal})
+    model = roi_engine.engine_inputs(derived)
+
+    annual = roi_engine.evaluate(**model)
+    periods = period_engine.evaluate(y1_recurring=derived["y1_recurring"], periods_per_year=1, **model)
+
+    np.testing.assert_allclose(periods.savings, annual.savings)
+    np.testing.assert_allclose(periods.investments, annual.investments)
+    assert periods.npv == pytest.approx(annual.npv)
+    assert periods.breakeven == pytest.approx(annual.breakeven)
+    assert period_engine.risk_adjusted_npv(y1_recurring=derived["y1_recurring"], periods_per_year=1, **model) == \
+        pytest.approx(roi_engine.risk_adjusted_npv(**model))
+
+
+def test_monthly_roll_up_keeps_annual_totals():
+    derived = roi_engine.derive_inputs(**{**roi_engine.DEFAULT_INPUTS, **DEALS[0]})
+    model = roi_engine.engine_inputs(derived)
+
+    monthly = period_engine.roll_up(period_engine.evaluate(y1_recurring=derived["y1_recurring"], **model))
+
+    np.testing.assert_allclose(monthly.savings, roi_engine.evaluate(**model).savings)
+    np.testing.assert_allclose(monthly.investments, roi_engine.evaluate(**model).investments)
@@ -0,0 +1,41 @@
+import pandas as pd
+import pyarrow.parquet as pq
+
+import portfolio_batch
+
+
+def test_blank_cell_in_later_chunk_keeps_schema(tmp_path):
+    deals = pd.DataFrame({
+        "num_employees": [100, 200, 300, 400],
+        "annual_salary": [80_000, 90_000, 100_000, 110_000],
+        "waste_pct": [10, 12, 15, 20],
+        "key_users": ["5", "8", "", "12"],
+    })
+    source, output = tmp_path / "pipeline.csv", tmp_path / "scored.parquet"
+    deals.to_csv(source, index=False)
+
+    written = portfolio_batch.run_batch(str(source), str(output), workers=1, chunk_rows=2)
+
+    scored = pq.read_table(output).to_pandas()
+    assert written == len(scored) == 4
+    assert scored["key_users"].isna().sum() == 1
+    assert scored["risk_adj_npv"].notna().all()
+
+
+def test_bad_text_input_fails_only_its_row(tmp_path):
+    deals = pd.DataFrame({
+        "num_employees": [100, 200, 300],
+        "annual_salary": [80_000, 90_000, 100_000],
+        "waste_pct": [10, 12, 15],
+        "impl_intensity": ["Low", "Extreme", "High"],
+    })
+    source, output = tmp_path / "pipeline.parquet", tmp_path / "scored.parquet"
+    deals.to_parquet(source, index=False)
+
+    assert portfolio_batch.run_batch(str(source), str(output), workers=1, chunk_rows=2) == 3
+
+    scored = pq.read_table(output).to_pandas()
+    assert scored["num_employees"].dtype == "float64"
+    assert scored["risk_adj_npv"].isna().tolist() == [False, True, False]
+    assert scored["error"].isna().tolist() == [True, False, True]
+    assert "impl_intensity" in scored["error"][1]
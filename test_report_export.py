@@ -0,0 +1,36 @@
+import os
+
+import report_export
+import result_cache
+
+
+def _chart(directory, name):
+    return directory / f"{name}-{result_cache.canonical_key(name, {'n': name})}.svg"
+
+
+def _render(cache, name, svg=None):
+    return cache.get_or_render(name, {"n": name}, lambda: svg or name)
+
+
+def test_least_recently_used_charts_are_pruned_past_the_cap(tmp_path):
+    cache = report_export.ChartCache(str(tmp_path), max_files=2, max_age_seconds=float("inf"))
+    for name, last_used in (("a", 100), ("b", 200)):
+        _render(cache, name)
+        os.utime(_chart(tmp_path, name), (last_used, last_used))
+    _render(cache, "a", "recomputed")
+
+    _render(cache, "c")
+
+    assert sorted(os.listdir(tmp_path)) == sorted(_chart(tmp_path, name).name for name in ("a", "c"))
+    assert cache.pruned == 1
+
+
+def test_charts_unused_past_the_max_age_are_pruned(tmp_path):
+    cache = report_export.ChartCache(str(tmp_path), max_age_seconds=60)
+    _render(cache, "a")
+    os.utime(_chart(tmp_path, "a"), (0, 0))
+
+    _render(cache, "b")
+
+    assert os.listdir(tmp_path) == [_chart(tmp_path, "b").name]
+    assert _render(cache, "a", "recomputed") == "recomputed"
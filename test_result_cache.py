@@ -0,0 +1,45 @@
+import result_cache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(result_cache.time, "monotonic", clock)
+    cache = result_cache.ResultCache(ttl_seconds=60)
+    calls = []
+
+    def compute():
+        calls.append(clock.now)
+        return len(calls)
+
+    assert cache.get_or_compute("ns", {"a": 1}, compute) == 1
+    clock.now += 59
+    assert cache.get_or_compute("ns", {"a": 1}, compute) == 1
+    clock.now += 2
+    assert cache.get_or_compute("ns", {"a": 1}, compute) == 2
+    assert cache.stats()["hits"] == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = result_cache.ResultCache(max_entries=2)
+    cache.get_or_compute("ns", {"a": 1}, lambda: "a")
+    cache.get_or_compute("ns", {"b": 1}, lambda: "b")
+    cache.get_or_compute("ns", {"a": 1}, lambda: "recomputed")
+
+    cache.get_or_compute("ns", {"c": 1}, lambda: "c")
+
+    assert cache.get_or_compute("ns", {"a": 1}, lambda: "recomputed") == "a"
+    assert cache.get_or_compute("ns", {"b": 1}, lambda: "recomputed") == "recomputed"
+    assert cache.stats()["evictions"] == 2
+
+
+def test_key_ignores_dict_order_but_not_namespace():
+    assert result_cache.canonical_key("ns", {"a": 1, "b": 2}) == result_cache.canonical_key("ns", {"b": 2, "a": 1})
+    assert result_cache.canonical_key("ns", {"a": 1}) != result_cache.canonical_key("other", {"a": 1})
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+import roi_engine
+
+DEALS = [
+    {"num_employees": 40, "annual_salary": 100_000, "annual_subscription": 50_000, "initial_setup": 20_000},
+    {"num_employees": 500, "annual_salary": 65_000, "waste_pct": 4, "escalation_rate": 6, "analysis_years": 10,
+     "impl_unit": "Months", "impl_duration": 5, "impl_intensity": "High", "wacc": 14},
+    {"num_employees": 12, "annual_salary": 80_000, "current_subscription": 30_000, "annual_subscription": 90_000,
+     "analysis_years": 3, "impl_duration": 20},
+    {"num_employees": 5, "annual_salary": 40_000, "waste_pct": 1, "annual_subscription": 400_000},
+    {"num_employees": 40, "annual_salary": 100_000, "waste_pct": 0},
+]
+
+
+def _baseline(burdened_cost_pp, total_annual_hours_pp, waste_pct, num_employees, improvement_target,
+              escalation_rate, impl_factor, y1_investment_total, steady_state_recurring, analysis_years, wacc):
+    # The per-year loops of the original strategic_model.py report
+    def flows(in_waste_pct):
+        s, i = [], []
+        for yr in range(1, analysis_years + 1):
+            yr_rate = (burdened_cost_pp * ((1 + escalation_rate/100) ** (yr - 1))) / max(total_annual_hours_pp, 1)
+            yr_sav = (total_annual_hours_pp * in_waste_pct * num_employees) * (improvement_target/100) * yr_rate
+            s.append(yr_sav * impl_factor if yr == 1 else yr_sav)
+            i.append(-y1_investment_total if yr == 1 else -steady_state_recurring)
+        return s, i
+
+    def npv(eff_multiplier):
+        s, i = flows(waste_pct * eff_multiplier)
+        return sum((s[k] + i[k]) / (1+(wacc/100))**(k+1) for k in range(analysis_years))
+
+    def be_years():
+        if waste_pct <= 0: return 0.0
+        s, i = flows(waste_pct)
+        cum_cf = np.cumsum(np.array(s) + np.array(i))
+        for idx in range(len(cum_cf)):
+            if cum_cf[idx] >= 0:
+                if idx == 0: return y1_investment_total / s[0] if s[0] > 0 else 0
+                net_now = (s[idx] + i[idx])
+                return idx + (abs(cum_cf[idx-1]) / net_now) if net_now > 0 else idx
+        return 0.0
+
+    savings, investments = flows(waste_pct)
+    risk_adj_npv = (npv(1.0) * 0.60) + (npv(0.8) * 0.25) + (npv(1.2) * 0.15)
+    return savings, investments, npv(1.0), be_years(), risk_adj_npv
+
+
+@pytest.mark.parametrize("deal", DEALS)
+def test_engine_matches_baseline_loops(deal):
+    model = roi_engine.engine_inputs(roi_engine.derive_inputs(**{**roi_engine.DEFAULT_INPUTS, **deal}))
+    savings, investments, npv, breakeven, risk_adj_npv = _baseline(
+        **{name: value.item() if isinstance(value, np.ndarray) else value for name, value in model.items()})
+
+    flows = roi_engine.evaluate(**model)
+
+    np.testing.assert_allclose(flows.savings, savings)
+    np.testing.assert_allclose(flows.investments, investments)
+    assert flows.npv == pytest.approx(npv)
+    assert flows.breakeven == pytest.approx(breakeven)
+    assert roi_engine.risk_adjusted_npv(**model) == pytest.approx(risk_adj_npv)
+
+
+def test_vectorized_scenarios_match_one_at_a_time():
+    deals = [{**roi_engine.DEFAULT_INPUTS, **deal} for deal in DEALS if deal.get("analysis_years", 5) == 5]
+    columns = {name: np.array([deal[name] for deal in deals]) for name in roi_engine.DEFAULT_INPUTS}
+
+    batch = roi_engine.deal_metrics(**columns)
+
+    for i, deal in enumerate(deals):
+        for name, value in roi_engine.deal_metrics(**deal).items():
+            assert batch[name][i] == pytest.approx(float(value))
@@ -0,0 +1,83 @@
+import asyncio
+import json
+
+import pytest
+
+import roi_engine
+import roi_service
+
+DEAL = {"num_employees": 40, "annual_salary": 100_000, "annual_subscription": 50_000, "initial_setup": 20_000}
+
+
+def _post(app, path, payload):
+    """Status and JSON body of one POST through the ASGI app."""
+    body = json.dumps(payload).encode()
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST", "scheme": "http",
+             "path": path, "raw_path": path.encode(), "query_string": b"", "root_path": "",
+             "headers": [(b"content-type", b"application/json")], "client": ("test", 1), "server": ("test", 80)}
+    asyncio.run(app(scope, receive, send))
+    status = next(m["status"] for m in messages if m["type"] == "http.response.start")
+    return status, json.loads(b"".join(m.get("body", b"") for m in messages if m["type"] == "http.response.body"))
+
+
+@pytest.mark.parametrize("payload", [
+    {"annual_salary": 1e308, "num_employees": 1e10, "waste_pct": 50},
+    {"key_users": 1e9},
+    {"waste_pct": 101},
+    {"impl_unit": "Years"},
+    {"analysis_years": 2.5},
+    {"surprise": 1},
+])
+def test_out_of_range_scenarios_are_rejected(payload):
+    with pytest.raises(ValueError):
+        roi_service.parse_scenario(payload)
+    status, body = _post(roi_service.create_app(), "/v1/scenario", payload)
+    assert status == 422
+    assert "error" in body
+
+
+def test_scenario_matches_engine():
+    status, body = _post(roi_service.create_app(), "/v1/scenario", DEAL)
+
+    assert status == 200
+    expected = roi_engine.deal_metrics(**{**roi_engine.DEFAULT_INPUTS, **DEAL})
+    assert body == pytest.approx({name: float(value) for name, value in expected.items()})
+
+
+def test_largest_allowed_scenario_is_finite():
+    largest = {name: maximum for name, (_, maximum) in roi_service.RANGES.items()}
+
+    status, body = _post(roi_service.create_app(), "/v1/scenario", largest)
+
+    assert status == 200
+
+
+def test_non_finite_metrics_fail_only_their_scenario():
+    results = roi_service.score_batch([roi_service.parse_scenario(DEAL), {**roi_engine.DEFAULT_INPUTS, "annual_salary": float("inf")}])
+
+    assert isinstance(results[0], dict)
+    assert isinstance(results[1], ValueError)
+
+
+def test_failing_scenario_does_not_fail_its_batch():
+    good = roi_service.parse_scenario(DEAL)
+    bad = {name: value for name, value in good.items() if name != "wacc"}
+
+    async def score_all():
+        coalescer = roi_service.ScenarioCoalescer(max_wait=0.01)
+        return coalescer, await asyncio.gather(*[coalescer.score([s]) for s in [good] * 5 + [bad] + [good] * 5],
+                                               return_exceptions=True)
+
+    coalescer, results = asyncio.run(score_all())
+
+    assert coalescer.batches == 1
+    assert isinstance(results[5], KeyError)
+    assert all(result[0] == results[0][0] for i, result in enumerate(results) if i != 5)
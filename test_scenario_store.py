@@ -0,0 +1,50 @@
+import numpy as np
+
+import result_cache
+import roi_engine
+import scenario_store
+
+DEAL = {**roi_engine.DEFAULT_INPUTS, "num_employees": 40, "annual_salary": 100_000,
+        "annual_subscription": 50_000, "initial_setup": 20_000}
+
+
+def test_saved_views_load_without_recomputing(tmp_path):
+    store = scenario_store.ScenarioStore(str(tmp_path / "deals.db"))
+    flows, derived = roi_engine.evaluate_inputs(**DEAL)
+    grid_key = dict(DEAL, y_axis="wacc", x_axis="efficiency", grid_steps=5)
+    grid = np.arange(25.0).reshape(5, 5)
+
+    scenario_key = store.save("Deal", DEAL, roi_engine.engine_inputs(derived), flows, 0.0,
+                              views={"sensitivity_matrix": (grid_key, grid)})
+
+    saved = store.load(scenario_key)
+    assert saved["views"] == {"sensitivity_matrix": result_cache.canonical_key("sensitivity_matrix", grid_key)}
+    np.testing.assert_array_equal(store.view_or_compute("sensitivity_matrix", grid_key, lambda: None), grid)
+    assert store.view_or_compute("sensitivity_matrix", dict(grid_key, grid_steps=6), lambda: "computed") == "computed"
+
+
+def test_saved_deal_round_trips(tmp_path):
+    store = scenario_store.ScenarioStore(str(tmp_path / "deals.db"))
+    upgrade = dict(DEAL, current_subscription=20_000, analysis_years=7)
+
+    first = store.save_deal("New", DEAL, industry="Retail", solution_name="WMS")
+    second = store.save_deal("Upgrade", upgrade, industry="Grocery")
+
+    saved = store.load(first)
+    flows, _ = roi_engine.evaluate_inputs(**DEAL)
+    metrics = roi_engine.deal_metrics(**DEAL)
+    assert (saved["name"], saved["industry"], saved["solution_name"]) == ("New", "Retail", "WMS")
+    assert saved["inputs"] == DEAL
+    np.testing.assert_allclose(saved["flows"].net, flows.net)
+    assert saved["flows"].breakeven == flows.breakeven
+    assert saved["risk_adj_npv"] == float(metrics["risk_adj_npv"])
+    assert saved["total_tco"] == float(metrics["total_tco"])
+
+    assert [m["name"] for m in store.search(industries=["Grocery"])] == ["Upgrade"]
+    diff = store.diff(first, second)
+    assert len(diff["years"]["year"]) == 7
+    np.testing.assert_allclose(diff["years"]["net_delta"][5:], store.load(second)["flows"].net[5:])
+
+    store.delete(first)
+    assert store.load(first) is None
+    assert [m["name"] for m in store.search()] == ["Upgrade"]